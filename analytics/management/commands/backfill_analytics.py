@@ -0,0 +1,84 @@
+from django.core.management.base import BaseCommand
+from constants import BookingStatusChoices, PaymentStatusChoices
+from payment_histories.models import PaymentHistory
+from space_bookings.models import SpaceBooking
+from analytics.services import (
+    booking_keys,
+    payment_keys,
+    rebuild_daily_stats,
+)
+
+
+class Command(BaseCommand):
+    help = 'Rebuild daily revenue and occupancy buckets from history.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=1000,
+            help='Number of source rows read per batch.'
+        )
+        parser.add_argument(
+            '--since',
+            help='Only process rows created on or after this ISO date.'
+        )
+
+    def handle(self, *args, **options):
+        chunk_size = options['chunk_size']
+        since = options['since']
+        rebuilt = set()
+
+        bookings = SpaceBooking.objects.filter(
+            status=BookingStatusChoices.SUCCEEDED
+        )
+        payments = PaymentHistory.objects.filter(
+            status=PaymentStatusChoices.COMPLETED
+        )
+        if since:
+            bookings = bookings.filter(created_at__date__gte=since)
+            payments = payments.filter(created_at__date__gte=since)
+
+        self._process(
+            'bookings',
+            bookings.values_list('id', 'space_id', 'start_time', 'end_time'),
+            lambda row: booking_keys(*row[1:]),
+            chunk_size,
+            rebuilt
+        )
+        self._process(
+            'payments',
+            payments.values_list(
+                'id', 'space_booking__space_id', 'created_at'
+            ),
+            lambda row: payment_keys(*row[1:]),
+            chunk_size,
+            rebuilt
+        )
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Rebuilt {len(rebuilt)} daily buckets.'
+        ))
+
+    def _process(self, label, rows, keys_for_row, chunk_size, rebuilt):
+        last_id = 0
+        processed = 0
+
+        while True:
+            chunk = list(rows.filter(id__gt=last_id).order_by('id')[
+                :chunk_size
+            ])
+            if not chunk:
+                break
+
+            keys = set()
+            for row in chunk:
+                keys |= keys_for_row(row)
+            keys -= rebuilt
+
+            rebuild_daily_stats(keys)
+            rebuilt |= keys
+
+            last_id = chunk[-1][0]
+            processed += len(chunk)
+            self.stdout.write(f'{label}: processed {processed} rows')
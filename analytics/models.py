@@ -0,0 +1,48 @@
+from decimal import Decimal
+from django.db import models
+from spaces.models import Space
+from working_spaces.models import WorkingSpace
+
+
+class DailySpaceStat(models.Model):
+    space = models.ForeignKey(
+        Space,
+        on_delete=models.CASCADE,
+        related_name='daily_stats'
+    )
+    working_space = models.ForeignKey(
+        WorkingSpace,
+        on_delete=models.CASCADE,
+        related_name='daily_stats'
+    )
+    date = models.DateField()
+
+    revenue = models.DecimalField(
+        max_digits=12,
+        decimal_places=2,
+        default=Decimal('0.00')
+    )
+    booking_count = models.PositiveIntegerField(default=0)
+    booked_minutes = models.PositiveIntegerField(default=0)
+    capacity_minutes = models.PositiveIntegerField(default=0)
+
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'analytics_daily_space_stats'
+        indexes = [
+            models.Index(
+                fields=['working_space', 'date'],
+                name='stat_working_space_date_idx'
+            ),
+            models.Index(fields=['date'], name='stat_date_idx'),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=['space', 'date'],
+                name='unique_daily_stat_per_space'
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.space_id} - {self.date}: {self.revenue}"
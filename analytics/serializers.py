@@ -0,0 +1,54 @@
+from rest_framework import serializers
+from constants.messages import AnalyticsMessages
+from constants.models import AnalyticsGroupByChoices, AnalyticsPeriodChoices
+
+MAX_RANGE_DAYS = 366 * 3
+
+
+class AnalyticsFilterSerializer(serializers.Serializer):
+    start_date = serializers.DateField(required=True)
+    end_date = serializers.DateField(required=True)
+    period = serializers.ChoiceField(
+        choices=AnalyticsPeriodChoices.choices,
+        default=AnalyticsPeriodChoices.DAY
+    )
+    group_by = serializers.ChoiceField(
+        choices=AnalyticsGroupByChoices.choices,
+        default=AnalyticsGroupByChoices.WORKING_SPACE
+    )
+    working_space_id = serializers.IntegerField(required=False, min_value=1)
+    space_id = serializers.IntegerField(required=False, min_value=1)
+
+    def validate(self, attrs):
+        start_date = attrs['start_date']
+        end_date = attrs['end_date']
+
+        if end_date < start_date:
+            raise serializers.ValidationError({
+                'end_date': AnalyticsMessages.INVALID_DATE_RANGE
+            })
+
+        if (end_date - start_date).days > MAX_RANGE_DAYS:
+            raise serializers.ValidationError({
+                'end_date': AnalyticsMessages.DATE_RANGE_TOO_LARGE.format(
+                    days=MAX_RANGE_DAYS
+                )
+            })
+
+        return attrs
+
+
+class AnalyticsBucketSerializer(serializers.Serializer):
+    period_start = serializers.DateField()
+    space_id = serializers.IntegerField(required=False)
+    working_space_id = serializers.IntegerField()
+    revenue = serializers.DecimalField(max_digits=14, decimal_places=2)
+    booking_count = serializers.IntegerField()
+    booked_minutes = serializers.IntegerField()
+    capacity_minutes = serializers.IntegerField()
+    occupancy_rate = serializers.SerializerMethodField()
+
+    def get_occupancy_rate(self, obj):
+        if not obj['capacity_minutes']:
+            return 0.0
+        return round(obj['booked_minutes'] / obj['capacity_minutes'], 4)
@@ -0,0 +1,250 @@
+from collections import Counter, defaultdict
+from datetime import datetime, time, timedelta
+from decimal import Decimal
+from django.db.models import F, Q, Sum
+from django.db.models.functions import (
+    ExtractHour,
+    ExtractMinute,
+    TruncDate,
+    TruncMonth,
+    TruncWeek,
+)
+from django.utils import timezone
+from constants import BookingStatusChoices, PaymentStatusChoices
+from constants.models import AnalyticsGroupByChoices, AnalyticsPeriodChoices
+from payment_histories.models import PaymentHistory
+from space_bookings.models import SpaceBooking
+from spaces.models import Space
+from .models import DailySpaceStat
+
+
+def day_bounds(day):
+    start = timezone.make_aware(datetime.combine(day, time.min))
+    return start, start + timedelta(days=1)
+
+
+def days_between(start_time, end_time):
+    """Return every local date touched by the [start_time, end_time) range."""
+    day = timezone.localdate(start_time)
+    last_day = timezone.localdate(end_time - timedelta(microseconds=1))
+
+    days = []
+    while day <= last_day:
+        days.append(day)
+        day += timedelta(days=1)
+    return days
+
+
+def booking_keys(space_id, start_time, end_time):
+    if start_time is None or end_time is None or end_time <= start_time:
+        return set()
+    return {(space_id, day) for day in days_between(start_time, end_time)}
+
+
+def payment_keys(space_id, created_at):
+    if created_at is None:
+        return set()
+    return {(space_id, timezone.localdate(created_at))}
+
+
+def _open_minutes(space):
+    opened = datetime.combine(datetime.min, space.open_time)
+    closed = datetime.combine(datetime.min, space.close_time)
+    return max(int((closed - opened).total_seconds() // 60), 0)
+
+
+def _clock_minutes(field):
+    return ExtractHour(field) * 60 + ExtractMinute(field)
+
+
+def _daily_capacity(prefix=''):
+    """Seat minutes a space offers per day, as _open_minutes in SQL.
+
+    Only valid for rows whose close time is after the open time.
+    """
+    return F(f'{prefix}capacity') * (
+        _clock_minutes(f'{prefix}close_time')
+        - _clock_minutes(f'{prefix}open_time')
+    )
+
+
+def _booked_minutes(intervals, day_start, day_end):
+    total = 0
+    for start_time, end_time in intervals:
+        overlap = min(end_time, day_end) - max(start_time, day_start)
+        if overlap > timedelta(0):
+            total += int(overlap.total_seconds() // 60)
+    return total
+
+
+def rebuild_daily_stat(space, day):
+    day_start, day_end = day_bounds(day)
+
+    revenue = PaymentHistory.objects.filter(
+        space_booking__space_id=space.id,
+        status=PaymentStatusChoices.COMPLETED,
+        created_at__gte=day_start,
+        created_at__lt=day_end
+    ).aggregate(total=Sum('amount'))['total'] or Decimal('0.00')
+
+    intervals = list(SpaceBooking.objects.filter(
+        space_id=space.id,
+        status=BookingStatusChoices.SUCCEEDED,
+        start_time__lt=day_end,
+        end_time__gt=day_start
+    ).values_list('start_time', 'end_time'))
+
+    if not revenue and not intervals:
+        DailySpaceStat.objects.filter(space_id=space.id, date=day).delete()
+        return None
+
+    stat, _ = DailySpaceStat.objects.update_or_create(
+        space_id=space.id,
+        date=day,
+        defaults={
+            'working_space_id': space.working_space_id,
+            'revenue': revenue,
+            'booking_count': sum(
+                1 for start_time, _ in intervals if start_time >= day_start
+            ),
+            'booked_minutes': _booked_minutes(intervals, day_start, day_end),
+            'capacity_minutes': space.capacity * _open_minutes(space),
+        }
+    )
+    return stat
+
+
+def rebuild_daily_stats(keys):
+    """Recompute the buckets for the given (space_id, date) pairs."""
+    days_by_space = defaultdict(set)
+    for space_id, day in keys:
+        days_by_space[space_id].add(day)
+
+    spaces = Space.objects.only(
+        'id', 'working_space_id', 'capacity', 'open_time', 'close_time'
+    ).in_bulk(list(days_by_space))
+
+    for space_id, days in days_by_space.items():
+        space = spaces.get(space_id)
+        if space is None:
+            continue
+        for day in sorted(days):
+            rebuild_daily_stat(space, day)
+
+
+PERIODS = {
+    AnalyticsPeriodChoices.DAY: (F, lambda day: day),
+    AnalyticsPeriodChoices.WEEK: (
+        TruncWeek,
+        lambda day: day - timedelta(days=day.weekday())
+    ),
+    AnalyticsPeriodChoices.MONTH: (
+        TruncMonth,
+        lambda day: day.replace(day=1)
+    ),
+}
+
+SUMMED_FIELDS = ('revenue', 'booking_count', 'booked_minutes',
+                 'capacity_minutes')
+
+
+def _period_days(first, last, period_start):
+    """Number of days of each period within [first, last]."""
+    days = Counter()
+    day = first
+    while day <= last:
+        days[period_start(day)] += 1
+        day += timedelta(days=1)
+    return days
+
+
+def revenue_occupancy(filters):
+    """Revenue and occupancy buckets for a validated analytics filter.
+
+    Stats only hold days with bookings or revenue. The capacity of the
+    other days a space existed in the range is added from its current
+    opening hours and capacity, so idle days count in the occupancy
+    rate instead of being left out of it. Both come from one aggregate
+    query each: spaces are summed per working space (or space) and
+    creation date, and the stats carry the current capacity of the
+    days they cover so it can be taken off again.
+    """
+    start_date = filters['start_date']
+    end_date = filters['end_date']
+    truncator, period_start = PERIODS[filters['period']]
+    by_space = filters['group_by'] == AnalyticsGroupByChoices.SPACE
+    group = ['working_space_id', 'space_id'] if by_space else [
+        'working_space_id'
+    ]
+
+    stats = DailySpaceStat.objects.filter(
+        date__gte=start_date,
+        date__lte=end_date
+    )
+    spaces = Space.objects.filter(
+        created_at__lt=day_bounds(end_date)[1],
+        close_time__gt=F('open_time')
+    )
+    if filters.get('working_space_id'):
+        stats = stats.filter(working_space_id=filters['working_space_id'])
+        spaces = spaces.filter(working_space_id=filters['working_space_id'])
+    if filters.get('space_id'):
+        stats = stats.filter(space_id=filters['space_id'])
+        spaces = spaces.filter(id=filters['space_id'])
+
+    buckets = {}
+
+    def bucket(period, working_space_id, space_id):
+        key = (period, working_space_id, space_id)
+        if key not in buckets:
+            buckets[key] = {
+                'period_start': period,
+                'working_space_id': working_space_id,
+                'revenue': Decimal('0.00'),
+                'booking_count': 0,
+                'booked_minutes': 0,
+                'capacity_minutes': 0,
+            }
+            if by_space:
+                buckets[key]['space_id'] = space_id
+        return buckets[key]
+
+    rows = stats.annotate(period_start=truncator('date')).values(
+        'period_start', *group
+    ).annotate(
+        revenue=Sum('revenue'),
+        booking_count=Sum('booking_count'),
+        booked_minutes=Sum('booked_minutes'),
+        capacity_minutes=Sum('capacity_minutes'),
+        # Counted again below as if the covered days were idle
+        covered_capacity=Sum(
+            _daily_capacity('space__'),
+            filter=Q(space__close_time__gt=F('space__open_time'))
+        )
+    ).order_by()
+    for row in rows:
+        totals = bucket(
+            row['period_start'], row['working_space_id'], row.get('space_id')
+        )
+        for field in SUMMED_FIELDS:
+            totals[field] += row[field]
+        totals['capacity_minutes'] -= row['covered_capacity'] or 0
+
+    period_days = {}
+    keys = {'space_id': F('id')} if by_space else {}
+    rows = spaces.values(
+        'working_space_id', created_on=TruncDate('created_at'), **keys
+    ).annotate(
+        daily_capacity=Sum(_daily_capacity())
+    ).order_by()
+    for row in rows:
+        first = max(start_date, row['created_on'])
+        if first not in period_days:
+            period_days[first] = _period_days(first, end_date, period_start)
+
+        for period, days in period_days[first].items():
+            bucket(period, row['working_space_id'], row.get('space_id'))[
+                'capacity_minutes'
+            ] += days * row['daily_capacity']
+
+    return [buckets[key] for key in sorted(buckets)]
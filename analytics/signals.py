@@ -0,0 +1,65 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+from payment_histories.models import PaymentHistory
+from space_bookings.models import SpaceBooking
+from .services import booking_keys, payment_keys, rebuild_daily_stats
+
+_paused = ContextVar('analytics_paused', default=False)
+
+
+@contextmanager
+def pause_stat_rebuilds():
+    """Skip stat rebuilds for rows whose stats are being deleted anyway."""
+    token = _paused.set(True)
+    try:
+        yield
+    finally:
+        _paused.reset(token)
+
+
+def schedule_rebuild(keys):
+    if keys:
+        transaction.on_commit(lambda: rebuild_daily_stats(keys))
+
+
+@receiver(pre_save, sender=SpaceBooking)
+def remember_booking_keys(sender, instance, **kwargs):
+    instance._analytics_keys = set()
+    if instance.pk is None or _paused.get():
+        return
+
+    previous = SpaceBooking.objects.filter(pk=instance.pk).values_list(
+        'space_id', 'start_time', 'end_time'
+    ).first()
+    if previous:
+        instance._analytics_keys = booking_keys(*previous)
+
+
+@receiver(post_save, sender=SpaceBooking)
+@receiver(post_delete, sender=SpaceBooking)
+def refresh_booking_stats(sender, instance, **kwargs):
+    if _paused.get():
+        return
+
+    keys = getattr(instance, '_analytics_keys', set()) | booking_keys(
+        instance.space_id, instance.start_time, instance.end_time
+    )
+    schedule_rebuild(keys)
+
+
+@receiver(post_save, sender=PaymentHistory)
+@receiver(post_delete, sender=PaymentHistory)
+def refresh_payment_stats(sender, instance, **kwargs):
+    if _paused.get():
+        return
+
+    space_id = SpaceBooking.objects.filter(
+        pk=instance.space_booking_id
+    ).values_list('space_id', flat=True).first()
+    if space_id is None:
+        return
+
+    schedule_rebuild(payment_keys(space_id, instance.created_at))
@@ -0,0 +1,125 @@
+from datetime import time, timedelta
+from decimal import Decimal
+from django.test import TestCase
+from django.utils import timezone
+from constants.models import AnalyticsGroupByChoices, AnalyticsPeriodChoices
+from spaces.models import Space
+from working_spaces.models import WorkingSpace
+from .models import DailySpaceStat
+from .services import revenue_occupancy
+
+
+class RevenueOccupancyTests(TestCase):
+    def setUp(self):
+        self.working_space = WorkingSpace.objects.create(
+            name='Hub',
+            city='Hanoi',
+            street='1 Main St'
+        )
+        self.space = Space.objects.create(
+            working_space=self.working_space,
+            name='Desk',
+            capacity=2,
+            location='Floor 1',
+            open_time=time(8),
+            close_time=time(18)
+        )
+        self.today = timezone.localdate()
+        # 2 seats for 10 hours
+        self.daily_capacity = 2 * 600
+
+    def _filters(self, **overrides):
+        filters = {
+            'start_date': self.today,
+            'end_date': self.today + timedelta(days=6),
+            'period': AnalyticsPeriodChoices.WEEK,
+            'group_by': AnalyticsGroupByChoices.SPACE,
+        }
+        filters.update(overrides)
+        return filters
+
+    def test_idle_days_count_towards_capacity(self):
+        DailySpaceStat.objects.create(
+            space=self.space,
+            working_space=self.working_space,
+            date=self.today + timedelta(days=2),
+            revenue=Decimal('20.00'),
+            booking_count=1,
+            booked_minutes=120,
+            capacity_minutes=self.daily_capacity
+        )
+
+        buckets = revenue_occupancy(self._filters())
+
+        self.assertEqual(sum(b['booked_minutes'] for b in buckets), 120)
+        self.assertEqual(
+            sum(b['capacity_minutes'] for b in buckets),
+            7 * self.daily_capacity
+        )
+        self.assertEqual(
+            sum(b['revenue'] for b in buckets),
+            Decimal('20.00')
+        )
+
+    def test_space_without_stats_still_reports_capacity(self):
+        buckets = revenue_occupancy(self._filters(
+            period=AnalyticsPeriodChoices.DAY,
+            group_by=AnalyticsGroupByChoices.WORKING_SPACE
+        ))
+
+        self.assertEqual(len(buckets), 7)
+        for bucket in buckets:
+            self.assertEqual(bucket['booked_minutes'], 0)
+            self.assertEqual(bucket['capacity_minutes'], self.daily_capacity)
+
+    def test_days_before_the_space_existed_are_left_out(self):
+        buckets = revenue_occupancy(self._filters(
+            start_date=self.today - timedelta(days=3),
+            period=AnalyticsPeriodChoices.DAY
+        ))
+
+        self.assertEqual(
+            [bucket['period_start'] for bucket in buckets],
+            [self.today + timedelta(days=n) for n in range(7)]
+        )
+
+    def test_capacity_is_summed_per_working_space(self):
+        for index in range(5):
+            Space.objects.create(
+                working_space=self.working_space,
+                name=f'Room {index}',
+                capacity=1,
+                location='Floor 2',
+                open_time=time(9),
+                close_time=time(17)
+            )
+
+        with self.assertNumQueries(2):
+            buckets = revenue_occupancy(self._filters(
+                group_by=AnalyticsGroupByChoices.WORKING_SPACE
+            ))
+
+        self.assertEqual(
+            sum(b['capacity_minutes'] for b in buckets),
+            7 * (self.daily_capacity + 5 * 480)
+        )
+
+    def test_covered_days_keep_their_stored_capacity(self):
+        DailySpaceStat.objects.create(
+            space=self.space,
+            working_space=self.working_space,
+            date=self.today,
+            booking_count=1,
+            booked_minutes=60,
+            capacity_minutes=self.daily_capacity
+        )
+        Space.objects.filter(id=self.space.id).update(capacity=3)
+
+        buckets = revenue_occupancy(self._filters(
+            period=AnalyticsPeriodChoices.DAY
+        ))
+
+        self.assertEqual(
+            [bucket['capacity_minutes'] for bucket in buckets],
+            [self.daily_capacity] + [3 * 600] * 6
+        )
@@ -0,0 +1,10 @@
+from django.urls import path
+from .views import RevenueOccupancyView
+
+urlpatterns = [
+    path(
+        '',
+        RevenueOccupancyView.as_view(),
+        name='analytics-revenue-occupancy'
+    ),
+]
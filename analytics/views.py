@@ -0,0 +1,24 @@
+from rest_framework import status, permissions
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from .serializers import AnalyticsBucketSerializer, AnalyticsFilterSerializer
+from .services import revenue_occupancy
+
+
+class RevenueOccupancyView(APIView):
+    permission_classes = [permissions.IsAdminUser]
+
+    def get(self, request):
+        filter_serializer = AnalyticsFilterSerializer(
+            data=request.query_params
+        )
+        filter_serializer.is_valid(raise_exception=True)
+        filters = filter_serializer.validated_data
+
+        buckets = revenue_occupancy(filters)
+
+        return Response({
+            'period': filters['period'],
+            'group_by': filters['group_by'],
+            'buckets': AnalyticsBucketSerializer(buckets, many=True).data
+        }, status=status.HTTP_200_OK)
@@ -0,0 +1,54 @@
+from datetime import timedelta
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from changes.models import Change
+
+
+class Command(BaseCommand):
+    help = 'Delete change log entries older than the retention period.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days',
+            type=int,
+            default=settings.CHANGE_LOG_RETENTION_DAYS,
+            help='Keep entries from the last N days.'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=5000,
+            help='Number of entries deleted per statement.'
+        )
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(days=options['days'])
+        latest_id = Change.objects.order_by('-id').values_list(
+            'id', flat=True
+        ).first()
+        if latest_id is None:
+            return
+
+        # The newest entry is always kept, so an emptied log can still
+        # tell clients with an older cursor that they missed changes
+        expired = Change.objects.filter(
+            created_at__lt=cutoff,
+            id__lt=latest_id
+        )
+        deleted = 0
+
+        while True:
+            ids = list(expired.order_by('id').values_list(
+                'id', flat=True
+            )[:options['batch_size']])
+            if not ids:
+                break
+
+            Change.objects.filter(id__in=ids).delete()
+            deleted += len(ids)
+            self.stdout.write(f'Deleted {deleted} entries')
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Pruned {deleted} change log entries.'
+        ))
@@ -0,0 +1,30 @@
+from django.db import models
+from constants.models import ChangeEntityChoices, ChangeOperationChoices
+
+
+class Change(models.Model):
+    """One row per catalogue write; the id is the sync cursor.
+
+    Rows are inserted after the writing transaction commits, as short
+    autocommit statements, so ids become visible in (almost) the order
+    they are allocated. Readers still leave a short settle window, see
+    CHANGE_LOG_SETTLE_SECONDS.
+    """
+
+    entity = models.CharField(
+        max_length=20,
+        choices=ChangeEntityChoices.choices
+    )
+    object_id = models.PositiveBigIntegerField()
+    operation = models.CharField(
+        max_length=10,
+        choices=ChangeOperationChoices.choices
+    )
+
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    class Meta:
+        db_table = 'changes_change_log'
+
+    def __str__(self):
+        return f"{self.id}: {self.operation} {self.entity} {self.object_id}"
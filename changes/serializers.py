@@ -0,0 +1,42 @@
+from rest_framework import serializers
+from amenities.models import Amenity
+from space_prices.models import SpacePrice
+
+DEFAULT_PAGE_SIZE = 500
+MAX_PAGE_SIZE = 1000
+
+
+class ChangeFilterSerializer(serializers.Serializer):
+    since = serializers.IntegerField(required=False, min_value=0)
+    limit = serializers.IntegerField(
+        min_value=1,
+        max_value=MAX_PAGE_SIZE,
+        default=DEFAULT_PAGE_SIZE
+    )
+
+
+class AmenitySyncSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Amenity
+        fields = [
+            'id',
+            'working_space',
+            'name',
+            'status',
+            'is_approved',
+            'created_at',
+            'updated_at'
+        ]
+
+
+class SpacePriceSyncSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = SpacePrice
+        fields = [
+            'id',
+            'space',
+            'type',
+            'price',
+            'created_at',
+            'updated_at'
+        ]
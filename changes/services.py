@@ -0,0 +1,140 @@
+from datetime import timedelta
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from amenities.models import Amenity
+from constants.models import ChangeEntityChoices, ChangeOperationChoices
+from space_prices.models import SpacePrice
+from spaces.models import Space
+from spaces.serializers import SpaceSerializer
+from utils.projections import Projection
+from working_spaces.models import WorkingSpace
+from working_spaces.serializers import WorkingSpaceSerializer
+from .models import Change
+from .serializers import AmenitySyncSerializer, SpacePriceSyncSerializer
+
+# entity: (response key, model, projection, rows visible to clients)
+ENTITIES = {
+    ChangeEntityChoices.WORKING_SPACE: (
+        'working_spaces',
+        WorkingSpace,
+        Projection(WorkingSpaceSerializer),
+        lambda: WorkingSpace.objects.all()
+    ),
+    ChangeEntityChoices.SPACE: (
+        'spaces',
+        Space,
+        Projection(SpaceSerializer),
+        lambda: Space.objects.filter(working_space__deleted_at__isnull=True)
+    ),
+    ChangeEntityChoices.AMENITY: (
+        'amenities',
+        Amenity,
+        Projection(AmenitySyncSerializer),
+        lambda: Amenity.objects.filter(
+            working_space__deleted_at__isnull=True
+        )
+    ),
+    ChangeEntityChoices.SPACE_PRICE: (
+        'space_prices',
+        SpacePrice,
+        Projection(SpacePriceSyncSerializer),
+        lambda: SpacePrice.objects.filter(
+            space__working_space__deleted_at__isnull=True
+        )
+    ),
+}
+
+ENTITY_BY_MODEL = {
+    model: entity for entity, (_, model, _, _) in ENTITIES.items()
+}
+
+
+def record_changes(model, ids, operation):
+    """Log ``operation`` for ``ids`` once the current transaction commits."""
+    entity = ENTITY_BY_MODEL[model]
+    changes = [
+        Change(entity=entity, object_id=object_id, operation=operation)
+        for object_id in ids
+    ]
+    if changes:
+        transaction.on_commit(lambda: Change.objects.bulk_create(changes))
+
+
+def current_cursor():
+    return Change.objects.order_by('-id').values_list(
+        'id', flat=True
+    ).first() or 0
+
+
+def is_cursor_expired(since):
+    """True when entries after ``since`` have been pruned already."""
+    oldest = Change.objects.order_by('id').values_list(
+        'id', flat=True
+    ).first()
+    return oldest is not None and since < oldest - 1
+
+
+def read_changes(since, limit):
+    """Return one page of changes after ``since``.
+
+    Entries are collapsed to the latest operation per object, and upserts
+    carry the object's current state. An upserted object that is gone (or
+    hidden by a soft-deleted working space) is reported as deleted.
+
+    The page ends before the first entry younger than the settle window:
+    an entry with a lower id may still be in flight, and the cursor must
+    not move past it.
+    """
+    settled = timezone.now() - timedelta(
+        seconds=settings.CHANGE_LOG_SETTLE_SECONDS
+    )
+    rows = list(
+        Change.objects.filter(id__gt=since)
+        .order_by('id')
+        .values_list(
+            'id', 'entity', 'object_id', 'operation', 'created_at'
+        )[:limit + 1]
+    )
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    for index, row in enumerate(rows):
+        if row[4] > settled:
+            rows = rows[:index]
+            has_more = False
+            break
+
+    latest = {}
+    for _, entity, object_id, operation, _ in rows:
+        latest[entity, object_id] = operation
+
+    grouped = {entity: (set(), set()) for entity in ENTITIES}
+    for (entity, object_id), operation in latest.items():
+        upsert_ids, delete_ids = grouped[entity]
+        if operation == ChangeOperationChoices.UPSERT:
+            upsert_ids.add(object_id)
+        else:
+            delete_ids.add(object_id)
+
+    changes = {}
+    for entity, (key, _, projection, visible) in ENTITIES.items():
+        upsert_ids, delete_ids = grouped[entity]
+        upserts = []
+        if upsert_ids:
+            upserts = projection(
+                visible().filter(id__in=upsert_ids).order_by('id')
+            )
+            delete_ids.update(
+                upsert_ids.difference(item['id'] for item in upserts)
+            )
+
+        changes[key] = {
+            'upserts': upserts,
+            'deletes': sorted(delete_ids)
+        }
+
+    return {
+        'changes': changes,
+        'cursor': rows[-1][0] if rows else since,
+        'has_more': has_more
+    }
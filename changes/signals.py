@@ -0,0 +1,40 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from amenities.models import Amenity
+from constants.models import ChangeOperationChoices
+from moderation.signals import objects_moderated
+from space_prices.models import SpacePrice
+from spaces.models import Space
+from working_spaces.models import WorkingSpace
+from .services import ENTITY_BY_MODEL, record_changes
+
+
+@receiver(post_save, sender=WorkingSpace)
+def log_working_space_save(sender, instance, **kwargs):
+    # A soft delete hides the working space, so clients drop it (and the
+    # spaces under it) now; the purge later tombstones the descendants.
+    operation = ChangeOperationChoices.UPSERT
+    if instance.deleted_at is not None:
+        operation = ChangeOperationChoices.DELETE
+    record_changes(sender, [instance.pk], operation)
+
+
+@receiver(post_save, sender=Space)
+@receiver(post_save, sender=Amenity)
+@receiver(post_save, sender=SpacePrice)
+def log_save(sender, instance, **kwargs):
+    record_changes(sender, [instance.pk], ChangeOperationChoices.UPSERT)
+
+
+@receiver(post_delete, sender=WorkingSpace)
+@receiver(post_delete, sender=Space)
+@receiver(post_delete, sender=Amenity)
+@receiver(post_delete, sender=SpacePrice)
+def log_delete(sender, instance, **kwargs):
+    record_changes(sender, [instance.pk], ChangeOperationChoices.DELETE)
+
+
+@receiver(objects_moderated)
+def log_moderation(sender, ids, **kwargs):
+    if sender in ENTITY_BY_MODEL:
+        record_changes(sender, ids, ChangeOperationChoices.UPSERT)
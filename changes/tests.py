@@ -0,0 +1,59 @@
+from datetime import timedelta
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from constants.models import ChangeEntityChoices, ChangeOperationChoices
+from .models import Change
+from .services import read_changes
+
+
+@override_settings(CHANGE_LOG_SETTLE_SECONDS=5)
+class ReadChangesTests(TestCase):
+    def _change(self, change_id, object_id, age=60):
+        Change.objects.create(
+            id=change_id,
+            entity=ChangeEntityChoices.WORKING_SPACE,
+            object_id=object_id,
+            operation=ChangeOperationChoices.DELETE
+        )
+        self._age(change_id, age)
+
+    def _age(self, change_id, age):
+        Change.objects.filter(id=change_id).update(
+            created_at=timezone.now() - timedelta(seconds=age)
+        )
+
+    def _read(self, since, limit=100):
+        page = read_changes(since, limit)
+        deletes = page['changes']['working_spaces']['deletes']
+        return deletes, page['cursor'], page['has_more']
+
+    def test_unsettled_row_ends_the_page(self):
+        self._change(1, 10)
+        self._change(2, 20, age=0)
+        self._change(3, 30)
+
+        self.assertEqual(self._read(0), ([10], 1, False))
+
+        self._age(2, 60)
+        self.assertEqual(self._read(1), ([20, 30], 3, False))
+
+    def test_settled_row_after_a_gap_is_read(self):
+        self._change(1, 10)
+        self._change(3, 30)
+
+        self.assertEqual(self._read(0), ([10, 30], 3, False))
+
+    def test_unsettled_row_after_a_gap_ends_the_page(self):
+        self._change(1, 10)
+        self._change(3, 30, age=0)
+
+        self.assertEqual(self._read(0), ([10], 1, False))
+
+    def test_cursor_resumes_where_the_page_ended(self):
+        for change_id in range(1, 6):
+            self._change(change_id, change_id * 10)
+
+        self.assertEqual(self._read(0, limit=2), ([10, 20], 2, True))
+        self.assertEqual(self._read(2, limit=2), ([30, 40], 4, True))
+        self.assertEqual(self._read(4, limit=2), ([50], 5, False))
+        self.assertEqual(self._read(5, limit=2), ([], 5, False))
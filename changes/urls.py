@@ -0,0 +1,6 @@
+from django.urls import path
+from .views import ChangeListView
+
+urlpatterns = [
+    path('', ChangeListView.as_view(), name='change-list'),
+]
@@ -0,0 +1,41 @@
+from rest_framework import status, permissions
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from constants.messages import ChangeMessages
+from .serializers import ChangeFilterSerializer
+from .services import current_cursor, is_cursor_expired, read_changes
+
+
+class ChangeListView(APIView):
+    """Incremental catalogue sync.
+
+    Without ``since`` only the current cursor is returned: take it, then
+    download the full lists once. Afterwards, pass the last cursor as
+    ``since`` and apply upserts and deletes until ``has_more`` is false.
+    Deleting a working space also removes its spaces, amenities and
+    prices on the client. A 410 means the cursor has been pruned and the
+    full download has to be repeated.
+    """
+
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request):
+        filter_serializer = ChangeFilterSerializer(data=request.query_params)
+        filter_serializer.is_valid(raise_exception=True)
+        filters = filter_serializer.validated_data
+
+        since = filters.get('since')
+        if since is None:
+            return Response({
+                'cursor': current_cursor()
+            }, status=status.HTTP_200_OK)
+
+        if is_cursor_expired(since):
+            return Response({
+                'message': ChangeMessages.CURSOR_EXPIRED
+            }, status=status.HTTP_410_GONE)
+
+        return Response(
+            read_changes(since, filters['limit']),
+            status=status.HTTP_200_OK
+        )
@@ -59,19 +59,42 @@ INSTALLED_APPS = [
     'space_members',
     'payment_histories',
     'working_space_managers',
+    'analytics',
+    'moderation',
+    'changes',
+    'outbox',
 ]
 
+# API-only workers can skip loading the admin (and its URLs) at startup
+ADMIN_ENABLED = env.bool('ADMIN_ENABLED', default=True)
+if not ADMIN_ENABLED:
+    INSTALLED_APPS.remove('django.contrib.admin')
+
 MIDDLEWARE = [
+    'utils.log.RequestIdMiddleware',
+    'utils.metrics.MetricsMiddleware',
+    'utils.compression.CompressionMiddleware',
     'django.middleware.security.SecurityMiddleware',
-    'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
+    'utils.middleware.RouteMiddleware',
+    'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'django.middleware.locale.LocaleMiddleware',
+    'utils.db_routing.ReplicaRoutingMiddleware',
+]
+
+# Run by utils.middleware.RouteMiddleware for non-API routes (the admin)
+# only; API views authenticate with bearer tokens.
+API_PATH_PREFIXES = ['/api/', '/metrics']
+BROWSER_MIDDLEWARE = [
+    'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
-    'django.middleware.clickjacking.XFrameOptionsMiddleware',
-    'django.middleware.locale.LocaleMiddleware',
 ]
 
+# The admin's middleware checks only look at MIDDLEWARE itself
+SILENCED_SYSTEM_CHECKS = ['admin.E408', 'admin.E409', 'admin.E410']
+
 ROOT_URLCONF = 'co_working_space_booking_system_api.urls'
 
 TEMPLATES = [
@@ -92,27 +115,91 @@ TEMPLATES = [
 
 WSGI_APPLICATION = 'co_working_space_booking_system_api.wsgi.application'
 
+# Budget for loading wsgi.py/asgi.py plus the URLconf (see profile_startup)
+STARTUP_TIME_BUDGET_MS = env.float('STARTUP_TIME_BUDGET_MS', default=1500)
+
+# Serve hot read endpoints from async views (enable when running under ASGI)
+ASYNC_READ_VIEWS = env.bool('ASYNC_READ_VIEWS', default=False)
+
 
 # Database
 # https://docs.djangoproject.com/en/4.2/ref/settings/#databases
 
 
+# With DATABASE_POOL enabled connections are returned to an in-process pool
+# at the end of each request, so CONN_MAX_AGE must stay 0.
+DATABASE_POOL = env.bool('DATABASE_POOL', default=False)
+
 DATABASES = {
     'default': {
-        'ENGINE': 'django.db.backends.mysql',
+        'ENGINE': 'utils.db_backends.mysql_pool' if DATABASE_POOL else 'django.db.backends.mysql',
         'NAME': env('DATABASE_NAME'),
         'USER': env('DATABASE_USER'),
         'PASSWORD': env('DATABASE_PASSWORD'),
         'HOST': env('DATABASE_HOST'),
         'PORT': env('DATABASE_PORT'),
+        'CONN_MAX_AGE': 0 if DATABASE_POOL else env.int('DATABASE_CONN_MAX_AGE', default=60),
+        'CONN_HEALTH_CHECKS': True,
+        'POOL': {
+            'MAX_SIZE': env.int('DATABASE_POOL_MAX_SIZE', default=10),
+            'IDLE_TIMEOUT': env.int('DATABASE_POOL_IDLE_TIMEOUT', default=300),
+            'TIMEOUT': env.int('DATABASE_POOL_TIMEOUT', default=30),
+        },
     }
 }
 
+# Read replicas: one alias per host, reads routed by utils.db_routing
+DATABASE_REPLICAS = []
+for index, replica_host in enumerate(env.list('DATABASE_REPLICA_HOSTS', default=[]), start=1):
+    alias = f'replica_{index}'
+    DATABASES[alias] = {
+        **DATABASES['default'],
+        'HOST': replica_host,
+        'TEST': {'MIRROR': 'default'},
+    }
+    DATABASE_REPLICAS.append(alias)
+
+DATABASE_ROUTERS = ['utils.db_routing.PrimaryReplicaRouter']
+
+# Skip replicas lagging more than this many seconds (unset disables the check)
+DATABASE_REPLICA_MAX_LAG = env.int('DATABASE_REPLICA_MAX_LAG', default=None)
+DATABASE_REPLICA_LAG_CHECK_INTERVAL = env.int('DATABASE_REPLICA_LAG_CHECK_INTERVAL', default=5)
+
+# Keep a client on the primary for this long after a successful write
+DATABASE_READ_YOUR_WRITES_SECONDS = env.int('DATABASE_READ_YOUR_WRITES_SECONDS', default=5)
+
+
+# Cache
+# https://docs.djangoproject.com/en/4.2/topics/cache/
+
+CACHES = {
+    'default': {
+        'BACKEND': 'utils.cache.InstrumentedRedisCache',
+        'LOCATION': env('REDIS_URL', default='redis://127.0.0.1:6379/1'),
+        'OPTIONS': {
+            'CLIENT_CLASS': 'django_redis.client.DefaultClient',
+            'IGNORE_EXCEPTIONS': True,
+        },
+    }
+}
 
 
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
 
+PASSWORD_HASHERS = [
+    'users.hashers.TunablePBKDF2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+    'django.contrib.auth.hashers.Argon2PasswordHasher',
+    'django.contrib.auth.hashers.BCryptSHA256PasswordHasher',
+    'django.contrib.auth.hashers.ScryptPasswordHasher',
+]
+
+PASSWORD_HASHER_ITERATIONS = env.int('PASSWORD_HASHER_ITERATIONS', default=600000)
+
+# Upper bound on concurrent password hashing per process
+PASSWORD_HASHING_WORKERS = env.int('PASSWORD_HASHING_WORKERS', default=os.cpu_count() or 1)
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
@@ -172,6 +259,9 @@ MIGRATION_MODULES = {
     'space_members': 'migrations.space_members',
     'payment_histories': 'migrations.payment_histories',
     'working_space_managers': 'migrations.working_space_managers',
+    'analytics': 'migrations.analytics',
+    'changes': 'migrations.changes',
+    'outbox': 'migrations.outbox',
 }
 
 REST_FRAMEWORK = {
@@ -183,11 +273,69 @@ REST_FRAMEWORK = {
         'rest_framework.permissions.IsAuthenticated',
     ),
     'DEFAULT_RENDERER_CLASSES': (
-        'rest_framework.renderers.JSONRenderer',
-        'rest_framework.renderers.BrowsableAPIRenderer',
+        ('utils.renderers.ORJSONRenderer',)
+        + (('rest_framework.renderers.BrowsableAPIRenderer',) if DEBUG else ())
     ),
+    'DEFAULT_THROTTLE_RATES': {
+        'login': env('THROTTLE_RATE_LOGIN', default='20/min'),
+        'login_email': env('THROTTLE_RATE_LOGIN_EMAIL', default='5/min'),
+        'registration': env('THROTTLE_RATE_REGISTRATION', default='10/hour'),
+        'resend_confirmation': env('THROTTLE_RATE_RESEND_CONFIRMATION', default='5/hour'),
+        'token_refresh': env('THROTTLE_RATE_TOKEN_REFRESH', default='60/min'),
+    },
 }
 
+# Response compression
+RESPONSE_COMPRESSION_MIN_SIZE = env.int('RESPONSE_COMPRESSION_MIN_SIZE', default=1024)
+RESPONSE_COMPRESSION_BROTLI_QUALITY = env.int('RESPONSE_COMPRESSION_BROTLI_QUALITY', default=4)
+
+# Catalogue change log (delta sync). Entries younger than the settle window
+# are not served yet, so a late-committing insert is never skipped.
+CHANGE_LOG_SETTLE_SECONDS = env.float('CHANGE_LOG_SETTLE_SECONDS', default=1)
+CHANGE_LOG_RETENTION_DAYS = env.int('CHANGE_LOG_RETENTION_DAYS', default=30)
+
+# Slot size of the per-day occupancy vectors (space_bookings.occupancy)
+OCCUPANCY_SLOT_MINUTES = env.int('OCCUPANCY_SLOT_MINUTES', default=30)
+
+# How long a PROCESSING booking holds its seats before it expires
+BOOKING_HOLD_SECONDS = env.int('BOOKING_HOLD_SECONDS', default=600)
+
+# Payment provider callbacks (payment_histories.views.PaymentWebhookView)
+# are signed with HMAC-SHA256 using this secret; processed inbox events
+# are kept this long for audits and replays.
+PAYMENT_WEBHOOK_SECRET = env('PAYMENT_WEBHOOK_SECRET', default='')
+PAYMENT_WEBHOOK_RETENTION_DAYS = env.int('PAYMENT_WEBHOOK_RETENTION_DAYS', default=30)
+# Events for unknown orders are retried after RETRY_SECONDS, doubling each
+# time, and dead-lettered after MAX_ATTEMPTS attempts
+PAYMENT_WEBHOOK_RETRY_SECONDS = env.int('PAYMENT_WEBHOOK_RETRY_SECONDS', default=30)
+PAYMENT_WEBHOOK_MAX_ATTEMPTS = env.int('PAYMENT_WEBHOOK_MAX_ATTEMPTS', default=10)
+
+# Space searches slower than this are logged (spaces.views.SpaceSearchView)
+SPACE_SEARCH_BUDGET_MS = env.int('SPACE_SEARCH_BUDGET_MS', default=150)
+
+# Event outbox, drained by `manage.py run_outbox_relay`. Each entry is a
+# consumer with its own offset; BACKEND is an outbox.sinks.Sink, e.g.
+# {'BACKEND': 'outbox.sinks.CallableSink', 'OPTIONS': {'path': '...'}}.
+OUTBOX_SINKS = {}
+if env('OUTBOX_FILE_PATH', default=''):
+    OUTBOX_SINKS['file'] = {
+        'BACKEND': 'outbox.sinks.FileSink',
+        'OPTIONS': {'path': env('OUTBOX_FILE_PATH')},
+    }
+if env('OUTBOX_REDIS_STREAM', default=''):
+    OUTBOX_SINKS['redis'] = {
+        'BACKEND': 'outbox.sinks.RedisStreamSink',
+        'OPTIONS': {
+            'stream': env('OUTBOX_REDIS_STREAM'),
+            'maxlen': env.int('OUTBOX_REDIS_STREAM_MAXLEN', default=1000000),
+        },
+    }
+OUTBOX_BATCH_SIZE = env.int('OUTBOX_BATCH_SIZE', default=1000)
+OUTBOX_GAP_TIMEOUT_SECONDS = env.float('OUTBOX_GAP_TIMEOUT_SECONDS', default=5)
+# Skipped ids are re-read this long in case their transaction commits late
+OUTBOX_GAP_RECHECK_SECONDS = env.float('OUTBOX_GAP_RECHECK_SECONDS', default=3600)
+OUTBOX_RETENTION_HOURS = env.int('OUTBOX_RETENTION_HOURS', default=24)
+
 # JWT Settings
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(days=1),
@@ -212,6 +360,50 @@ SIMPLE_JWT = {
     'JTI_CLAIM': 'jti',
 }
 
+# Metrics
+# Directory shared by all worker processes for metric snapshots; when unset
+# /metrics only reports the process that serves the scrape.
+METRICS_DIR = env('METRICS_DIR', default=None)
+METRICS_FLUSH_INTERVAL = env.float('METRICS_FLUSH_INTERVAL', default=1.0)
+# Bearer token required by /metrics; the endpoint answers 403 while unset
+METRICS_AUTH_TOKEN = env('METRICS_AUTH_TOKEN', default=None)
+
+# Logging
+# Records are enqueued by request threads and written as JSON lines by a
+# background listener thread (see utils.log).
+LOG_LEVEL = env('LOG_LEVEL', default='INFO')
+LOG_SAMPLE_RATE = env.float('LOG_SAMPLE_RATE', default=0.1)
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'formatters': {
+        'json': {'()': 'utils.log.JsonFormatter'},
+    },
+    'filters': {
+        'request_id': {'()': 'utils.log.RequestIdFilter'},
+        'sampling': {'()': 'utils.log.SamplingFilter', 'rate': LOG_SAMPLE_RATE},
+    },
+    'handlers': {
+        'queue': {
+            '()': 'utils.log.QueueLogHandler',
+            'stream': 'ext://sys.stdout',
+            'filters': ['request_id'],
+            'formatter': 'json',
+        },
+    },
+    'root': {
+        'handlers': ['queue'],
+        'level': LOG_LEVEL,
+    },
+    'loggers': {
+        # High-volume client errors (bad tokens, throttling) are sampled
+        'utils.exception_handler.sampled': {
+            'filters': ['sampling'],
+        },
+    },
+}
+
 # Email Configuration
 EMAIL_BACKEND = 'django.core.mail.backends.console.EmailBackend'
 EMAIL_HOST = env('EMAIL_HOST')
@@ -220,3 +412,4 @@ EMAIL_USE_TLS = env('EMAIL_USE_TLS')
 EMAIL_HOST_USER = env('EMAIL_HOST_USER')
 EMAIL_HOST_PASSWORD = env('EMAIL_HOST_PASSWORD')
 DEFAULT_FROM_EMAIL = 'noreply@coworkingspace.com'
+EMAIL_CONFIRMATION_TOKEN_LIFETIME = timedelta(hours=48)
@@ -14,16 +14,29 @@ Including another URLconf
     1. Import the include() function: from django.urls import include, path
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
-from django.contrib import admin
+from django.conf import settings
 from django.urls import path, include
+from spaces.views import SpaceSearchView
+from utils.metrics import metrics_view
 
 urlpatterns = [
-    path('admin/', admin.site.urls),
+    path('metrics', metrics_view, name='metrics'),
 
     path('api/users/', include('users.urls')),
     path('api/working-spaces/', include('working_spaces.urls')),
+    path('api/spaces/search/', SpaceSearchView.as_view(), name='space-search'),
+    path('api/bookings/', include('space_bookings.urls')),
+    path('api/payments/', include('payment_histories.urls')),
+    path('api/analytics/', include('analytics.urls')),
+    path('api/moderation/', include('moderation.urls')),
+    path('api/changes/', include('changes.urls')),
 ]
 
+if settings.ADMIN_ENABLED:
+    from django.contrib import admin
+
+    urlpatterns.insert(0, path('admin/', admin.site.urls))
+
 # Custom error handlers
 handler400 = 'utils.exception_handler.bad_request_handler'
 handler403 = 'utils.exception_handler.permission_denied_handler'
@@ -23,6 +23,10 @@ class HTTPErrorMessages:
     THROTTLED = "Request was throttled. Please try again later."
     THROTTLED_WITH_WAIT = "Request was throttled. Please wait {wait} seconds."
     VALIDATION_ERROR = "Invalid input provided."
+    PRECONDITION_FAILED = (
+        "The resource was changed by someone else. "
+        "Reload it and try again."
+    )
 
 # =============================================================================
 # Auth Error Messages
@@ -43,6 +47,10 @@ class AuthMessages:
     LOGOUT_SUCCESS = "Logout successful."
     INVALID_CREDENTIALS = "Invalid email or password."
     ACCOUNT_NOT_CONFIRMED = "Account is not verified. Please check your email."
+    REFRESH_TOKEN_REVOKED = (
+        "Refresh token has already been used or revoked. "
+        "Please log in again."
+    )
 
 
 # =============================================================================
@@ -60,6 +68,7 @@ class ValidationMessages:
     INVALID_TOKEN = "Invalid token."
     EXPIRED_TOKEN = "Token has expired."
     TOKEN_NOT_PROVIDED = "Authentication token not provided."
+    UNKNOWN_FIELDS = "Unknown fields: {fields}."
 
 
 # =============================================================================
@@ -92,3 +101,57 @@ class SpaceMessages:
     DELETE_SUCCESS = "Space deleted successfully."
     NOT_FOUND = "Space not found."
     DELETE_WITH_DEPENDENCIES = "Cannot delete space due to existing dependencies."
+    INVALID_WINDOW = "End time must be after start time."
+    WINDOW_NOT_SAME_DAY = "Start and end time must be on the same day."
+
+
+# =============================================================================
+# Analytics Validation Messages
+# =============================================================================
+
+class AnalyticsMessages:
+    INVALID_DATE_RANGE = "End date must be on or after start date."
+    DATE_RANGE_TOO_LARGE = "Date range must not exceed {days} days."
+
+
+# =============================================================================
+# Moderation Messages
+# =============================================================================
+
+class ModerationMessages:
+    SELECTOR_REQUIRED = "Provide ids or at least one filter."
+    BULK_UPDATE_SUCCESS = "{count} records updated."
+
+
+# =============================================================================
+# Change Log Messages
+# =============================================================================
+
+class ChangeMessages:
+    CURSOR_EXPIRED = (
+        "Cursor is older than the retained change log. "
+        "Download the full catalogue again."
+    )
+
+
+# =============================================================================
+# Booking Messages
+# =============================================================================
+
+class BookingMessages:
+    SPACE_NOT_BOOKABLE = "Space {space_id} does not exist or cannot be booked."
+    OUTSIDE_OPENING_HOURS = "Booking must be within the space's opening hours."
+    PRICE_NOT_AVAILABLE = "Space {space_id} has no price for this booking."
+    CAPACITY_UNAVAILABLE = (
+        "Not enough capacity for some of the requested spaces."
+    )
+    GROUP_BOOKING_SUCCESS = "Group booking created successfully."
+
+
+# =============================================================================
+# Payment Messages
+# =============================================================================
+
+class PaymentMessages:
+    UNKNOWN_PROVIDER = "Unknown payment provider."
+    INVALID_SIGNATURE = "Invalid webhook signature."
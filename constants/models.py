@@ -82,6 +82,8 @@ class PaymentStatusChoices(models.TextChoices):
     PENDING = 'pending', 'Pending'
     COMPLETED = 'completed', 'Completed'
     FAILED = 'failed', 'Failed'
+    # Paid after the booking's hold was gone; the money has to go back
+    REFUND_REQUIRED = 'refund_required', 'Refund Required'
     REFUNDED = 'refunded', 'Refunded'
 
 
@@ -94,3 +96,44 @@ class PaymentMethodChoices(models.TextChoices):
     CREDIT_CARD = 'credit_card', 'Credit Card'
     PAY_EASY = 'pay_easy', 'PayEasy'
     CONVENIENCE_STORE = 'convenience_store', 'Convenience Store'
+
+
+# =============================================================================
+# Analytics Related Constants
+# =============================================================================
+
+class AnalyticsPeriodChoices(models.TextChoices):
+    DAY = 'day', 'Day'
+    WEEK = 'week', 'Week'
+    MONTH = 'month', 'Month'
+
+
+class AnalyticsGroupByChoices(models.TextChoices):
+    SPACE = 'space', 'Space'
+    WORKING_SPACE = 'working_space', 'Working Space'
+
+
+# =============================================================================
+# Moderation Related Constants
+# =============================================================================
+
+class ModerationActionChoices(models.TextChoices):
+    APPROVE = 'approve', 'Approve'
+    BLOCK = 'block', 'Block'
+    RESET = 'reset', 'Reset'
+
+
+# =============================================================================
+# Change Log Related Constants
+# =============================================================================
+
+class ChangeEntityChoices(models.TextChoices):
+    WORKING_SPACE = 'working_space', 'Working Space'
+    SPACE = 'space', 'Space'
+    AMENITY = 'amenity', 'Amenity'
+    SPACE_PRICE = 'space_price', 'Space Price'
+
+
+class ChangeOperationChoices(models.TextChoices):
+    UPSERT = 'upsert', 'Upsert'
+    DELETE = 'delete', 'Delete'
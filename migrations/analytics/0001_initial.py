@@ -0,0 +1,40 @@
+# Generated by Django 4.2.23 on 2026-10-19 12:43
+
+from decimal import Decimal
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('spaces', '0003_space_space_working_space_idx_and_more'),
+        ('working_spaces', '0002_remove_workingspace_location_workingspace_latitude_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailySpaceStat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('revenue', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=12)),
+                ('booking_count', models.PositiveIntegerField(default=0)),
+                ('booked_minutes', models.PositiveIntegerField(default=0)),
+                ('capacity_minutes', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('space', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_stats', to='spaces.space')),
+                ('working_space', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_stats', to='working_spaces.workingspace')),
+            ],
+            options={
+                'db_table': 'analytics_daily_space_stats',
+                'indexes': [models.Index(fields=['working_space', 'date'], name='stat_working_space_date_idx'), models.Index(fields=['date'], name='stat_date_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='dailyspacestat',
+            constraint=models.UniqueConstraint(fields=('space', 'date'), name='unique_daily_stat_per_space'),
+        ),
+    ]
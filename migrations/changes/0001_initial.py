@@ -0,0 +1,27 @@
+# Generated by Django 4.2.23 on 2026-10-19 13:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Change',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('entity', models.CharField(choices=[('working_space', 'Working Space'), ('space', 'Space'), ('amenity', 'Amenity'), ('space_price', 'Space Price')], max_length=20)),
+                ('object_id', models.PositiveBigIntegerField()),
+                ('operation', models.CharField(choices=[('upsert', 'Upsert'), ('delete', 'Delete')], max_length=10)),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_index=True)),
+            ],
+            options={
+                'db_table': 'changes_change_log',
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.23 on 2026-10-19 13:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('payment_histories', '0002_paymentwebhookevent_and_more'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='paymenthistory',
+            name='order_id',
+            field=models.CharField(db_index=True, max_length=100),
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 4.2.23 on 2026-10-19 09:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('space_bookings', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='spacebooking',
+            name='start_time',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='spacebooking',
+            name='end_time',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='spacebooking',
+            index=models.Index(fields=['space', 'start_time', 'end_time'], name='booking_space_time_idx'),
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 4.2.23 on 2026-10-19 13:11
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('spaces', '0003_space_space_working_space_idx_and_more'),
+        ('space_bookings', '0002_spacebooking_start_time_end_time'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SpaceOccupancy',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('opens_at', models.TimeField()),
+                ('slot_minutes', models.PositiveSmallIntegerField()),
+                ('slots', models.BinaryField()),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('space', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='occupancies', to='spaces.space')),
+            ],
+            options={
+                'db_table': 'space_bookings_occupancy',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='spaceoccupancy',
+            constraint=models.UniqueConstraint(fields=('space', 'date'), name='unique_occupancy_per_space_day'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.23 on 2026-10-19 13:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('space_bookings', '0003_spaceoccupancy_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='spacebooking',
+            name='order_id',
+            field=models.CharField(blank=True, db_index=True, max_length=100, null=True),
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 4.2.23 on 2026-10-19 13:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('space_bookings', '0004_spacebooking_order_id'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='spacebooking',
+            name='expires_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='spacebooking',
+            index=models.Index(fields=['status', 'expires_at'], name='booking_status_expiry_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.23 on 2026-10-19 13:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('space_prices', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='spaceprice',
+            name='version',
+            field=models.PositiveIntegerField(default=1),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.23 on 2026-10-19 13:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('spaces', '0003_space_space_working_space_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='space',
+            name='version',
+            field=models.PositiveIntegerField(default=1),
+        ),
+    ]
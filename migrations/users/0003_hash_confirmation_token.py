@@ -0,0 +1,36 @@
+# Generated by Django 4.2.23 on 2026-10-19 12:45
+
+import hashlib
+from django.db import migrations, models
+
+
+def hash_pending_confirmation_tokens(apps, schema_editor):
+    User = apps.get_model('users', 'User')
+    pending = User.objects.filter(
+        confirmation_token__isnull=False,
+        confirmed_at__isnull=True,
+    ).values_list('id', 'confirmation_token')
+
+    for user_id, token in pending.iterator():
+        User.objects.filter(id=user_id).update(
+            confirmation_token=hashlib.sha256(token.encode('utf-8')).hexdigest()
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0002_usertoken'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            hash_pending_confirmation_tokens,
+            migrations.RunPython.noop,
+        ),
+        migrations.AlterField(
+            model_name='user',
+            name='confirmation_token',
+            field=models.CharField(blank=True, db_index=True, max_length=64, null=True),
+        ),
+    ]
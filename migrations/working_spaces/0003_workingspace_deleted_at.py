@@ -0,0 +1,18 @@
+# Generated by Django 4.2.23 on 2026-10-19 13:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('working_spaces', '0002_remove_workingspace_location_workingspace_latitude_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='workingspace',
+            name='deleted_at',
+            field=models.DateTimeField(blank=True, db_index=True, null=True),
+        ),
+    ]
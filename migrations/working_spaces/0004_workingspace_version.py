@@ -0,0 +1,18 @@
+# Generated by Django 4.2.23 on 2026-10-19 13:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('working_spaces', '0003_workingspace_deleted_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='workingspace',
+            name='version',
+            field=models.PositiveIntegerField(default=1),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 4.2.23 on 2026-10-19 13:23
+
+import datetime
+from django.db import migrations, models
+import django.db.models.functions.comparison
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('working_spaces', '0004_workingspace_version'),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name='workingspace',
+            constraint=models.UniqueConstraint(models.F('name'), models.F('city'), django.db.models.functions.comparison.Coalesce('deleted_at', models.Value(datetime.datetime(1970, 1, 1, 0, 0, tzinfo=datetime.timezone.utc), output_field=models.DateTimeField())), name='unique_working_space_name_per_city'),
+        ),
+    ]
@@ -0,0 +1,54 @@
+from rest_framework import serializers
+from constants.messages import ModerationMessages
+from constants.models import (
+    AmenityStatusChoices,
+    ModerationActionChoices,
+    SpaceStatusChoices,
+)
+
+MAX_IDS = 1000
+
+
+class SpaceModerationSerializer(serializers.Serializer):
+    action = serializers.ChoiceField(choices=ModerationActionChoices.choices)
+    ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        required=False,
+        allow_empty=False,
+        max_length=MAX_IDS
+    )
+    working_space_id = serializers.IntegerField(required=False, min_value=1)
+    status = serializers.ChoiceField(
+        choices=SpaceStatusChoices.choices,
+        required=False
+    )
+    is_approved = serializers.BooleanField(required=False)
+
+    def validate(self, attrs):
+        selectors = ['ids', 'working_space_id', 'status', 'is_approved']
+        if not any(attrs.get(key) is not None for key in selectors):
+            raise serializers.ValidationError(
+                ModerationMessages.SELECTOR_REQUIRED
+            )
+        return attrs
+
+    def get_filters(self):
+        filters = {}
+
+        ids = self.validated_data.get('ids')
+        if ids:
+            filters['id__in'] = ids
+
+        for key in ['working_space_id', 'status', 'is_approved']:
+            value = self.validated_data.get(key)
+            if value is not None:
+                filters[key] = value
+
+        return filters
+
+
+class AmenityModerationSerializer(SpaceModerationSerializer):
+    status = serializers.ChoiceField(
+        choices=AmenityStatusChoices.choices,
+        required=False
+    )
@@ -0,0 +1,38 @@
+from django.db import transaction
+from django.utils import timezone
+from outbox.services import publish_bulk_update
+from utils.concurrency import version_bump
+from .signals import objects_moderated
+
+
+def bulk_moderate(queryset, changes):
+    """Apply ``changes`` to every matching row with one UPDATE.
+
+    Rows already in the target state are left alone. Returns the ids that
+    changed; objects_moderated is sent once for all of them on commit.
+    """
+    model = queryset.model
+
+    with transaction.atomic():
+        ids = list(
+            queryset.exclude(**changes)
+            .select_for_update()
+            .values_list('id', flat=True)
+        )
+        if not ids:
+            return ids
+
+        model.objects.filter(id__in=ids).update(
+            updated_at=timezone.now(),
+            **version_bump(model),
+            **changes
+        )
+        publish_bulk_update(model, ids, changes)
+
+        transaction.on_commit(lambda: objects_moderated.send(
+            sender=model,
+            ids=ids,
+            changes=changes
+        ))
+
+    return ids
@@ -0,0 +1,6 @@
+from django.dispatch import Signal
+
+# Sent once per bulk moderation, after commit, with the changed ``ids`` and
+# the applied ``changes``. Bulk updates bypass post_save, so receivers that
+# cache moderated objects should invalidate them from here in one batch.
+objects_moderated = Signal()
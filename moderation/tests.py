@@ -0,0 +1,93 @@
+from datetime import time
+from django.db import transaction
+from django.test import TestCase
+from constants import SpaceStatusChoices
+from outbox.models import OutboxEvent
+from spaces.models import Space
+from working_spaces.models import WorkingSpace
+from .services import bulk_moderate
+from .signals import objects_moderated
+
+APPROVE = {'is_approved': True, 'status': SpaceStatusChoices.ACTIVATED}
+
+
+class Rollback(Exception):
+    pass
+
+
+class BulkModerateTests(TestCase):
+    def setUp(self):
+        working_space = WorkingSpace.objects.create(
+            name='Hub',
+            city='Hanoi',
+            street='1 Main St'
+        )
+        self.spaces = [
+            Space.objects.create(
+                working_space=working_space,
+                name=f'Room {index}',
+                capacity=1,
+                location='Floor 1',
+                open_time=time(8),
+                close_time=time(18),
+                **(APPROVE if index == 0 else {})
+            )
+            for index in range(3)
+        ]
+        self.sent = []
+        objects_moderated.connect(self._receive)
+        self.addCleanup(objects_moderated.disconnect, self._receive)
+
+    def _receive(self, sender, ids, changes, **kwargs):
+        self.sent.append((sender, sorted(ids), changes))
+
+    def test_rows_already_moderated_are_left_alone(self):
+        pending = sorted(space.id for space in self.spaces[1:])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            ids = bulk_moderate(Space.objects.all(), APPROVE)
+
+        self.assertEqual(sorted(ids), pending)
+        self.assertEqual(self.sent, [(Space, pending, APPROVE)])
+        self.assertEqual(
+            dict(Space.objects.values_list('id', 'version')),
+            {self.spaces[0].id: 1, **{space_id: 2 for space_id in pending}}
+        )
+        self.assertEqual(
+            sorted(OutboxEvent.objects.filter(
+                event_type='space.updated'
+            ).values_list('aggregate_id', flat=True)),
+            pending
+        )
+
+    def test_nothing_to_change_sends_nothing(self):
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            ids = bulk_moderate(
+                Space.objects.filter(id=self.spaces[0].id), APPROVE
+            )
+
+        self.assertEqual(ids, [])
+        self.assertEqual(callbacks, [])
+        self.assertEqual(self.sent, [])
+
+    def test_signal_waits_for_commit(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            bulk_moderate(Space.objects.all(), APPROVE)
+            self.assertEqual(self.sent, [])
+
+        self.assertEqual(len(callbacks), 1)
+        self.assertEqual(self.sent, [])
+        callbacks[0]()
+        self.assertEqual(len(self.sent), 1)
+
+    def test_rolled_back_moderation_sends_nothing(self):
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            with self.assertRaises(Rollback), transaction.atomic():
+                bulk_moderate(Space.objects.all(), APPROVE)
+                raise Rollback
+
+        self.assertEqual(callbacks, [])
+        self.assertEqual(self.sent, [])
+        self.assertFalse(
+            Space.objects.filter(id=self.spaces[1].id, **APPROVE).exists()
+        )
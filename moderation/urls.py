@@ -0,0 +1,15 @@
+from django.urls import path
+from .views import AmenityBulkModerationView, SpaceBulkModerationView
+
+urlpatterns = [
+    path(
+        'spaces/',
+        SpaceBulkModerationView.as_view(),
+        name='moderation-spaces'
+    ),
+    path(
+        'amenities/',
+        AmenityBulkModerationView.as_view(),
+        name='moderation-amenities'
+    ),
+]
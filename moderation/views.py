@@ -0,0 +1,68 @@
+from rest_framework import status, permissions
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from amenities.models import Amenity
+from constants.messages import ModerationMessages
+from constants.models import (
+    AmenityStatusChoices,
+    ModerationActionChoices,
+    SpaceStatusChoices,
+)
+from spaces.models import Space
+from .serializers import AmenityModerationSerializer, SpaceModerationSerializer
+from .services import bulk_moderate
+
+
+def build_transitions(status_choices):
+    return {
+        ModerationActionChoices.APPROVE: {
+            'status': status_choices.ACTIVATED,
+            'is_approved': True,
+        },
+        ModerationActionChoices.BLOCK: {
+            'status': status_choices.BLOCKED,
+            'is_approved': False,
+        },
+        ModerationActionChoices.RESET: {
+            'status': status_choices.WAITING,
+            'is_approved': False,
+        },
+    }
+
+
+class BulkModerationView(APIView):
+    permission_classes = [permissions.IsAdminUser]
+    model = None
+    serializer_class = None
+    transitions = {}
+
+    def post(self, request):
+        serializer = self.serializer_class(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        action = serializer.validated_data['action']
+        ids = bulk_moderate(
+            self.model.objects.filter(**serializer.get_filters()),
+            self.transitions[action]
+        )
+
+        return Response({
+            'message': ModerationMessages.BULK_UPDATE_SUCCESS.format(
+                count=len(ids)
+            ),
+            'action': action,
+            'updated': len(ids),
+            'ids': ids
+        }, status=status.HTTP_200_OK)
+
+
+class SpaceBulkModerationView(BulkModerationView):
+    model = Space
+    serializer_class = SpaceModerationSerializer
+    transitions = build_transitions(SpaceStatusChoices)
+
+
+class AmenityBulkModerationView(BulkModerationView):
+    model = Amenity
+    serializer_class = AmenityModerationSerializer
+    transitions = build_transitions(AmenityStatusChoices)
@@ -0,0 +1,72 @@
+import time
+from datetime import timedelta
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from outbox.services import ensure_offsets, prune_delivered, relay_batch
+from outbox.sinks import load_sinks
+
+
+class Command(BaseCommand):
+    help = (
+        'Drain outbox events to the OUTBOX_SINKS consumers in ordered '
+        'batches, committing each consumer offset after delivery.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--consumer',
+            action='append',
+            help='Only relay to this consumer (repeatable).'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=settings.OUTBOX_BATCH_SIZE,
+            help='Number of events sent per batch.'
+        )
+        parser.add_argument(
+            '--poll-interval',
+            type=float,
+            default=1,
+            help='Seconds to wait when every consumer is caught up.'
+        )
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Exit once every consumer is caught up.'
+        )
+
+    def handle(self, *args, **options):
+        sinks = load_sinks(options['consumer'])
+        if not sinks:
+            raise CommandError('No outbox consumers are configured.')
+
+        ensure_offsets(sinks)
+        retention = timedelta(hours=settings.OUTBOX_RETENTION_HOURS)
+        try:
+            while True:
+                relayed = 0
+                for consumer, sink in sinks.items():
+                    count = relay_batch(
+                        consumer,
+                        sink,
+                        options['batch_size'],
+                        settings.OUTBOX_GAP_TIMEOUT_SECONDS,
+                        settings.OUTBOX_GAP_RECHECK_SECONDS
+                    )
+                    relayed += count
+                    if count:
+                        self.stdout.write(f'{consumer}: relayed {count}')
+
+                if relayed:
+                    continue
+
+                pruned = prune_delivered(list(settings.OUTBOX_SINKS), retention)
+                if pruned:
+                    self.stdout.write(f'Pruned {pruned} delivered events')
+                if options['once']:
+                    break
+                time.sleep(options['poll_interval'])
+        finally:
+            for sink in sinks.values():
+                sink.close()
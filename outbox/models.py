@@ -0,0 +1,39 @@
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+
+
+class OutboxEvent(models.Model):
+    """A domain event, written in the transaction of the change it records.
+
+    The auto-increment id orders events; consumers track the last id they
+    processed in ConsumerOffset.
+    """
+
+    aggregate = models.CharField(max_length=50)
+    aggregate_id = models.PositiveBigIntegerField()
+    event_type = models.CharField(max_length=100)
+    payload = models.JSONField(encoder=DjangoJSONEncoder)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = 'outbox_events'
+
+    def __str__(self):
+        return f"{self.id}: {self.event_type} {self.aggregate_id}"
+
+
+class ConsumerOffset(models.Model):
+    consumer = models.CharField(max_length=100, unique=True)
+    position = models.PositiveBigIntegerField(default=0)
+    # [first, last, skipped_at] id ranges passed over below position,
+    # re-read for a while in case their transaction commits late
+    gaps = models.JSONField(default=list, blank=True)
+
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'outbox_consumer_offsets'
+
+    def __str__(self):
+        return f"{self.consumer}: {self.position}"
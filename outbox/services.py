@@ -0,0 +1,209 @@
+from datetime import timedelta
+from django.db import transaction
+from django.db.models import Min, Q
+from django.utils import timezone
+from payment_histories.models import PaymentHistory
+from space_bookings.models import SpaceBooking
+from spaces.models import Space
+from .models import ConsumerOffset, OutboxEvent
+
+AGGREGATES = {
+    Space: 'space',
+    SpaceBooking: 'space_booking',
+    PaymentHistory: 'payment_history',
+}
+
+EVENT_FIELDS = (
+    'id', 'aggregate', 'aggregate_id', 'event_type', 'payload', 'created_at'
+)
+
+CREATED = 'created'
+UPDATED = 'updated'
+DELETED = 'deleted'
+
+
+def snapshot(instance):
+    return {
+        field.attname: field.value_from_object(instance)
+        for field in instance._meta.concrete_fields
+    }
+
+
+def publish(instance, event):
+    """Write an event for ``instance`` in the current transaction."""
+    aggregate = AGGREGATES[type(instance)]
+    OutboxEvent.objects.create(
+        aggregate=aggregate,
+        aggregate_id=instance.pk,
+        event_type=f'{aggregate}.{event}',
+        payload=snapshot(instance)
+    )
+
+
+def publish_many(instances, event):
+    """Events for rows written with bulk_create, which skips post_save."""
+    OutboxEvent.objects.bulk_create([
+        OutboxEvent(
+            aggregate=AGGREGATES[type(instance)],
+            aggregate_id=instance.pk,
+            event_type=f'{AGGREGATES[type(instance)]}.{event}',
+            payload=snapshot(instance)
+        )
+        for instance in instances
+    ], batch_size=1000)
+
+
+def publish_bulk_update(model, ids, changes):
+    """Events for a queryset.update(), which bypasses post_save."""
+    aggregate = AGGREGATES.get(model)
+    if aggregate is None:
+        return
+
+    OutboxEvent.objects.bulk_create([
+        OutboxEvent(
+            aggregate=aggregate,
+            aggregate_id=object_id,
+            event_type=f'{aggregate}.{UPDATED}',
+            payload={'id': object_id, **changes}
+        )
+        for object_id in ids
+    ], batch_size=1000)
+
+
+def read_events(position, limit, gap_timeout):
+    """Return up to ``limit`` events after ``position``, in id order.
+
+    Ids are allocated at insert time but become visible at commit, so a
+    missing id may belong to a transaction that is still open. Reading
+    stops before such a gap until it is older than ``gap_timeout``
+    seconds; after that it is skipped. Returns ``(events, gaps)`` with
+    the ``(first, last)`` id ranges skipped, so they can be re-read in
+    case the transaction commits later after all.
+    """
+    events = list(
+        OutboxEvent.objects.filter(id__gt=position)
+        .order_by('id')
+        .values_list(*EVENT_FIELDS)[:limit]
+    )
+
+    settled = timezone.now() - timedelta(seconds=gap_timeout)
+    expected = position + 1
+    gaps = []
+    for index, event in enumerate(events):
+        if event[0] != expected:
+            if event[5] > settled:
+                return events[:index], gaps
+            gaps.append((expected, event[0] - 1))
+        expected = event[0] + 1
+    return events, gaps
+
+
+def read_gap_events(gaps, recheck_seconds):
+    """Return events that turned up in skipped id ranges, and the gaps left.
+
+    ``gaps`` holds ``[first, last, skipped_at]`` entries. A range is
+    dropped once every id in it has been seen, or once it was skipped
+    more than ``recheck_seconds`` ago and is taken for a rollback.
+    """
+    if not gaps:
+        return [], []
+
+    ranges = Q()
+    for first, last, _ in gaps:
+        ranges |= Q(id__range=(first, last))
+    events = list(
+        OutboxEvent.objects.filter(ranges)
+        .order_by('id')
+        .values_list(*EVENT_FIELDS)
+    )
+
+    found = [event[0] for event in events]
+    expired = timezone.now().timestamp() - recheck_seconds
+    remaining = []
+    for first, last, skipped_at in gaps:
+        if skipped_at < expired:
+            continue
+        start = first
+        for event_id in found:
+            if first <= event_id <= last:
+                if event_id > start:
+                    remaining.append([start, event_id - 1, skipped_at])
+                start = event_id + 1
+        if start <= last:
+            remaining.append([start, last, skipped_at])
+    return events, remaining
+
+
+def ensure_offsets(consumers):
+    for consumer in consumers:
+        ConsumerOffset.objects.get_or_create(consumer=consumer)
+
+
+def prune_delivered(consumers, retention, batch_size=5000):
+    """Delete events older than ``retention`` that all consumers have seen.
+
+    Returns the number of deleted events.
+    """
+    offsets = ConsumerOffset.objects.filter(consumer__in=consumers)
+    if not consumers or offsets.count() < len(consumers):
+        return 0
+    position = offsets.aggregate(position=Min('position'))['position']
+
+    expired = OutboxEvent.objects.filter(
+        id__lte=position,
+        created_at__lt=timezone.now() - retention
+    )
+    deleted = 0
+    while True:
+        ids = list(expired.order_by('id').values_list(
+            'id', flat=True
+        )[:batch_size])
+        if not ids:
+            return deleted
+
+        OutboxEvent.objects.filter(id__in=ids).delete()
+        deleted += len(ids)
+
+
+def relay_batch(consumer, sink, batch_size, gap_timeout,
+                gap_recheck_seconds=0):
+    """Deliver the next batch for ``consumer``. Returns the batch size.
+
+    The offset row stays locked while the batch is sent, so concurrent
+    relays for the same consumer take turns instead of duplicating work.
+    Events from a transaction that committed after its ids were skipped
+    are delivered late, out of id order, within ``gap_recheck_seconds``
+    of the skip.
+    """
+    with transaction.atomic():
+        offset = ConsumerOffset.objects.select_for_update().get(
+            consumer=consumer
+        )
+        late, gaps = read_gap_events(offset.gaps, gap_recheck_seconds)
+        events, skipped = read_events(
+            offset.position, batch_size, gap_timeout
+        )
+        skipped_at = timezone.now().timestamp()
+        gaps.extend([first, last, skipped_at] for first, last in skipped)
+
+        batch = late + events
+        if batch:
+            sink.send([
+                {
+                    'id': event_id,
+                    'aggregate': aggregate,
+                    'aggregate_id': aggregate_id,
+                    'type': event_type,
+                    'payload': payload,
+                    'created_at': created_at
+                }
+                for event_id, aggregate, aggregate_id, event_type, payload,
+                created_at in batch
+            ])
+        if events:
+            offset.position = events[-1][0]
+        if batch or gaps != offset.gaps:
+            offset.gaps = gaps
+            offset.save(update_fields=['position', 'gaps', 'updated_at'])
+
+    return len(batch)
@@ -0,0 +1,22 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from payment_histories.models import PaymentHistory
+from space_bookings.models import SpaceBooking
+from spaces.models import Space
+from .services import CREATED, DELETED, UPDATED, publish
+
+
+@receiver(post_save, sender=Space)
+@receiver(post_save, sender=SpaceBooking)
+@receiver(post_save, sender=PaymentHistory)
+def publish_save(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    publish(instance, CREATED if created else UPDATED)
+
+
+@receiver(post_delete, sender=Space)
+@receiver(post_delete, sender=SpaceBooking)
+@receiver(post_delete, sender=PaymentHistory)
+def publish_delete(sender, instance, **kwargs):
+    publish(instance, DELETED)
@@ -0,0 +1,82 @@
+import os
+import orjson
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+
+class Sink:
+    """Receives ordered batches of events from the outbox relay.
+
+    ``send`` must only return once the batch is durably handed over; the
+    relay commits the consumer offset afterwards, so a failure or crash
+    in between redelivers the batch (at-least-once). Consumers dedupe on
+    the event ``id``.
+    """
+
+    def send(self, events):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+class FileSink(Sink):
+    """Append events as JSON lines to a local file."""
+
+    def __init__(self, path, fsync=True):
+        self.file = open(path, 'ab')
+        self.fsync = fsync
+
+    def send(self, events):
+        self.file.write(b''.join(
+            orjson.dumps(event) + b'\n' for event in events
+        ))
+        self.file.flush()
+        if self.fsync:
+            os.fsync(self.file.fileno())
+
+    def close(self):
+        self.file.close()
+
+
+class RedisStreamSink(Sink):
+    """XADD events to a Redis stream in one pipelined round trip."""
+
+    def __init__(self, stream, maxlen=None, alias='default'):
+        from django_redis import get_redis_connection
+
+        self.connection = get_redis_connection(alias)
+        self.stream = stream
+        self.maxlen = maxlen
+
+    def send(self, events):
+        pipeline = self.connection.pipeline(transaction=False)
+        for event in events:
+            pipeline.xadd(
+                self.stream,
+                {'id': event['id'], 'event': orjson.dumps(event)},
+                maxlen=self.maxlen,
+                approximate=True
+            )
+        pipeline.execute()
+
+
+class CallableSink(Sink):
+    """Pass each batch to a function given by dotted path."""
+
+    def __init__(self, path):
+        self.function = import_string(path)
+
+    def send(self, events):
+        self.function(events)
+
+
+def load_sinks(names=None):
+    """Instantiate the OUTBOX_SINKS entries, keyed by consumer name."""
+    sinks = {}
+    for name, config in settings.OUTBOX_SINKS.items():
+        if names and name not in names:
+            continue
+        backend = import_string(config['BACKEND'])
+        sinks[name] = backend(**config.get('OPTIONS', {}))
+    return sinks
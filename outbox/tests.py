@@ -0,0 +1,70 @@
+from datetime import timedelta
+from django.test import TestCase
+from django.utils import timezone
+from .models import ConsumerOffset, OutboxEvent
+from .services import relay_batch
+from .sinks import Sink
+
+
+class ListSink(Sink):
+    def __init__(self):
+        self.events = []
+
+    def send(self, events):
+        self.events.extend(event['id'] for event in events)
+
+
+class RelayGapTests(TestCase):
+    def setUp(self):
+        ConsumerOffset.objects.create(consumer='test')
+        self.sink = ListSink()
+
+    def _event(self, event_id, age=0):
+        event = OutboxEvent.objects.create(
+            id=event_id,
+            aggregate='space',
+            aggregate_id=1,
+            event_type='space.updated',
+            payload={}
+        )
+        OutboxEvent.objects.filter(id=event_id).update(
+            created_at=timezone.now() - timedelta(seconds=age)
+        )
+        return event
+
+    def _relay(self, recheck_seconds=3600):
+        return relay_batch('test', self.sink, 100, 5, recheck_seconds)
+
+    def test_waits_for_a_recent_gap(self):
+        self._event(1)
+        self._event(3)
+
+        self.assertEqual(self._relay(), 1)
+        self.assertEqual(self.sink.events, [1])
+        self.assertEqual(ConsumerOffset.objects.get().gaps, [])
+
+    def test_late_commit_in_a_skipped_gap_is_delivered(self):
+        self._event(1, age=60)
+        self._event(4, age=60)
+
+        self.assertEqual(self._relay(), 2)
+        offset = ConsumerOffset.objects.get()
+        self.assertEqual(offset.position, 4)
+        self.assertEqual(
+            [gap[:2] for gap in offset.gaps], [[2, 3]]
+        )
+
+        self._event(3)
+        self.assertEqual(self._relay(), 1)
+        self.assertEqual(self.sink.events, [1, 4, 3])
+        self.assertEqual(
+            [gap[:2] for gap in ConsumerOffset.objects.get().gaps], [[2, 2]]
+        )
+
+    def test_old_gaps_are_dropped(self):
+        self._event(1, age=60)
+        self._event(3, age=60)
+        self._relay()
+
+        self.assertEqual(self._relay(recheck_seconds=0), 0)
+        self.assertEqual(ConsumerOffset.objects.get().gaps, [])
@@ -0,0 +1,157 @@
+import json
+import random
+import time
+import uuid
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.test import Client
+from constants import PaymentMethodChoices, PaymentStatusChoices
+from payment_histories.models import PaymentHistory
+from payment_histories.services import (
+    STATUS_RANK,
+    apply_webhook_events,
+    sign_payload,
+)
+from payment_histories.views import SIGNATURE_HEADER
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        'Play a payment provider against the webhook endpoint: post '
+        'signed, redelivered and shuffled events for existing pending '
+        'payments, apply them and check every payment ends in its final '
+        'state. Everything is rolled back afterwards.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--orders', type=int, default=1000)
+        parser.add_argument(
+            '--duplicates',
+            type=int,
+            default=2,
+            help='Times each event is delivered.'
+        )
+        parser.add_argument(
+            '--callback-size',
+            type=int,
+            default=50,
+            help='Events per callback request.'
+        )
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument(
+            '--provider',
+            default=PaymentMethodChoices.CREDIT_CARD,
+            choices=PaymentMethodChoices.values
+        )
+
+    def handle(self, *args, **options):
+        if not settings.PAYMENT_WEBHOOK_SECRET:
+            raise CommandError('PAYMENT_WEBHOOK_SECRET is not set.')
+
+        try:
+            with transaction.atomic():
+                self._run(options)
+                raise Rollback
+        except Rollback:
+            pass
+
+    def _run(self, options):
+        # A group booking has one payment per booking under one order
+        order_ids = list(dict.fromkeys(PaymentHistory.objects.filter(
+            status=PaymentStatusChoices.PENDING
+        ).order_by('id').values_list('order_id', flat=True)[
+            :options['orders']
+        ]))
+        if not order_ids:
+            raise CommandError('No pending payments to settle.')
+
+        rng = random.Random(0)
+        expected = {}
+        events = []
+        for order_id in order_ids:
+            outcome = rng.choice((
+                PaymentStatusChoices.COMPLETED,
+                PaymentStatusChoices.COMPLETED,
+                PaymentStatusChoices.FAILED,
+                PaymentStatusChoices.REFUNDED,
+            ))
+            statuses = [PaymentStatusChoices.PENDING, outcome]
+            if outcome == PaymentStatusChoices.REFUNDED:
+                statuses.insert(1, PaymentStatusChoices.COMPLETED)
+            expected[order_id] = max(statuses, key=STATUS_RANK.get)
+            for payment_status in statuses:
+                event = {
+                    'id': uuid.uuid4().hex,
+                    'order_id': order_id,
+                    'status': payment_status,
+                }
+                events.extend([event] * options['duplicates'])
+        rng.shuffle(events)
+
+        host = settings.ALLOWED_HOSTS[0] if settings.ALLOWED_HOSTS else ''
+        headers = {'Host': host} if host and host != '*' else {}
+        client = Client()
+        path = f"/api/payments/webhooks/{options['provider']}/"
+        size = options['callback_size']
+
+        started = time.perf_counter()
+        for index in range(0, len(events), size):
+            body = json.dumps({'events': events[index:index + size]}).encode()
+            response = client.post(
+                path,
+                body,
+                content_type='application/json',
+                headers={**headers, SIGNATURE_HEADER: sign_payload(body)}
+            )
+            if response.status_code != 202:
+                raise CommandError(
+                    f'Callback failed with {response.status_code}: '
+                    f'{response.content[:200]!r}'
+                )
+        ingest_elapsed = time.perf_counter() - started
+
+        started = time.perf_counter()
+        applied = 0
+        while True:
+            count = apply_webhook_events(options['batch_size'])
+            if not count:
+                break
+            applied += count
+        apply_elapsed = time.perf_counter() - started
+
+        self.stdout.write(
+            f'Ingest: {len(events)} events in {ingest_elapsed:.2f} s '
+            f'({len(events) / ingest_elapsed:.0f} events/s)'
+        )
+        self.stdout.write(
+            f'Apply: {applied} unique events in {apply_elapsed:.2f} s '
+            f'({applied / max(apply_elapsed, 1e-9):.0f} events/s)'
+        )
+
+        wrong = [
+            (order_id, payment_status)
+            for order_id, payment_status in PaymentHistory.objects.filter(
+                order_id__in=order_ids
+            ).values_list('order_id', 'status')
+            if payment_status != expected[order_id]
+            # Bookings whose hold already lapsed can't take the payment
+            and not (
+                expected[order_id] == PaymentStatusChoices.COMPLETED
+                and payment_status == PaymentStatusChoices.REFUND_REQUIRED
+            )
+        ]
+        if wrong:
+            order_id, payment_status = wrong[0]
+            raise CommandError(
+                f'{len(wrong)} payments ended in the wrong state, e.g. '
+                f'{order_id}: {payment_status} instead of '
+                f'{expected[order_id]}.'
+            )
+        self.stdout.write(self.style.SUCCESS(
+            f'All {len(order_ids)} payments reached their final state.'
+        ))
@@ -0,0 +1,65 @@
+import time
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from payment_histories.services import (
+    apply_webhook_events,
+    prune_webhook_events,
+    requeue_dead_letters,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        'Apply stored payment webhook events in batches, then delete '
+        'processed events older than the retention period.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Number of events applied per transaction.'
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=1,
+            help='Seconds to wait when the inbox is empty.'
+        )
+        parser.add_argument(
+            '--requeue-dead-letters',
+            action='store_true',
+            help='Retry dead-lettered events, e.g. after fixing their orders.'
+        )
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Exit once the inbox is empty.'
+        )
+
+    def handle(self, *args, **options):
+        if options['requeue_dead_letters']:
+            requeued = requeue_dead_letters()
+            self.stdout.write(f'Requeued {requeued} dead-lettered events')
+
+        processed = 0
+        while True:
+            count = apply_webhook_events(options['batch_size'])
+            processed += count
+            if count:
+                self.stdout.write(f'Processed {processed} events')
+                continue
+
+            pruned = prune_webhook_events(
+                settings.PAYMENT_WEBHOOK_RETENTION_DAYS
+            )
+            if pruned:
+                self.stdout.write(f'Pruned {pruned} old events')
+            if options['once']:
+                break
+            time.sleep(options['interval'])
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Processed {processed} webhook events.'
+        ))
@@ -44,10 +44,58 @@ class PaymentHistory(models.Model):
         validators=[MinValueValidator(Decimal('0.01'))]
     )
     
-    order_id = models.CharField(max_length=100, unique=True)
+    # Shared by the payments of a group booking, one per booking
+    order_id = models.CharField(max_length=100, db_index=True)
     
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
     def __str__(self):
         return f"Payment {self.order_id} - {self.amount} ({self.status})"
+
+
+class PaymentWebhookEvent(models.Model):
+    """Raw provider callback, stored as received before it is applied.
+
+    The inbox is append-only: a retried callback hits the unique
+    (provider, event_id) constraint and is dropped on insert. The worker
+    sets ``processed_at`` once the event has been applied, or
+    ``dead_lettered_at`` once it gave up on finding its order.
+    """
+
+    provider = models.CharField(
+        max_length=30,
+        choices=PaymentMethodChoices.choices
+    )
+    event_id = models.CharField(max_length=100)
+    order_id = models.CharField(max_length=100)
+    status = models.CharField(
+        max_length=20,
+        choices=PaymentStatusChoices.choices
+    )
+    payload = models.JSONField()
+
+    received_at = models.DateTimeField(auto_now_add=True)
+    processed_at = models.DateTimeField(null=True, blank=True)
+    # Events for an unknown order are retried with backoff, then parked
+    attempts = models.PositiveSmallIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(null=True, blank=True)
+    dead_lettered_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = 'payment_webhook_events'
+        indexes = [
+            models.Index(
+                fields=['processed_at', 'id'],
+                name='webhook_processed_idx'
+            ),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=['provider', 'event_id'],
+                name='unique_webhook_event_per_provider'
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.provider} {self.event_id}: {self.order_id} {self.status}"
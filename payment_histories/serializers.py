@@ -0,0 +1,38 @@
+from rest_framework import serializers
+from constants.models import PaymentStatusChoices
+
+MAX_EVENTS_PER_CALLBACK = 500
+
+# REFUND_REQUIRED is set by us, never reported by a provider
+PROVIDER_STATUSES = [
+    choice for choice in PaymentStatusChoices.choices
+    if choice[0] != PaymentStatusChoices.REFUND_REQUIRED
+]
+
+
+class WebhookEventSerializer(serializers.Serializer):
+    id = serializers.CharField(max_length=100)
+    order_id = serializers.CharField(max_length=100)
+    status = serializers.ChoiceField(choices=PROVIDER_STATUSES)
+    occurred_at = serializers.DateTimeField(required=False)
+
+    def to_internal_value(self, data):
+        event = super().to_internal_value(data)
+        # Keep the event as the provider sent it for the inbox
+        event['payload'] = data
+        return event
+
+
+class WebhookCallbackSerializer(serializers.Serializer):
+    """A callback carries one event, or a batch under ``events``."""
+
+    events = WebhookEventSerializer(
+        many=True,
+        min_length=1,
+        max_length=MAX_EVENTS_PER_CALLBACK
+    )
+
+    def to_internal_value(self, data):
+        if isinstance(data, dict) and 'events' not in data:
+            data = {'events': [data]}
+        return super().to_internal_value(data)
@@ -0,0 +1,299 @@
+import hashlib
+import hmac
+import logging
+from collections import defaultdict
+from datetime import timedelta
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+from analytics.services import payment_keys
+from analytics.signals import schedule_rebuild
+from constants import BookingStatusChoices, PaymentStatusChoices
+from outbox.services import publish_bulk_update
+from space_bookings.models import SpaceBooking
+from space_bookings.services import bulk_set_status
+from .models import PaymentHistory, PaymentWebhookEvent
+
+logger = logging.getLogger(__name__)
+
+# Payment states only move forward. Applying the highest-ranked status
+# seen for an order makes the outcome independent of delivery order and
+# of how often an event is redelivered.
+STATUS_RANK = {
+    PaymentStatusChoices.PENDING: 0,
+    PaymentStatusChoices.FAILED: 1,
+    PaymentStatusChoices.COMPLETED: 2,
+    PaymentStatusChoices.REFUND_REQUIRED: 3,
+    PaymentStatusChoices.REFUNDED: 4,
+}
+
+# Booking states each payment outcome moves to, and from which states
+BOOKING_TRANSITIONS = {
+    PaymentStatusChoices.COMPLETED: (
+        BookingStatusChoices.SUCCEEDED,
+        (BookingStatusChoices.PROCESSING,),
+    ),
+    PaymentStatusChoices.FAILED: (
+        BookingStatusChoices.CANCELED,
+        (BookingStatusChoices.PROCESSING,),
+    ),
+    PaymentStatusChoices.REFUNDED: (
+        BookingStatusChoices.CANCELED,
+        (BookingStatusChoices.PROCESSING, BookingStatusChoices.SUCCEEDED),
+    ),
+}
+
+
+def sign_payload(body):
+    return hmac.new(
+        settings.PAYMENT_WEBHOOK_SECRET.encode(),
+        body,
+        hashlib.sha256
+    ).hexdigest()
+
+
+def verify_signature(body, signature):
+    if not settings.PAYMENT_WEBHOOK_SECRET or not signature:
+        return False
+    return hmac.compare_digest(sign_payload(body), signature)
+
+
+def ingest_events(provider, events):
+    """Store validated callback events in the inbox with one INSERT.
+
+    Redelivered events collide with the (provider, event_id) constraint
+    and are ignored, so the callback stays cheap and safe to retry.
+    """
+    PaymentWebhookEvent.objects.bulk_create(
+        [
+            PaymentWebhookEvent(
+                provider=provider,
+                event_id=event['id'],
+                order_id=event['order_id'],
+                status=event['status'],
+                payload=event['payload']
+            )
+            for event in events
+        ],
+        ignore_conflicts=True
+    )
+
+
+def _target_statuses(events):
+    targets = {}
+    for _, order_id, event_status, _ in events:
+        current = targets.get(order_id)
+        if current is None or STATUS_RANK[event_status] > STATUS_RANK[current]:
+            targets[order_id] = event_status
+    return targets
+
+
+def _payment_moves(payments, targets):
+    """``{payment_id: status}`` for the payments their events move forward."""
+    moves = {}
+    for payment_id, order_id, current, _, _ in payments:
+        target = targets[order_id]
+        if STATUS_RANK[target] > STATUS_RANK[current]:
+            moves[payment_id] = target
+    return moves
+
+
+def _update_payments(moves, now):
+    """Write the payment moves with one UPDATE per status."""
+    by_status = defaultdict(list)
+    for payment_id, payment_status in moves.items():
+        by_status[payment_status].append(payment_id)
+
+    for payment_status, ids in by_status.items():
+        PaymentHistory.objects.filter(id__in=ids).update(
+            status=payment_status,
+            updated_at=now
+        )
+        publish_bulk_update(PaymentHistory, ids, {'status': payment_status})
+
+
+def _update_bookings(payments, moves, now):
+    """Confirm or cancel the bookings of the payments that moved.
+
+    Returns ``({booking_id: space_id}, unconfirmed)``: the bookings it
+    looked at, and those a completed payment came too late for because
+    their hold had already expired or been released.
+    """
+    booking_targets = {}
+    order_targets = {}
+    for payment_id, order_id, _, booking_id, _ in payments:
+        if payment_id in moves:
+            booking_targets[booking_id] = moves[payment_id]
+            order_targets[order_id] = moves[payment_id]
+    bookings = list(
+        SpaceBooking.objects.select_for_update().filter(
+            Q(order_id__in=list(order_targets))
+            | Q(id__in=list(booking_targets))
+        ).order_by('id').values_list(
+            'id', 'order_id', 'space_id', 'status', 'start_time',
+            'end_time', 'expires_at'
+        )
+    )
+
+    transitions = {}
+    space_ids = {}
+    unconfirmed = set()
+    for (
+        booking_id, order_id, space_id, current, start_time, end_time,
+        expires_at
+    ) in bookings:
+        space_ids[booking_id] = space_id
+        payment_status = booking_targets.get(
+            booking_id, order_targets.get(order_id)
+        )
+        if payment_status == PaymentStatusChoices.COMPLETED and (
+            current == BookingStatusChoices.CANCELED
+            or (
+                current == BookingStatusChoices.PROCESSING
+                and expires_at is not None
+                and expires_at <= now
+            )
+        ):
+            # The seats may already be gone; the money has to go back
+            unconfirmed.add(booking_id)
+            continue
+
+        target, sources = BOOKING_TRANSITIONS.get(payment_status, (None, ()))
+        if current not in sources:
+            continue
+        transitions.setdefault(target, []).append(
+            (booking_id, space_id, current, start_time, end_time)
+        )
+
+    for target, rows in transitions.items():
+        if target == BookingStatusChoices.SUCCEEDED:
+            bulk_set_status(rows, target, expires_at=None)
+        else:
+            bulk_set_status(rows, target)
+    return space_ids, unconfirmed
+
+
+def _retry_later(events, now):
+    """Back off events whose order is unknown, dead-lettering old ones.
+
+    The webhook can beat the commit of the payment it is about, so the
+    event is tried again with exponential backoff before giving up.
+    """
+    by_attempts = defaultdict(list)
+    for event_id, _, _, attempts in events:
+        by_attempts[attempts + 1].append(event_id)
+
+    for attempts, ids in by_attempts.items():
+        retried = PaymentWebhookEvent.objects.filter(id__in=ids)
+        if attempts >= settings.PAYMENT_WEBHOOK_MAX_ATTEMPTS:
+            retried.update(attempts=attempts, dead_lettered_at=now)
+            logger.error(
+                'Dead-lettered %d webhook events for unknown orders',
+                len(ids)
+            )
+            continue
+        retried.update(
+            attempts=attempts,
+            next_attempt_at=now + timedelta(
+                seconds=settings.PAYMENT_WEBHOOK_RETRY_SECONDS
+                * 2 ** (attempts - 1)
+            )
+        )
+
+
+def apply_webhook_events(batch_size=1000):
+    """Apply one batch of due inbox events.
+
+    Events are collapsed per order first, so a payment is written once
+    per batch however many callbacks it got. Payments are locked in id
+    order and inbox rows another worker holds are skipped. Events for
+    orders that don't exist (yet) are retried later. A payment that
+    completes after its booking's hold is gone is set to
+    REFUND_REQUIRED instead of COMPLETED. Returns the number of events
+    looked at.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        events = list(
+            PaymentWebhookEvent.objects.select_for_update(skip_locked=True)
+            .filter(
+                Q(next_attempt_at__isnull=True) | Q(next_attempt_at__lte=now),
+                processed_at__isnull=True,
+                dead_lettered_at__isnull=True
+            )
+            .order_by('id')
+            .values_list('id', 'order_id', 'status', 'attempts')[:batch_size]
+        )
+        if not events:
+            return 0
+
+        targets = _target_statuses(events)
+        payments = list(
+            PaymentHistory.objects.select_for_update().filter(
+                order_id__in=list(targets)
+            ).order_by('id').values_list(
+                'id', 'order_id', 'status', 'space_booking_id', 'created_at'
+            )
+        )
+        known = {payment[1] for payment in payments}
+        unknown = [event for event in events if event[1] not in known]
+        if unknown:
+            logger.warning(
+                'Webhook events for %d unknown orders, retrying later',
+                len({event[1] for event in unknown})
+            )
+            _retry_later(unknown, now)
+
+        moves = _payment_moves(payments, targets)
+        if moves:
+            space_ids, unconfirmed = _update_bookings(payments, moves, now)
+            for payment_id, order_id, _, booking_id, _ in payments:
+                if (
+                    booking_id in unconfirmed
+                    and moves.get(payment_id) == PaymentStatusChoices.COMPLETED
+                ):
+                    moves[payment_id] = PaymentStatusChoices.REFUND_REQUIRED
+                    logger.warning(
+                        'Payment %s completed after booking %s expired; '
+                        'refund required', order_id, booking_id
+                    )
+            _update_payments(moves, now)
+
+            stat_keys = set()
+            for payment_id, _, _, booking_id, created_at in payments:
+                if payment_id in moves and booking_id in space_ids:
+                    stat_keys |= payment_keys(
+                        space_ids[booking_id], created_at
+                    )
+            schedule_rebuild(stat_keys)
+
+        PaymentWebhookEvent.objects.filter(
+            id__in=[event[0] for event in events if event[1] in known]
+        ).update(processed_at=now)
+
+    return len(events)
+
+
+def requeue_dead_letters():
+    """Give dead-lettered events a fresh set of attempts."""
+    return PaymentWebhookEvent.objects.filter(
+        processed_at__isnull=True,
+        dead_lettered_at__isnull=False
+    ).update(attempts=0, next_attempt_at=None, dead_lettered_at=None)
+
+
+def prune_webhook_events(days, batch_size=5000):
+    """Delete processed events older than ``days`` in batches."""
+    expired = PaymentWebhookEvent.objects.filter(
+        processed_at__lt=timezone.now() - timedelta(days=days)
+    )
+    deleted = 0
+    while True:
+        ids = list(
+            expired.order_by('id').values_list('id', flat=True)[:batch_size]
+        )
+        if not ids:
+            return deleted
+        PaymentWebhookEvent.objects.filter(id__in=ids).delete()
+        deleted += len(ids)
@@ -1,3 +1,153 @@
-from django.test import TestCase
+import uuid
+from datetime import datetime, time, timedelta
+from decimal import Decimal
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from analytics.models import DailySpaceStat
+from constants import (
+    BookingStatusChoices,
+    PaymentMethodChoices,
+    PaymentStatusChoices,
+    PriceTypeChoices,
+    SpaceStatusChoices,
+)
+from space_bookings.models import SpaceBooking
+from space_bookings.services import book_group
+from space_prices.models import SpacePrice
+from spaces.models import Space
+from working_spaces.models import WorkingSpace
+from .models import PaymentHistory, PaymentWebhookEvent
+from .services import apply_webhook_events, ingest_events
 
-# Create your tests here.
+
+class GroupPaymentWebhookTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            username='payer',
+            email='payer@example.com',
+            password='secret',
+            first_name='Pay',
+            last_name='Er'
+        )
+        working_space = WorkingSpace.objects.create(
+            name='Hub',
+            city='Hanoi',
+            street='1 Main St'
+        )
+        self.spaces = []
+        for name, hourly in (('Desk', '5.00'), ('Meeting room', '20.00')):
+            space = Space.objects.create(
+                working_space=working_space,
+                name=name,
+                capacity=4,
+                location='Floor 1',
+                open_time=time(8),
+                close_time=time(18),
+                status=SpaceStatusChoices.ACTIVATED,
+                is_approved=True
+            )
+            SpacePrice.objects.create(
+                space=space,
+                type=PriceTypeChoices.HOUR,
+                price=Decimal(hourly)
+            )
+            self.spaces.append(space)
+
+        day = timezone.localdate() + timedelta(days=1)
+        start_time = timezone.make_aware(datetime.combine(day, time(9)))
+        self.bookings, self.payments = book_group(
+            self.user,
+            [
+                {
+                    'space_id': space.id,
+                    'start_time': start_time,
+                    'end_time': start_time + timedelta(hours=2)
+                }
+                for space in self.spaces
+            ],
+            PaymentMethodChoices.CREDIT_CARD
+        )
+
+    def _settle(self, payment_status, order_id=None):
+        order_id = order_id or self.payments[0].order_id
+        ingest_events(PaymentMethodChoices.CREDIT_CARD, [{
+            'id': uuid.uuid4().hex,
+            'order_id': order_id,
+            'status': payment_status,
+            'payload': {},
+        }])
+        with self.captureOnCommitCallbacks(execute=True):
+            apply_webhook_events()
+
+    def test_group_gets_one_payment_per_booking(self):
+        self.assertEqual(
+            [(p.space_booking_id, p.amount) for p in self.payments],
+            [(b.id, b.price) for b in self.bookings]
+        )
+        self.assertEqual(
+            [b.price for b in self.bookings],
+            [Decimal('10.00'), Decimal('40.00')]
+        )
+        self.assertEqual(
+            len({payment.order_id for payment in self.payments}), 1
+        )
+
+    def test_completion_confirms_every_booking_and_its_revenue(self):
+        self._settle(PaymentStatusChoices.COMPLETED)
+
+        self.assertEqual(
+            set(PaymentHistory.objects.values_list('status', flat=True)),
+            {PaymentStatusChoices.COMPLETED}
+        )
+        self.assertEqual(
+            set(SpaceBooking.objects.values_list('status', flat=True)),
+            {BookingStatusChoices.SUCCEEDED}
+        )
+        revenue = dict(DailySpaceStat.objects.filter(
+            date=timezone.localdate()
+        ).values_list('space_id', 'revenue'))
+        self.assertEqual(revenue, {
+            booking.space_id: booking.price for booking in self.bookings
+        })
+
+    def test_failure_cancels_every_booking(self):
+        self._settle(PaymentStatusChoices.FAILED)
+
+        self.assertEqual(
+            set(SpaceBooking.objects.values_list('status', flat=True)),
+            {BookingStatusChoices.CANCELED}
+        )
+
+    def test_late_completion_requires_a_refund(self):
+        SpaceBooking.objects.update(expires_at=timezone.now())
+
+        self._settle(PaymentStatusChoices.COMPLETED)
+
+        self.assertEqual(
+            set(PaymentHistory.objects.values_list('status', flat=True)),
+            {PaymentStatusChoices.REFUND_REQUIRED}
+        )
+        self.assertEqual(
+            set(SpaceBooking.objects.values_list('status', flat=True)),
+            {BookingStatusChoices.PROCESSING}
+        )
+        self.assertFalse(DailySpaceStat.objects.exists())
+
+    def test_unknown_order_is_retried_not_dropped(self):
+        self._settle(PaymentStatusChoices.COMPLETED, order_id='unknown')
+
+        event = PaymentWebhookEvent.objects.get()
+        self.assertIsNone(event.processed_at)
+        self.assertEqual(event.attempts, 1)
+        self.assertGreater(event.next_attempt_at, timezone.now())
+        # Not due yet
+        self.assertEqual(apply_webhook_events(), 0)
+
+    @override_settings(PAYMENT_WEBHOOK_MAX_ATTEMPTS=1)
+    def test_unknown_order_is_dead_lettered(self):
+        self._settle(PaymentStatusChoices.COMPLETED, order_id='unknown')
+
+        event = PaymentWebhookEvent.objects.get()
+        self.assertIsNone(event.processed_at)
+        self.assertIsNotNone(event.dead_lettered_at)
@@ -1,3 +1,44 @@
-from django.shortcuts import render
+from rest_framework import status, permissions
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from constants import PaymentMethodChoices
+from constants.messages import PaymentMessages
+from .serializers import WebhookCallbackSerializer
+from .services import ingest_events, verify_signature
 
-# Create your views here.
+SIGNATURE_HEADER = 'X-Webhook-Signature'
+
+
+class PaymentWebhookView(APIView):
+    """Receive payment provider callbacks into the webhook inbox.
+
+    The callback only verifies, validates and stores the events; the
+    process_payment_webhooks worker applies them. It answers 202 for
+    redelivered events too, so the provider stops retrying.
+    """
+
+    authentication_classes = []
+    permission_classes = [permissions.AllowAny]
+
+    def post(self, request, provider):
+        if provider not in PaymentMethodChoices.values:
+            return Response({
+                'message': PaymentMessages.UNKNOWN_PROVIDER
+            }, status=status.HTTP_404_NOT_FOUND)
+
+        if not verify_signature(
+            request.body, request.headers.get(SIGNATURE_HEADER)
+        ):
+            return Response({
+                'message': PaymentMessages.INVALID_SIGNATURE
+            }, status=status.HTTP_403_FORBIDDEN)
+
+        serializer = WebhookCallbackSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        events = serializer.validated_data['events']
+        ingest_events(provider, events)
+
+        return Response(
+            {'received': len(events)},
+            status=status.HTTP_202_ACCEPTED
+        )
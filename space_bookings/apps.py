@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class SpaceBookingsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'space_bookings'
+
+    def ready(self):
+        from . import signals  # noqa: F401
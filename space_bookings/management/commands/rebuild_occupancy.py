@@ -0,0 +1,98 @@
+from datetime import date
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from analytics.services import day_bounds, days_between
+from space_bookings.models import SpaceBooking, SpaceOccupancy
+from space_bookings.occupancy import (
+    OCCUPYING_STATUSES,
+    build_counts,
+    decode,
+    rebuild_occupancy,
+)
+from spaces.models import Space
+
+
+class Command(BaseCommand):
+    help = (
+        'Rebuild the slot occupancy vectors from bookings, or with --verify '
+        'compare the stored vectors with the bookings.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--since',
+            help='Only days on or after this ISO date (default: today).'
+        )
+        parser.add_argument('--space-id', type=int)
+        parser.add_argument(
+            '--verify',
+            action='store_true',
+            help='Report mismatches instead of rebuilding.'
+        )
+
+    def handle(self, *args, **options):
+        since = timezone.localdate()
+        if options['since']:
+            since = date.fromisoformat(options['since'])
+
+        spaces = Space.objects.only(
+            'id', 'capacity', 'open_time', 'close_time'
+        ).order_by('id')
+        if options['space_id']:
+            spaces = spaces.filter(pk=options['space_id'])
+
+        mismatches = 0
+        checked = 0
+        for space in spaces.iterator():
+            days = set(SpaceOccupancy.objects.filter(
+                space_id=space.id,
+                date__gte=since
+            ).values_list('date', flat=True))
+
+            intervals = SpaceBooking.objects.filter(
+                space_id=space.id,
+                status__in=OCCUPYING_STATUSES,
+                end_time__gt=day_bounds(since)[0]
+            ).values_list('start_time', 'end_time')
+            for start_time, end_time in intervals:
+                days.update(
+                    day for day in days_between(start_time, end_time)
+                    if day >= since
+                )
+
+            for day in sorted(days):
+                checked += 1
+                if not options['verify']:
+                    rebuild_occupancy(space, day)
+                    continue
+
+                stored = SpaceOccupancy.objects.filter(
+                    space_id=space.id,
+                    date=day
+                ).values_list('slots', flat=True).first()
+                expected = build_counts(space, day)
+                # A missing row stands for a day without bookings
+                actual = decode(stored) if stored is not None else []
+                if stored is None and not any(expected):
+                    continue
+
+                if actual != expected:
+                    mismatches += 1
+                    self.stdout.write(self.style.ERROR(
+                        f'Space {space.id} on {day}: stored '
+                        f'{list(actual)}, bookings {list(expected)}'
+                    ))
+
+        if not options['verify']:
+            self.stdout.write(self.style.SUCCESS(
+                f'Rebuilt {checked} occupancy rows.'
+            ))
+            return
+
+        if mismatches:
+            raise CommandError(
+                f'{mismatches} of {checked} occupancy rows do not match.'
+            )
+        self.stdout.write(self.style.SUCCESS(
+            f'All {checked} occupancy rows match the bookings.'
+        ))
@@ -0,0 +1,43 @@
+import time
+from django.core.management.base import BaseCommand
+from space_bookings.services import release_expired_holds
+
+
+class Command(BaseCommand):
+    help = 'Cancel expired booking holds in batches and free their seats.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=500,
+            help='Number of holds released per transaction.'
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=5,
+            help='Seconds to wait when no hold has expired.'
+        )
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Exit once no expired hold is left.'
+        )
+
+    def handle(self, *args, **options):
+        released = 0
+        while True:
+            count = release_expired_holds(options['batch_size'])
+            released += count
+            if count:
+                self.stdout.write(f'Released {released} holds')
+                continue
+
+            if options['once']:
+                break
+            time.sleep(options['interval'])
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Released {released} expired holds.'
+        ))
@@ -0,0 +1,166 @@
+import random
+import threading
+import time
+from collections import Counter
+from datetime import datetime, time as day_time, timedelta
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import OperationalError, connection
+from django.utils import timezone
+from constants import PaymentMethodChoices, SpaceStatusChoices
+from space_bookings.models import SpaceBooking
+from space_bookings.occupancy import OCCUPYING_STATUSES
+from space_bookings.services import CapacityUnavailable, book_group
+from spaces.models import Space
+
+
+class Command(BaseCommand):
+    help = (
+        'Run overlapping group bookings from many threads, then check that '
+        'no deadlock occurred and no slot is booked over capacity. Meant '
+        'for a staging database; created bookings are removed afterwards.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--threads', type=int, default=8)
+        parser.add_argument('--groups', type=int, default=25)
+        parser.add_argument('--spaces', type=int, default=6)
+        parser.add_argument('--group-size', type=int, default=3)
+        parser.add_argument('--user-id', type=int)
+        parser.add_argument(
+            '--keep',
+            action='store_true',
+            help='Keep the created bookings.'
+        )
+
+    def handle(self, *args, **options):
+        user_model = get_user_model()
+        users = user_model.objects.order_by('id')
+        if options['user_id']:
+            users = users.filter(pk=options['user_id'])
+        user = users.first()
+        if user is None:
+            raise CommandError('No user to book with.')
+
+        spaces = list(Space.objects.filter(
+            status=SpaceStatusChoices.ACTIVATED,
+            is_approved=True,
+            working_space__deleted_at__isnull=True,
+            prices__isnull=False
+        ).distinct().order_by('id')[:options['spaces']])
+        if len(spaces) < options['group_size']:
+            raise CommandError('Not enough bookable spaces with prices.')
+
+        day = timezone.localdate() + timedelta(days=1)
+        latest_open = max(space.open_time for space in spaces)
+        window_start = timezone.make_aware(datetime.combine(day, latest_open))
+
+        outcomes = Counter()
+        order_ids = []
+        lock = threading.Lock()
+
+        def worker(seed):
+            rng = random.Random(seed)
+            try:
+                for _ in range(options['groups']):
+                    # Items in random order: the service must still lock
+                    # the spaces in id order
+                    group = rng.sample(spaces, options['group_size'])
+                    start_time = window_start + timedelta(
+                        minutes=30 * rng.randrange(4)
+                    )
+                    items = [
+                        {
+                            'space_id': space.id,
+                            'start_time': start_time,
+                            'end_time': start_time + timedelta(hours=1)
+                        }
+                        for space in group
+                    ]
+                    try:
+                        _, payments = book_group(
+                            user, items, PaymentMethodChoices.CREDIT_CARD
+                        )
+                    except CapacityUnavailable:
+                        outcome = 'rejected (capacity)'
+                    except OperationalError as exc:
+                        outcome = (
+                            'deadlock' if 'deadlock' in str(exc).lower()
+                            else f'database error: {exc}'
+                        )
+                    else:
+                        outcome = 'booked'
+                        with lock:
+                            order_ids.append(payments[0].order_id)
+                    with lock:
+                        outcomes[outcome] += 1
+            finally:
+                connection.close()
+
+        started = time.perf_counter()
+        threads = [
+            threading.Thread(target=worker, args=(seed,))
+            for seed in range(options['threads'])
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+
+        for outcome, count in sorted(outcomes.items()):
+            self.stdout.write(f'  {count:6d}  {outcome}')
+        self.stdout.write(
+            f'{sum(outcomes.values())} groups in {elapsed:.2f} s'
+        )
+
+        overbooked = self._overbooked(spaces, day)
+        try:
+            call_command(
+                'rebuild_occupancy',
+                verify=True,
+                since=day.isoformat(),
+                stdout=self.stdout
+            )
+        finally:
+            if not options['keep']:
+                SpaceBooking.objects.filter(order_id__in=order_ids).delete()
+
+        if outcomes['deadlock'] or overbooked:
+            raise CommandError(
+                f'{outcomes["deadlock"]} deadlocks, {overbooked} '
+                'overbooked slots.'
+            )
+        self.stdout.write(self.style.SUCCESS(
+            'No deadlocks and no overbooking.'
+        ))
+
+    def _overbooked(self, spaces, day):
+        """Count 30-minute slots with more bookings than capacity."""
+        overbooked = 0
+        for space in spaces:
+            slot_start = timezone.make_aware(
+                datetime.combine(day, day_time.min)
+            )
+            bookings = list(SpaceBooking.objects.filter(
+                space_id=space.id,
+                status__in=OCCUPYING_STATUSES,
+                start_time__lt=slot_start + timedelta(days=1),
+                end_time__gt=slot_start
+            ).values_list('start_time', 'end_time'))
+
+            for _ in range(48):
+                slot_end = slot_start + timedelta(minutes=30)
+                booked = sum(
+                    1 for start_time, end_time in bookings
+                    if start_time < slot_end and end_time > slot_start
+                )
+                if booked > space.capacity:
+                    overbooked += 1
+                    self.stdout.write(self.style.ERROR(
+                        f'Space {space.id} at {slot_start}: {booked} '
+                        f'bookings, capacity {space.capacity}'
+                    ))
+                slot_start = slot_end
+        return overbooked
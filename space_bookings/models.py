@@ -34,9 +34,70 @@ class SpaceBooking(models.Model):
         decimal_places=2,
         validators=[MinValueValidator(Decimal('0.01'))]
     )
+
+    # Null for bookings made before booking times were recorded; they
+    # are left out of occupancy and analytics
+    start_time = models.DateTimeField(null=True, blank=True)
+    end_time = models.DateTimeField(null=True, blank=True)
+
+    # A PROCESSING booking is a hold on its seats until this time
+    expires_at = models.DateTimeField(null=True, blank=True)
+
+    # Shared by the bookings of a group and their PaymentHistory order
+    order_id = models.CharField(
+        max_length=100,
+        null=True,
+        blank=True,
+        db_index=True
+    )
     
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=['space', 'start_time', 'end_time'],
+                name='booking_space_time_idx'
+            ),
+            models.Index(
+                fields=['status', 'expires_at'],
+                name='booking_status_expiry_idx'
+            ),
+        ]
     
     def __str__(self):
         return f"{self.user} - {self.space} ({self.start_time} to {self.end_time})"
+
+
+class SpaceOccupancy(models.Model):
+    """Booked-seat counts per fixed slot for one space and day.
+
+    ``slots`` packs one unsigned 16-bit count per slot, starting at
+    ``opens_at``; see space_bookings.occupancy. A row built for other
+    opening hours or another slot size is stale and rebuilt on read.
+    """
+
+    space = models.ForeignKey(
+        Space,
+        on_delete=models.CASCADE,
+        related_name='occupancies'
+    )
+    date = models.DateField()
+    opens_at = models.TimeField()
+    slot_minutes = models.PositiveSmallIntegerField()
+    slots = models.BinaryField()
+
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'space_bookings_occupancy'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['space', 'date'],
+                name='unique_occupancy_per_space_day'
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.space_id} - {self.date}"
@@ -0,0 +1,294 @@
+import logging
+import sys
+from array import array
+from datetime import datetime, timedelta
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, transaction
+from django.utils import timezone
+from analytics.services import day_bounds, days_between
+from constants import BookingStatusChoices
+from .models import SpaceBooking, SpaceOccupancy
+
+logger = logging.getLogger(__name__)
+
+# Bookings in these states hold their seats. Expired PROCESSING holds
+# are subtracted on read until release_expired_holds cancels them.
+OCCUPYING_STATUSES = (
+    BookingStatusChoices.PROCESSING,
+    BookingStatusChoices.SUCCEEDED,
+)
+
+
+def occupies(status, start_time, end_time):
+    return (
+        status in OCCUPYING_STATUSES
+        and start_time is not None
+        and end_time is not None
+        and end_time > start_time
+    )
+
+
+def encode(counts):
+    if sys.byteorder == 'big':
+        counts = array('H', counts)
+        counts.byteswap()
+    return counts.tobytes()
+
+
+def decode(data):
+    counts = array('H')
+    counts.frombytes(bytes(data))
+    if sys.byteorder == 'big':
+        counts.byteswap()
+    return counts
+
+
+def opening(space, day):
+    """Return the aware opening datetime and slot count of ``day``."""
+    opens = timezone.make_aware(datetime.combine(day, space.open_time))
+    closes = timezone.make_aware(datetime.combine(day, space.close_time))
+    slot = timedelta(minutes=settings.OCCUPANCY_SLOT_MINUTES)
+    return opens, max(-(-(closes - opens) // slot), 0)
+
+
+def slot_range(opens, slot_count, start_time, end_time):
+    """Slots [first, last) that overlap the booking, clipped to the day."""
+    slot = timedelta(minutes=settings.OCCUPANCY_SLOT_MINUTES)
+    first = max((start_time - opens) // slot, 0)
+    last = min(-(-(end_time - opens) // slot), slot_count)
+    return first, max(last, first)
+
+
+def build_counts(space, day):
+    """Compute a day's counts from the bookings themselves."""
+    opens, slot_count = opening(space, day)
+    counts = array('H', bytes(2 * slot_count))
+    day_start, day_end = day_bounds(day)
+
+    intervals = SpaceBooking.objects.using(DEFAULT_DB_ALIAS).filter(
+        space_id=space.id,
+        status__in=OCCUPYING_STATUSES,
+        start_time__lt=day_end,
+        end_time__gt=day_start
+    ).values_list('start_time', 'end_time')
+    for start_time, end_time in intervals:
+        first, last = slot_range(opens, slot_count, start_time, end_time)
+        for index in range(first, last):
+            counts[index] += 1
+    return counts
+
+
+def rebuild_occupancy(space, day):
+    counts = build_counts(space, day)
+    SpaceOccupancy.objects.update_or_create(
+        space_id=space.id,
+        date=day,
+        defaults={
+            'opens_at': space.open_time,
+            'slot_minutes': settings.OCCUPANCY_SLOT_MINUTES,
+            'slots': encode(counts),
+        }
+    )
+    return counts
+
+
+def is_stale(space, opens_at, slot_minutes, counts, day):
+    return (
+        opens_at != space.open_time
+        or slot_minutes != settings.OCCUPANCY_SLOT_MINUTES
+        or len(counts) != opening(space, day)[1]
+    )
+
+
+def _add_changes(space, day, counts, changes):
+    """Add seat deltas to ``counts``; False if a count would go negative."""
+    opens, slot_count = opening(space, day)
+    for start_time, end_time, delta in changes:
+        first, last = slot_range(opens, slot_count, start_time, end_time)
+        for index in range(first, last):
+            count = counts[index] + delta
+            if count < 0:
+                return False
+            counts[index] = count
+    return True
+
+
+def apply_bookings(space, changes):
+    """Apply ``(start_time, end_time, delta)`` seat changes to a space.
+
+    Rows are locked in date order, so concurrent updates of the same
+    space cannot deadlock. A missing or stale row is rebuilt from the
+    bookings instead, which already reflect these changes.
+    """
+    days = set()
+    for start_time, end_time, _ in changes:
+        days.update(days_between(start_time, end_time))
+
+    with transaction.atomic():
+        for day in sorted(days):
+            occupancy = SpaceOccupancy.objects.select_for_update().filter(
+                space_id=space.id,
+                date=day
+            ).first()
+            if occupancy is None:
+                rebuild_occupancy(space, day)
+                continue
+
+            counts = decode(occupancy.slots)
+            if is_stale(
+                space, occupancy.opens_at, occupancy.slot_minutes, counts, day
+            ):
+                rebuild_occupancy(space, day)
+                continue
+
+            if not _add_changes(space, day, counts, changes):
+                # Releasing seats the row never counted means it drifted
+                # from the bookings; those are the source of truth
+                logger.warning(
+                    'Occupancy of space %s on %s went negative; rebuilding',
+                    space.id, day
+                )
+                rebuild_occupancy(space, day)
+                continue
+            occupancy.slots = encode(counts)
+            occupancy.save(update_fields=['slots', 'updated_at'])
+
+
+def load_occupancies(spaces, days):
+    """Return ``{(space_id, day): counts}`` for many pairs.
+
+    Spaces without a row have no bookings that day. Holds that have
+    expired but not been released yet are left out, so availability
+    never waits for the reaper. Two queries whatever the size.
+
+    Reads go to the primary even on replica-routed requests: a stale
+    row is rebuilt and written back, and a lagging replica would bring
+    back counts that miss the latest bookings.
+    """
+    spaces = {space.id: space for space in spaces}
+    days = set(days)
+    rows = SpaceOccupancy.objects.using(DEFAULT_DB_ALIAS).filter(
+        space_id__in=list(spaces),
+        date__in=list(days)
+    ).values_list('space_id', 'date', 'opens_at', 'slot_minutes', 'slots')
+
+    occupancy = {}
+    for space_id, day, opens_at, slot_minutes, slots in rows:
+        space = spaces[space_id]
+        counts = decode(slots)
+        if is_stale(space, opens_at, slot_minutes, counts, day):
+            counts = rebuild_occupancy(space, day)
+        occupancy[space_id, day] = counts
+
+    for space_id, space in spaces.items():
+        for day in days:
+            if (space_id, day) not in occupancy:
+                occupancy[space_id, day] = array(
+                    'H', bytes(2 * opening(space, day)[1])
+                )
+
+    expired_holds = SpaceBooking.objects.using(DEFAULT_DB_ALIAS).filter(
+        space_id__in=list(spaces),
+        status=BookingStatusChoices.PROCESSING,
+        expires_at__lte=timezone.now(),
+        start_time__lt=day_bounds(max(days))[1],
+        end_time__gt=day_bounds(min(days))[0]
+    ).values_list('space_id', 'start_time', 'end_time')
+    drifted = set()
+    for space_id, start_time, end_time in expired_holds:
+        space = spaces[space_id]
+        for day in days.intersection(days_between(start_time, end_time)):
+            opens, slot_count = opening(space, day)
+            first, last = slot_range(opens, slot_count, start_time, end_time)
+            counts = occupancy[space_id, day]
+            for index in range(first, last):
+                if counts[index]:
+                    counts[index] -= 1
+                else:
+                    drifted.add((space_id, day))
+    for space_id, day in sorted(drifted):
+        logger.warning(
+            'Occupancy of space %s on %s does not count an expired hold',
+            space_id, day
+        )
+    return occupancy
+
+
+def load_occupancy(spaces, day):
+    """Return ``{space_id: counts}`` for many spaces on one day."""
+    return {
+        space_id: counts
+        for (space_id, _), counts in load_occupancies(spaces, [day]).items()
+    }
+
+
+def free_mask(counts, capacity, seats):
+    """Bitmask with bit ``i`` set when slot ``i`` has ``seats`` free."""
+    mask = 0
+    for index, count in enumerate(counts):
+        if capacity - count >= seats:
+            mask |= 1 << index
+    return mask
+
+
+def run_starts(mask, length):
+    """Bits where ``length`` consecutive set bits of ``mask`` begin.
+
+    Shifting and AND-ing tests every start position at once; doubling
+    the run each step keeps it to O(log length) big-int operations.
+    """
+    if length <= 0:
+        return mask
+    starts = mask
+    covered = 1
+    while covered < length:
+        step = min(covered, length - covered)
+        starts &= starts >> step
+        covered += step
+    return starts
+
+
+def find_free_slots(spaces, day, slots_needed, seats=1):
+    """Find where each space has ``seats`` free for a run of slots.
+
+    Returns ``{space_id: [start datetime, ...]}`` for runs of
+    ``slots_needed`` consecutive slots; spaces without one are left out.
+    """
+    occupancy = load_occupancy(spaces, day)
+    slot = timedelta(minutes=settings.OCCUPANCY_SLOT_MINUTES)
+
+    free = {}
+    for space in spaces:
+        mask = free_mask(occupancy[space.id], space.capacity, seats)
+        starts = run_starts(mask, slots_needed)
+        if starts:
+            opens = opening(space, day)[0]
+            free[space.id] = [
+                opens + index * slot
+                for index in range(starts.bit_length())
+                if starts >> index & 1
+            ]
+    return free
+
+
+def free_between(spaces, start_time, end_time, seats=1):
+    """Return the ids of spaces with ``seats`` free for the whole range.
+
+    The range must fall on one day and inside each space's opening hours.
+    """
+    day = timezone.localdate(start_time)
+    occupancy = load_occupancy(spaces, day)
+
+    free = set()
+    for space in spaces:
+        opens, slot_count = opening(space, day)
+        closes = timezone.make_aware(datetime.combine(day, space.close_time))
+        if start_time < opens or end_time > closes:
+            continue
+
+        first, last = slot_range(opens, slot_count, start_time, end_time)
+        mask = free_mask(occupancy[space.id], space.capacity, seats)
+        needed = ((1 << last) - 1) & ~((1 << first) - 1)
+        if mask & needed == needed:
+            free.add(space.id)
+    return free
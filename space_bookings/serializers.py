@@ -0,0 +1,45 @@
+from rest_framework import serializers
+from constants.models import PaymentMethodChoices
+from utils.validators import validate_same_day_window
+from .models import SpaceBooking
+
+MAX_GROUP_SIZE = 20
+
+
+class GroupBookingItemSerializer(serializers.Serializer):
+    space_id = serializers.IntegerField(min_value=1)
+    start_time = serializers.DateTimeField()
+    end_time = serializers.DateTimeField()
+
+    def validate(self, attrs):
+        validate_same_day_window(attrs['start_time'], attrs['end_time'])
+        return attrs
+
+
+class GroupBookingSerializer(serializers.Serializer):
+    items = GroupBookingItemSerializer(
+        many=True,
+        min_length=1,
+        max_length=MAX_GROUP_SIZE
+    )
+    payment_method = serializers.ChoiceField(
+        choices=PaymentMethodChoices.choices,
+        default=PaymentMethodChoices.CREDIT_CARD
+    )
+
+
+class SpaceBookingSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = SpaceBooking
+        fields = [
+            'id',
+            'space',
+            'status',
+            'price_type',
+            'price',
+            'start_time',
+            'end_time',
+            'expires_at',
+            'order_id',
+            'created_at'
+        ]
@@ -0,0 +1,262 @@
+import uuid
+from collections import defaultdict
+from datetime import datetime, timedelta
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from rest_framework import serializers
+from constants import (
+    BookingStatusChoices,
+    PaymentTypeChoices,
+    SpaceStatusChoices,
+)
+from analytics.services import booking_keys
+from analytics.signals import schedule_rebuild
+from constants.messages import BookingMessages
+from outbox.services import CREATED, publish_bulk_update, publish_many
+from payment_histories.models import PaymentHistory
+from space_prices.models import SpacePrice
+from spaces.models import Space
+from spaces.search import quote
+from working_spaces.models import WorkingSpace
+from .models import SpaceBooking
+from .occupancy import (
+    apply_bookings,
+    load_occupancies,
+    occupies,
+    opening,
+    slot_range,
+)
+
+
+class CapacityUnavailable(Exception):
+    def __init__(self, items):
+        super().__init__(items)
+        self.items = items
+
+
+def _lock_spaces(space_ids):
+    """Lock the spaces in ascending id order.
+
+    Every group booking takes its locks in the same global order, so two
+    groups that share spaces queue behind each other instead of
+    deadlocking.
+    """
+    spaces = {
+        space.id: space
+        for space in Space.objects.select_for_update().filter(
+            id__in=space_ids
+        ).only(
+            'id', 'working_space_id', 'status', 'is_approved', 'capacity',
+            'open_time', 'close_time'
+        ).order_by('id')
+    }
+    live_working_spaces = set(WorkingSpace.objects.filter(
+        id__in={space.working_space_id for space in spaces.values()}
+    ).values_list('id', flat=True))
+
+    for space_id in space_ids:
+        space = spaces.get(space_id)
+        if (
+            space is None
+            or space.working_space_id not in live_working_spaces
+            or space.status != SpaceStatusChoices.ACTIVATED
+            or not space.is_approved
+        ):
+            raise serializers.ValidationError({
+                'items': BookingMessages.SPACE_NOT_BOOKABLE.format(
+                    space_id=space_id
+                )
+            })
+    return spaces
+
+
+def _check_opening_hours(spaces, items):
+    for item in items:
+        space = spaces[item['space_id']]
+        day = timezone.localdate(item['start_time'])
+        opens = opening(space, day)[0]
+        closes = timezone.make_aware(datetime.combine(day, space.close_time))
+        if item['start_time'] < opens or item['end_time'] > closes:
+            raise serializers.ValidationError({
+                'items': BookingMessages.OUTSIDE_OPENING_HOURS
+            })
+
+
+def _quote_items(spaces, items):
+    prices = defaultdict(dict)
+    for space_id, price_type, price in SpacePrice.objects.filter(
+        space_id__in=list(spaces)
+    ).values_list('space_id', 'type', 'price'):
+        prices[space_id][price_type] = price
+
+    quotes = []
+    for item in items:
+        item_quote = quote(
+            prices[item['space_id']], item['start_time'], item['end_time']
+        )
+        if item_quote is None:
+            raise serializers.ValidationError({
+                'items': BookingMessages.PRICE_NOT_AVAILABLE.format(
+                    space_id=item['space_id']
+                )
+            })
+        quotes.append(item_quote)
+    return quotes
+
+
+def _unavailable_items(spaces, items):
+    """Indexes of items without a free seat, counting earlier items."""
+    occupancy = load_occupancies(
+        spaces.values(),
+        {timezone.localdate(item['start_time']) for item in items}
+    )
+
+    unavailable = []
+    for index, item in enumerate(items):
+        space = spaces[item['space_id']]
+        day = timezone.localdate(item['start_time'])
+        counts = occupancy[space.id, day]
+        opens, slot_count = opening(space, day)
+        first, last = slot_range(
+            opens, slot_count, item['start_time'], item['end_time']
+        )
+        if any(counts[slot] >= space.capacity for slot in range(first, last)):
+            unavailable.append(index)
+            continue
+        for slot in range(first, last):
+            counts[slot] += 1
+    return unavailable
+
+
+def book_group(user, items, payment_method):
+    """Book several spaces at once, all or nothing, under one order.
+
+    The bookings start as holds that expire after BOOKING_HOLD_SECONDS
+    unless the payment confirms them. Raises CapacityUnavailable with
+    the indexes of the items that don't fit. Returns the created
+    bookings and their PaymentHistory rows, one per booking.
+    """
+    space_ids = sorted({item['space_id'] for item in items})
+    order_id = uuid.uuid4().hex
+    expires_at = timezone.now() + timedelta(
+        seconds=settings.BOOKING_HOLD_SECONDS
+    )
+
+    with transaction.atomic():
+        spaces = _lock_spaces(space_ids)
+        _check_opening_hours(spaces, items)
+        quotes = _quote_items(spaces, items)
+
+        unavailable = _unavailable_items(spaces, items)
+        if unavailable:
+            raise CapacityUnavailable(unavailable)
+
+        SpaceBooking.objects.bulk_create([
+            SpaceBooking(
+                user=user,
+                space_id=item['space_id'],
+                status=BookingStatusChoices.PROCESSING,
+                price_type=price_type,
+                price=amount,
+                start_time=item['start_time'],
+                end_time=item['end_time'],
+                expires_at=expires_at,
+                order_id=order_id
+            )
+            for item, (price_type, amount) in zip(items, quotes)
+        ])
+        # MySQL doesn't return ids from bulk inserts; read them back
+        bookings = list(
+            SpaceBooking.objects.filter(order_id=order_id).order_by('id')
+        )
+
+        # bulk_create skips post_save, so do what its receivers would
+        changes = defaultdict(list)
+        for booking in bookings:
+            changes[booking.space_id].append(
+                (booking.start_time, booking.end_time, 1)
+            )
+        for space_id in sorted(changes):
+            apply_bookings(spaces[space_id], changes[space_id])
+        publish_many(bookings, CREATED)
+
+        # One payment per booking, so revenue lands on the right space;
+        # the shared order_id is what the provider settles
+        PaymentHistory.objects.bulk_create([
+            PaymentHistory(
+                space_booking=booking,
+                payment_type=PaymentTypeChoices.NEW,
+                payment_method=payment_method,
+                amount=booking.price,
+                order_id=order_id
+            )
+            for booking in bookings
+        ])
+        payments = list(
+            PaymentHistory.objects.filter(order_id=order_id).order_by('id')
+        )
+        # Pending payments carry no revenue, so only the outbox needs them
+        publish_many(payments, CREATED)
+
+    return bookings, payments
+
+
+def bulk_set_status(bookings, status, **fields):
+    """Move bookings to ``status`` with one UPDATE.
+
+    ``bookings`` are ``(id, space_id, status, start_time, end_time)``
+    rows, locked by the caller. update() skips post_save, so occupancy,
+    analytics and outbox events are maintained here instead.
+    """
+    now = timezone.now()
+    ids = [booking[0] for booking in bookings]
+    SpaceBooking.objects.filter(id__in=ids).update(
+        status=status,
+        updated_at=now,
+        **fields
+    )
+
+    changes = defaultdict(list)
+    stat_keys = set()
+    for _, space_id, previous, start_time, end_time in bookings:
+        delta = (
+            occupies(status, start_time, end_time)
+            - occupies(previous, start_time, end_time)
+        )
+        if delta:
+            changes[space_id].append((start_time, end_time, delta))
+        if BookingStatusChoices.SUCCEEDED in (previous, status):
+            stat_keys |= booking_keys(space_id, start_time, end_time)
+
+    spaces = Space.objects.only(
+        'id', 'capacity', 'open_time', 'close_time'
+    ).in_bulk(list(changes))
+    for space_id in sorted(changes):
+        if space_id in spaces:
+            apply_bookings(spaces[space_id], changes[space_id])
+    schedule_rebuild(stat_keys)
+    publish_bulk_update(SpaceBooking, ids, {'status': status, **fields})
+
+
+def release_expired_holds(batch_size=500):
+    """Cancel one batch of expired holds and free their seats.
+
+    Rows another reaper or a payment is working on are skipped rather
+    than waited for. Returns the number of released holds.
+    """
+    with transaction.atomic():
+        holds = list(
+            SpaceBooking.objects.select_for_update(skip_locked=True)
+            .filter(
+                status=BookingStatusChoices.PROCESSING,
+                expires_at__lte=timezone.now()
+            )
+            .order_by('expires_at')
+            .values_list('id', 'space_id', 'status', 'start_time', 'end_time')
+            [:batch_size]
+        )
+        if holds:
+            bulk_set_status(holds, BookingStatusChoices.CANCELED)
+
+    return len(holds)
@@ -0,0 +1,76 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+from spaces.models import Space
+from .models import SpaceBooking
+from .occupancy import apply_bookings, occupies
+
+_paused = ContextVar('occupancy_paused', default=False)
+
+
+@contextmanager
+def pause_occupancy_updates():
+    """Skip occupancy updates for bookings whose space is being deleted."""
+    token = _paused.set(True)
+    try:
+        yield
+    finally:
+        _paused.reset(token)
+
+
+def _apply(changes):
+    """Apply ``{space_id: [(start_time, end_time, delta)]}``."""
+    spaces = Space.objects.only(
+        'id', 'capacity', 'open_time', 'close_time'
+    ).in_bulk(list(changes))
+    for space_id in sorted(changes):
+        if space_id in spaces:
+            apply_bookings(spaces[space_id], changes[space_id])
+
+
+@receiver(pre_save, sender=SpaceBooking)
+def remember_booking_slots(sender, instance, raw=False, **kwargs):
+    instance._occupancy_previous = None
+    if instance.pk is None or raw or _paused.get():
+        return
+
+    instance._occupancy_previous = SpaceBooking.objects.filter(
+        pk=instance.pk
+    ).values_list('space_id', 'status', 'start_time', 'end_time').first()
+
+
+@receiver(post_save, sender=SpaceBooking)
+def update_occupancy(sender, instance, raw=False, **kwargs):
+    if raw or _paused.get():
+        return
+
+    previous = getattr(instance, '_occupancy_previous', None)
+    current = (
+        instance.space_id, instance.status,
+        instance.start_time, instance.end_time
+    )
+    if previous == current:
+        return
+
+    changes = {}
+    if previous and occupies(*previous[1:]):
+        changes.setdefault(previous[0], []).append(
+            (previous[2], previous[3], -1)
+        )
+    if occupies(*current[1:]):
+        changes.setdefault(current[0], []).append(
+            (current[2], current[3], 1)
+        )
+    _apply(changes)
+
+
+@receiver(post_delete, sender=SpaceBooking)
+def release_occupancy(sender, instance, **kwargs):
+    if _paused.get():
+        return
+
+    if occupies(instance.status, instance.start_time, instance.end_time):
+        _apply({
+            instance.space_id: [(instance.start_time, instance.end_time, -1)]
+        })
@@ -1,3 +1,304 @@
-from django.test import TestCase
+import random
+import threading
+from array import array
+from datetime import datetime, time, timedelta
+from decimal import Decimal
+from django.contrib.auth import get_user_model
+from django.db import DEFAULT_DB_ALIAS, connection, connections
+from django.db import OperationalError
+from django.test import TestCase, TransactionTestCase, skipUnlessDBFeature
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from constants import (
+    BookingStatusChoices,
+    PaymentMethodChoices,
+    PriceTypeChoices,
+    SpaceStatusChoices,
+)
+from space_prices.models import SpacePrice
+from spaces.models import Space
+from utils.db_routing import PrimaryReplicaRouter, use_replicas
+from working_spaces.models import WorkingSpace
+from .models import SpaceBooking, SpaceOccupancy
+from .occupancy import (
+    build_counts,
+    decode,
+    encode,
+    load_occupancies,
+    opening,
+    slot_range,
+)
+from .services import (
+    CapacityUnavailable,
+    book_group,
+    bulk_set_status,
+    release_expired_holds,
+)
 
-# Create your tests here.
+User = get_user_model()
+
+
+def create_user():
+    return User.objects.create_user(
+        username='booker',
+        email='booker@example.com',
+        password='secret',
+        first_name='Book',
+        last_name='Er'
+    )
+
+
+def create_space(working_space=None, name='Desk', **fields):
+    if working_space is None:
+        working_space = WorkingSpace.objects.create(
+            name='Hub',
+            city='Hanoi',
+            street='1 Main St'
+        )
+    return Space.objects.create(
+        working_space=working_space,
+        name=name,
+        capacity=2,
+        location='Floor 1',
+        open_time=time(8),
+        close_time=time(18),
+        **fields
+    )
+
+
+class ReplicaRoutingTests(TransactionTestCase):
+    """Run with the test settings, which add a ``replica_1`` alias."""
+
+    databases = {DEFAULT_DB_ALIAS, 'replica_1'}
+
+    def setUp(self):
+        self.user = create_user()
+        self.space = create_space()
+        self.day = timezone.localdate() + timedelta(days=1)
+
+    def _book(self, start_hour, end_hour):
+        return SpaceBooking.objects.create(
+            user=self.user,
+            space=self.space,
+            status=BookingStatusChoices.SUCCEEDED,
+            price_type=PriceTypeChoices.HOUR,
+            price=Decimal('10.00'),
+            start_time=timezone.make_aware(
+                datetime.combine(self.day, time(start_hour))
+            ),
+            end_time=timezone.make_aware(
+                datetime.combine(self.day, time(end_hour))
+            )
+        )
+
+    def test_safe_reads_go_to_the_replica(self):
+        router = PrimaryReplicaRouter()
+
+        self.assertEqual(router.db_for_read(Space), DEFAULT_DB_ALIAS)
+        with use_replicas():
+            self.assertEqual(router.db_for_read(Space), 'replica_1')
+            self.assertEqual(router.db_for_read(User), DEFAULT_DB_ALIAS)
+        self.assertEqual(router.db_for_write(Space), DEFAULT_DB_ALIAS)
+
+    def test_occupancy_reads_stay_on_the_primary(self):
+        self._book(9, 11)
+
+        with use_replicas(), CaptureQueriesContext(
+            connections['replica_1']
+        ) as replica_queries:
+            occupancy = load_occupancies([self.space], [self.day])
+
+        self.assertEqual(len(replica_queries), 0)
+        booking = SpaceBooking.objects.get()
+        first, last = slot_range(
+            *opening(self.space, self.day),
+            booking.start_time,
+            booking.end_time
+        )
+        counts = occupancy[self.space.id, self.day]
+        self.assertEqual(
+            list(counts),
+            [int(first <= index < last) for index in range(len(counts))]
+        )
+
+
+class OccupancyTests(TestCase):
+    """The stored occupancy must always match the bookings themselves."""
+
+    def setUp(self):
+        self.user = create_user()
+        self.space = create_space(
+            status=SpaceStatusChoices.ACTIVATED,
+            is_approved=True
+        )
+        SpacePrice.objects.create(
+            space=self.space,
+            type=PriceTypeChoices.HOUR,
+            price=Decimal('5.00')
+        )
+        self.day = timezone.localdate() + timedelta(days=1)
+
+    def _at(self, hour):
+        return timezone.make_aware(datetime.combine(self.day, time(hour)))
+
+    def _book(self, *hours):
+        bookings, _ = book_group(
+            self.user,
+            [
+                {
+                    'space_id': self.space.id,
+                    'start_time': self._at(start),
+                    'end_time': self._at(end)
+                }
+                for start, end in hours
+            ],
+            PaymentMethodChoices.CREDIT_CARD
+        )
+        return bookings
+
+    def _stored(self):
+        return list(decode(
+            SpaceOccupancy.objects.get(space=self.space, date=self.day).slots
+        ))
+
+    def _expected(self):
+        return list(build_counts(self.space, self.day))
+
+    def _rows(self, bookings):
+        return [
+            (
+                booking.id, booking.space_id, booking.status,
+                booking.start_time, booking.end_time
+            )
+            for booking in bookings
+        ]
+
+    def test_booking_counts_its_seats(self):
+        self._book((9, 11), (10, 12))
+
+        self.assertEqual(self._stored(), self._expected())
+        self.assertEqual(max(self._stored()), 2)
+
+    def test_cancel_releases_seats(self):
+        bookings = self._book((9, 11), (10, 12))
+
+        bulk_set_status(self._rows(bookings[:1]), BookingStatusChoices.CANCELED)
+
+        self.assertEqual(self._stored(), self._expected())
+        self.assertEqual(max(self._stored()), 1)
+
+    def test_expired_holds_are_hidden_then_released(self):
+        self._book((9, 11))
+        SpaceBooking.objects.update(expires_at=timezone.now())
+
+        loaded = load_occupancies([self.space], [self.day])
+        self.assertEqual(set(loaded[self.space.id, self.day]), {0})
+
+        self.assertEqual(release_expired_holds(), 1)
+        self.assertEqual(self._stored(), self._expected())
+        self.assertEqual(set(self._stored()), {0})
+
+    def test_drifted_row_is_rebuilt_instead_of_clamped(self):
+        bookings = self._book((9, 11), (14, 15))
+        SpaceOccupancy.objects.update(
+            slots=encode(array('H', [0] * len(self._stored())))
+        )
+
+        with self.assertLogs('space_bookings.occupancy', 'WARNING'):
+            bulk_set_status(
+                self._rows(bookings[:1]), BookingStatusChoices.CANCELED
+            )
+
+        self.assertEqual(self._stored(), self._expected())
+        self.assertEqual(max(self._stored()), 1)
+
+
+@skipUnlessDBFeature('has_select_for_update')
+class GroupBookingConcurrencyTests(TransactionTestCase):
+    """Overlapping group bookings from many threads on a real database.
+
+    SQLite has no row locks and serialises writers, so this only runs
+    against MySQL or PostgreSQL.
+    """
+
+    threads = 8
+    groups_per_thread = 10
+    group_size = 3
+
+    def setUp(self):
+        self.user = create_user()
+        working_space = WorkingSpace.objects.create(
+            name='Hub',
+            city='Hanoi',
+            street='1 Main St'
+        )
+        self.spaces = []
+        for index in range(5):
+            space = create_space(
+                working_space=working_space,
+                name=f'Room {index}',
+                status=SpaceStatusChoices.ACTIVATED,
+                is_approved=True
+            )
+            SpacePrice.objects.create(
+                space=space,
+                type=PriceTypeChoices.HOUR,
+                price=Decimal('5.00')
+            )
+            self.spaces.append(space)
+        self.day = timezone.localdate() + timedelta(days=1)
+
+    def _worker(self, seed, outcomes, lock):
+        rng = random.Random(seed)
+        opens = timezone.make_aware(datetime.combine(self.day, time(9)))
+        try:
+            for _ in range(self.groups_per_thread):
+                # Items in random order: the service must still lock the
+                # spaces in id order
+                start_time = opens + timedelta(minutes=30 * rng.randrange(4))
+                items = [
+                    {
+                        'space_id': space.id,
+                        'start_time': start_time,
+                        'end_time': start_time + timedelta(hours=1)
+                    }
+                    for space in rng.sample(self.spaces, self.group_size)
+                ]
+                try:
+                    book_group(
+                        self.user, items, PaymentMethodChoices.CREDIT_CARD
+                    )
+                    outcome = 'booked'
+                except CapacityUnavailable:
+                    outcome = 'rejected'
+                except OperationalError:
+                    outcome = 'error'
+                with lock:
+                    outcomes.append(outcome)
+        finally:
+            connection.close()
+
+    def test_no_deadlock_or_overbooking(self):
+        outcomes = []
+        lock = threading.Lock()
+        workers = [
+            threading.Thread(target=self._worker, args=(seed, outcomes, lock))
+            for seed in range(self.threads)
+        ]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+
+        self.assertEqual(
+            len(outcomes), self.threads * self.groups_per_thread
+        )
+        self.assertNotIn('error', outcomes)
+        self.assertIn('booked', outcomes)
+        self.assertIn('rejected', outcomes)
+
+        for space in self.spaces:
+            expected = build_counts(space, self.day)
+            self.assertLessEqual(max(expected), space.capacity)
+            stored = SpaceOccupancy.objects.get(space=space, date=self.day)
+            self.assertEqual(list(decode(stored.slots)), list(expected))
@@ -0,0 +1,6 @@
+from django.urls import path
+from .views import GroupBookingView
+
+urlpatterns = [
+    path('group/', GroupBookingView.as_view(), name='booking-group'),
+]
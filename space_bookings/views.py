@@ -1,3 +1,36 @@
-from django.shortcuts import render
+from rest_framework import status, permissions
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from constants.messages import BookingMessages
+from .serializers import GroupBookingSerializer, SpaceBookingSerializer
+from .services import CapacityUnavailable, book_group
 
-# Create your views here.
+
+class GroupBookingView(APIView):
+    """Book several spaces atomically under a single payment order."""
+
+    permission_classes = [permissions.IsAuthenticated]
+
+    def post(self, request):
+        serializer = GroupBookingSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        try:
+            bookings, payments = book_group(
+                request.user,
+                serializer.validated_data['items'],
+                serializer.validated_data['payment_method']
+            )
+        except CapacityUnavailable as exc:
+            return Response({
+                'message': BookingMessages.CAPACITY_UNAVAILABLE,
+                'items': exc.items
+            }, status=status.HTTP_409_CONFLICT)
+
+        return Response({
+            'message': BookingMessages.GROUP_BOOKING_SUCCESS,
+            'order_id': payments[0].order_id,
+            'amount': str(sum(payment.amount for payment in payments)),
+            'payment_status': payments[0].status,
+            'bookings': SpaceBookingSerializer(bookings, many=True).data
+        }, status=status.HTTP_201_CREATED)
@@ -3,9 +3,10 @@ from django.core.validators import MinValueValidator
 from decimal import Decimal
 from spaces.models import Space
 from constants import PriceTypeChoices
+from utils.concurrency import VersionedModelMixin
 
 
-class SpacePrice(models.Model):
+class SpacePrice(VersionedModelMixin, models.Model):
     space = models.ForeignKey(
         Space,
         on_delete=models.CASCADE,
@@ -26,6 +27,8 @@ class SpacePrice(models.Model):
     
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    # Bumped by every update; the ETag of the row (utils.concurrency)
+    version = models.PositiveIntegerField(default=1)
     
     class Meta:
         unique_together = ['space', 'type']
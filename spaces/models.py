@@ -2,9 +2,10 @@ from django.db import models
 from django.core.validators import MinValueValidator
 from working_spaces.models import WorkingSpace
 from constants.models import SpaceStatusChoices, SpaceTypeChoices
+from utils.concurrency import VersionedModelMixin
 
 
-class Space(models.Model):
+class Space(VersionedModelMixin, models.Model):
     working_space = models.ForeignKey(
         WorkingSpace,
         on_delete=models.CASCADE,
@@ -36,6 +37,8 @@ class Space(models.Model):
     
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    # Bumped by every update; the ETag of the row (utils.concurrency)
+    version = models.PositiveIntegerField(default=1)
     
     class Meta:
         indexes = [
@@ -0,0 +1,132 @@
+import math
+from datetime import timedelta
+from django.utils import timezone
+from constants.models import PriceTypeChoices, SpaceStatusChoices
+from space_bookings.occupancy import free_between
+from space_prices.models import SpacePrice
+from .models import Space
+
+EARTH_RADIUS_KM = 6371.0
+KM_PER_DEGREE = 111.0
+
+
+def distance_km(lat1, lng1, lat2, lng2):
+    """Great-circle distance between two points (haversine)."""
+    lat1, lng1, lat2, lng2 = map(math.radians, (lat1, lng1, lat2, lng2))
+    a = (
+        math.sin((lat2 - lat1) / 2) ** 2
+        + math.cos(lat1) * math.cos(lat2) * math.sin((lng2 - lng1) / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(a))
+
+
+def quote(prices, start_time, end_time):
+    """Cheapest ``(price_type, amount)`` for a same-day booking.
+
+    Hourly prices are charged per started hour and the day price once;
+    monthly prices don't apply to a single day.
+    """
+    hours = math.ceil((end_time - start_time) / timedelta(hours=1))
+    options = []
+    if PriceTypeChoices.HOUR in prices:
+        options.append(
+            (prices[PriceTypeChoices.HOUR] * hours, PriceTypeChoices.HOUR)
+        )
+    if PriceTypeChoices.DAY in prices:
+        options.append((prices[PriceTypeChoices.DAY], PriceTypeChoices.DAY))
+    if not options:
+        return None
+    amount, price_type = min(options)
+    return price_type, amount
+
+
+def search_spaces(filters):
+    """Bookable spaces near a point for a time window, nearest first.
+
+    Runs four queries whatever the result size: candidate spaces inside
+    the bounding box that are open for the whole window, their prices,
+    their occupancy vectors for the day and any expired holds on them.
+    """
+    latitude = filters['latitude']
+    longitude = filters['longitude']
+    radius = filters['radius']
+    start_time = filters['start_time']
+    end_time = filters['end_time']
+    seats = filters['seats']
+
+    lat_delta = radius / KM_PER_DEGREE
+    lng_delta = radius / (
+        KM_PER_DEGREE * max(math.cos(math.radians(latitude)), 0.01)
+    )
+
+    candidates = Space.objects.select_related('working_space').only(
+        'id', 'name', 'space_type', 'capacity', 'open_time', 'close_time',
+        'working_space__id', 'working_space__name', 'working_space__city',
+        'working_space__latitude', 'working_space__longitude'
+    ).filter(
+        working_space__deleted_at__isnull=True,
+        working_space__latitude__gte=latitude - lat_delta,
+        working_space__latitude__lte=latitude + lat_delta,
+        working_space__longitude__gte=longitude - lng_delta,
+        working_space__longitude__lte=longitude + lng_delta,
+        status=SpaceStatusChoices.ACTIVATED,
+        is_approved=True,
+        capacity__gte=seats,
+        open_time__lte=timezone.localtime(start_time).time(),
+        close_time__gte=timezone.localtime(end_time).time()
+    )
+    if filters.get('space_type'):
+        candidates = candidates.filter(space_type=filters['space_type'])
+
+    distances = {}
+    for space in candidates:
+        working_space = space.working_space
+        distance = distance_km(
+            latitude, longitude,
+            float(working_space.latitude), float(working_space.longitude)
+        )
+        if distance <= radius:
+            distances[space] = distance
+    if not distances:
+        return []
+
+    prices = {}
+    for space_id, price_type, price in SpacePrice.objects.filter(
+        space_id__in=[space.id for space in distances]
+    ).values_list('space_id', 'type', 'price'):
+        prices.setdefault(space_id, {})[price_type] = price
+
+    quotes = {}
+    max_price = filters.get('max_price')
+    for space in distances:
+        space_quote = quote(prices.get(space.id, {}), start_time, end_time)
+        if space_quote is None:
+            continue
+        if max_price is not None and space_quote[1] > max_price:
+            continue
+        quotes[space] = space_quote
+
+    free = free_between(list(quotes), start_time, end_time, seats)
+
+    results = sorted(
+        (
+            (distances[space], quotes[space][1], space.id, space)
+            for space in quotes
+            if space.id in free
+        ),
+        key=lambda result: result[:3]
+    )
+    return [
+        {
+            'id': space.id,
+            'name': space.name,
+            'space_type': space.space_type,
+            'working_space_id': space.working_space.id,
+            'working_space_name': space.working_space.name,
+            'working_space_city': space.working_space.city,
+            'distance_km': round(distance, 3),
+            'price_type': quotes[space][0],
+            'price': str(quotes[space][1]),
+        }
+        for distance, _, _, space in results[:filters['limit']]
+    ]
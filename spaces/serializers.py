@@ -1,8 +1,18 @@
+from decimal import Decimal
 from rest_framework import serializers
 from .models import Space
 from working_spaces.models import WorkingSpace
 from constants.messages import SpaceMessages
-from utils.validators import validate_required_string
+from constants.models import SpaceTypeChoices
+from utils.concurrency import VersionedUpdateMixin
+from utils.constraints import UniqueErrorsMixin
+from utils.validators import (
+    validate_coordinate_range,
+    validate_required_string,
+    validate_same_day_window,
+)
+
+MAX_SEARCH_RESULTS = 100
 
 
 class SpaceFilterSerializer(serializers.Serializer):
@@ -38,6 +48,42 @@ class SpaceFilterSerializer(serializers.Serializer):
         return data
 
 
+class SpaceSearchSerializer(serializers.Serializer):
+    latitude = serializers.FloatField()
+    longitude = serializers.FloatField()
+    radius = serializers.FloatField(min_value=0.01)
+    start_time = serializers.DateTimeField()
+    end_time = serializers.DateTimeField()
+    space_type = serializers.ChoiceField(
+        choices=SpaceTypeChoices.choices,
+        required=False
+    )
+    seats = serializers.IntegerField(min_value=1, default=1)
+    max_price = serializers.DecimalField(
+        max_digits=10,
+        decimal_places=2,
+        min_value=Decimal('0'),
+        required=False
+    )
+    limit = serializers.IntegerField(
+        min_value=1,
+        max_value=MAX_SEARCH_RESULTS,
+        default=20
+    )
+
+    @validate_coordinate_range(-90, 90)
+    def validate_latitude(self, value):
+        return value
+
+    @validate_coordinate_range(-180, 180)
+    def validate_longitude(self, value):
+        return value
+
+    def validate(self, attrs):
+        validate_same_day_window(attrs['start_time'], attrs['end_time'])
+        return attrs
+
+
 class SpaceListSerializer(serializers.ModelSerializer):
     working_space_name = serializers.CharField(source='working_space.name', read_only=True)
     working_space_city = serializers.CharField(source='working_space.city', read_only=True)
@@ -58,16 +104,32 @@ class SpaceListSerializer(serializers.ModelSerializer):
         ]
 
 
-class SpaceSerializer(SpaceListSerializer):
+class SpaceSerializer(
+    UniqueErrorsMixin,
+    VersionedUpdateMixin,
+    SpaceListSerializer
+):
+    unique_errors = {
+        'unique_space_name_per_working_space': (
+            'name', SpaceMessages.DUPLICATE_NAME_WORKING_SPACE
+        ),
+    }
+
     class Meta(SpaceListSerializer.Meta):
         fields = SpaceListSerializer.Meta.fields + [
             'working_space',
             'description',
             'open_time',
             'close_time',
-            'updated_at'
+            'updated_at',
+            'version'
+        ]
+        read_only_fields = [
+            'id', 'created_at', 'updated_at', 'working_space_name',
+            'working_space_city', 'version'
         ]
-        read_only_fields = ['id', 'created_at', 'updated_at', 'working_space_name', 'working_space_city']
+        # unique_space_name_per_working_space is checked by save()
+        validators = []
 
     @validate_required_string
     def validate_name(self, value):
@@ -95,40 +157,8 @@ class SpaceSerializer(SpaceListSerializer):
 
 
 class SpaceCreateSerializer(SpaceSerializer):
-    def validate(self, attrs):
-        attrs = super().validate(attrs)
-        
-        name = attrs.get('name', '').strip()
-        working_space = attrs.get('working_space')
-        
-        if Space.objects.filter(
-            name=name,
-            working_space=working_space
-        ).exists():
-            raise serializers.ValidationError({
-                'name': SpaceMessages.DUPLICATE_NAME_WORKING_SPACE
-            })
-        
-        return attrs
+    pass
 
 
 class SpaceUpdateSerializer(SpaceSerializer):
-    def validate(self, attrs):
-        attrs = super().validate(attrs)
-        
-        name = attrs.get('name')
-        working_space = attrs.get('working_space')
-        
-        if name and working_space:
-            name = name.strip()
-            existing_space = Space.objects.filter(
-                name=name,
-                working_space=working_space
-            ).exclude(id=self.instance.id)
-            
-            if existing_space.exists():
-                raise serializers.ValidationError({
-                    'name': SpaceMessages.DUPLICATE_NAME_WORKING_SPACE
-                })
-        
-        return attrs
+    pass
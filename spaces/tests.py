@@ -1,3 +1,226 @@
-from django.test import TestCase
+from datetime import time
+from django.contrib.auth import get_user_model
+from django.db import IntegrityError
+from django.test import SimpleTestCase, TestCase
+from rest_framework import status
+from rest_framework.test import APIClient
+from outbox.models import OutboxEvent
+from utils.constraints import unique_violation
+from utils.renderers import ORJSONRenderer
+from working_spaces.models import WorkingSpace
+from .models import Space
+from .serializers import SpaceListSerializer
+from .views import space_list_projection
 
-# Create your tests here.
+
+class SpaceListProjectionTests(TestCase):
+    def setUp(self):
+        working_space = WorkingSpace.objects.create(
+            name='Hub',
+            city='Hanoi',
+            street='1 Main St'
+        )
+        for name, capacity in (('Desk', 1), ('Meeting room', 8)):
+            Space.objects.create(
+                working_space=working_space,
+                name=name,
+                capacity=capacity,
+                location='Floor 1',
+                open_time=time(8),
+                close_time=time(18)
+            )
+        self.queryset = Space.objects.select_related(
+            'working_space'
+        ).order_by('-created_at', '-id')
+        self.renderer = ORJSONRenderer()
+
+    def test_projection_matches_serializer(self):
+        self.assertEqual(
+            self.renderer.render(space_list_projection(self.queryset.all())),
+            self.renderer.render(
+                SpaceListSerializer(self.queryset.all(), many=True).data
+            )
+        )
+
+    def test_narrowed_projection_keeps_only_requested_fields(self):
+        fields = ['id', 'working_space_city', 'is_approved']
+        serialized = SpaceListSerializer(self.queryset.all(), many=True).data
+
+        self.assertEqual(
+            self.renderer.render(
+                space_list_projection.narrow(fields)(self.queryset.all())
+            ),
+            self.renderer.render([
+                {name: item[name] for name in fields} for item in serialized
+            ])
+        )
+
+
+class SpaceVersionTests(TestCase):
+    def setUp(self):
+        self.space = Space.objects.create(
+            working_space=WorkingSpace.objects.create(
+                name='Hub',
+                city='Hanoi',
+                street='1 Main St'
+            ),
+            name='Desk',
+            capacity=1,
+            location='Floor 1',
+            open_time=time(8),
+            close_time=time(18)
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(get_user_model().objects.create_user(
+            username='owner',
+            email='owner@example.com',
+            password='secret'
+        ))
+        self.url = (
+            f'/api/working-spaces/{self.space.working_space_id}'
+            f'/spaces/{self.space.id}/'
+        )
+
+    def _patch(self, version):
+        return self.client.patch(
+            self.url,
+            {'name': 'Booth'},
+            format='json',
+            HTTP_IF_MATCH=f'"{version}"'
+        )
+
+    def test_plain_save_publishes_the_new_version(self):
+        self.space.capacity = 2
+        self.space.save()
+
+        self.assertEqual(self.space.version, 2)
+        event = OutboxEvent.objects.filter(
+            event_type='space.updated'
+        ).latest('id')
+        self.assertEqual(event.payload['version'], 2)
+        self.assertEqual(event.payload['capacity'], 2)
+
+    def test_stale_if_match_after_plain_save_is_refused(self):
+        self.space.capacity = 2
+        self.space.save(update_fields=['capacity'])
+
+        response = self._patch(1)
+        self.assertEqual(
+            response.status_code, status.HTTP_412_PRECONDITION_FAILED
+        )
+
+        response = self._patch(2)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['ETag'], '"3"')
+
+
+class SpaceUniqueErrorTests(TestCase):
+    def setUp(self):
+        self.working_space = WorkingSpace.objects.create(
+            name='Hub',
+            city='Hanoi',
+            street='1 Main St'
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(get_user_model().objects.create_user(
+            username='owner',
+            email='owner@example.com',
+            password='secret'
+        ))
+
+    def _create(self):
+        return self.client.post(
+            f'/api/working-spaces/{self.working_space.id}/spaces/create/',
+            {
+                'name': 'Desk',
+                'capacity': 1,
+                'location': 'Floor 1',
+                'open_time': '08:00',
+                'close_time': '18:00'
+            },
+            format='json'
+        )
+
+    def test_duplicate_name_is_a_field_error(self):
+        self.assertEqual(self._create().status_code, status.HTTP_201_CREATED)
+
+        response = self._create()
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            [error['attr'] for error in response.json()['errors']], ['name']
+        )
+        self.assertEqual(Space.objects.count(), 1)
+
+
+class UniqueViolationTests(SimpleTestCase):
+    def _rule(self, message, model=Space, cause=None):
+        exc = IntegrityError(message)
+        exc.__cause__ = cause
+        return unique_violation(exc, model)
+
+    def test_sqlite_columns(self):
+        self.assertEqual(
+            self._rule(
+                'UNIQUE constraint failed: '
+                'spaces_space.working_space_id, spaces_space.name'
+            ),
+            'unique_space_name_per_working_space'
+        )
+
+    def test_sqlite_expression_index(self):
+        self.assertEqual(
+            self._rule(
+                "UNIQUE constraint failed: "
+                "index 'unique_working_space_name_per_city'",
+                model=WorkingSpace
+            ),
+            'unique_working_space_name_per_city'
+        )
+
+    def test_mysql_key(self):
+        for key in (
+            'spaces_space.unique_space_name_per_working_space',
+            'unique_space_name_per_working_space',
+        ):
+            self.assertEqual(
+                self._rule(
+                    f"(1062, \"Duplicate entry '1-Desk' for key '{key}'\")"
+                ),
+                'unique_space_name_per_working_space'
+            )
+
+    def test_postgres_detail(self):
+        self.assertEqual(
+            self._rule(
+                'duplicate key value violates unique constraint '
+                '"spaces_space_working_space_id_name_key"\n'
+                'DETAIL:  Key (working_space_id, name)=(1, Desk) '
+                'already exists.'
+            ),
+            'unique_space_name_per_working_space'
+        )
+
+    def test_postgres_constraint_name(self):
+        class Diag:
+            constraint_name = 'unique_working_space_name_per_city'
+
+        class Cause(Exception):
+            diag = Diag()
+
+        self.assertEqual(
+            self._rule(
+                'duplicate key value violates unique constraint',
+                model=WorkingSpace,
+                cause=Cause()
+            ),
+            'unique_working_space_name_per_city'
+        )
+
+    def test_other_errors_are_not_matched(self):
+        self.assertIsNone(self._rule(
+            'FOREIGN KEY constraint failed'
+        ))
+        self.assertIsNone(self._rule(
+            "(1062, \"Duplicate entry '1' for key 'spaces_space.other'\")"
+        ))
@@ -1,14 +1,28 @@
+from django.conf import settings
 from django.urls import path
+from utils.async_views import split_read_write_view
 from .views import (
     SpaceCreateView,
     SpaceListView,
     SpaceDetailView,
+    SpaceListAsyncView,
+    SpaceDetailAsyncView,
 )
 
 app_name = 'spaces'
 
+if settings.ASYNC_READ_VIEWS:
+    list_view = SpaceListAsyncView.as_view()
+    detail_view = split_read_write_view(
+        SpaceDetailAsyncView.as_view(),
+        SpaceDetailView.as_view()
+    )
+else:
+    list_view = SpaceListView.as_view()
+    detail_view = SpaceDetailView.as_view()
+
 urlpatterns = [
-    path('', SpaceListView.as_view(), name='space-list'),
+    path('', list_view, name='space-list'),
     path('create/', SpaceCreateView.as_view(), name='space-create'),
-    path('<int:pk>/', SpaceDetailView.as_view(), name='space-detail'),
+    path('<int:pk>/', detail_view, name='space-detail'),
 ]
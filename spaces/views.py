@@ -1,5 +1,10 @@
+import logging
+import time
+from django.conf import settings
 from rest_framework import status, generics, permissions
 from rest_framework.response import Response
+from rest_framework.views import APIView
+from django.db import transaction
 from django.db.models import Q
 from working_spaces.models import WorkingSpace
 from .models import Space
@@ -8,15 +13,89 @@ from .serializers import (
     SpaceCreateSerializer,
     SpaceUpdateSerializer,
     SpaceListSerializer,
-    SpaceFilterSerializer
+    SpaceFilterSerializer,
+    SpaceSearchSerializer
 )
+from .search import search_spaces
 from constants.messages import SpaceMessages
+from utils.async_views import AsyncAPIView
+from utils.concurrency import check_if_match, set_etag
+from utils.projections import Projection
+
+logger = logging.getLogger(__name__)
+
+space_list_projection = Projection(SpaceListSerializer)
+space_projection = Projection(SpaceSerializer)
+
+
+def live_spaces():
+    """Spaces of working spaces that are not soft-deleted.
+
+    A subquery on the working space ids rather than a filter on
+    ``working_space__deleted_at``, which would force a JOIN even when no
+    working space column is selected.
+    """
+    return Space.objects.filter(
+        working_space_id__in=WorkingSpace.objects.values('id')
+    )
+
+
+def filter_spaces(query_params, working_space_id=None):
+    queryset = live_spaces().select_related('working_space').order_by(
+        '-created_at'
+    )
+    if working_space_id:
+        queryset = queryset.filter(working_space_id=working_space_id)
+
+    filter_serializer = SpaceFilterSerializer(data=query_params)
+    filter_serializer.is_valid(raise_exception=True)
+
+    filters = filter_serializer.get_cleaned_data()
+
+    search = filters.get('search')
+    if search:
+        if working_space_id:
+            queryset = queryset.filter(
+                Q(name__icontains=search) |
+                Q(location__icontains=search) |
+                Q(description__icontains=search)
+            )
+        else:
+            queryset = queryset.filter(
+                Q(name__icontains=search) |
+                Q(location__icontains=search) |
+                Q(working_space__name__icontains=search) |
+                Q(working_space__city__icontains=search) |
+                Q(description__icontains=search)
+            )
+
+    status_filter = filters.get('status')
+    if status_filter:
+        queryset = queryset.filter(status=status_filter)
+
+    type_filter = filters.get('space_type')
+    if type_filter:
+        queryset = queryset.filter(space_type=type_filter)
+
+    if not working_space_id:
+        filter_working_space_id = filters.get('working_space_id')
+        if filter_working_space_id:
+            queryset = queryset.filter(
+                working_space_id=filter_working_space_id
+            )
+
+    is_approved = filters.get('is_approved')
+    if is_approved is not None:
+        queryset = queryset.filter(is_approved=is_approved)
+
+    return queryset
 
 
 class SpaceCreateView(generics.CreateAPIView):
     serializer_class = SpaceCreateSerializer
     permission_classes = [permissions.IsAuthenticated]
 
+    @transaction.atomic
     def create(self, request, *args, **kwargs):
         working_space_id = self.kwargs.get('working_space_id')
         
@@ -52,73 +131,25 @@ class SpaceListView(generics.ListAPIView):
     permission_classes = [permissions.IsAuthenticated]
 
     def get_queryset(self):
-        working_space_id = self.kwargs.get('working_space_id')
-        
-        if working_space_id:
-            if not WorkingSpace.objects.filter(id=working_space_id).exists():
-                return Space.objects.none()
-            queryset = Space.objects.filter(working_space_id=working_space_id).order_by('-created_at')
-        else:
-            queryset = Space.objects.select_related('working_space').all().order_by('-created_at')
-        
-        filter_serializer = SpaceFilterSerializer(data=self.request.query_params)
-        filter_serializer.is_valid(raise_exception=True)
-        
-        filters = filter_serializer.get_cleaned_data()
-        
-        search = filters.get('search')
-        if search:
-            if working_space_id:
-                queryset = queryset.filter(
-                    Q(name__icontains=search) |
-                    Q(location__icontains=search) |
-                    Q(description__icontains=search)
-                )
-            else:
-                queryset = queryset.filter(
-                    Q(name__icontains=search) |
-                    Q(location__icontains=search) |
-                    Q(working_space__name__icontains=search) |
-                    Q(working_space__city__icontains=search) |
-                    Q(description__icontains=search)
-                )
-
-        status_filter = filters.get('status')
-        if status_filter:
-            queryset = queryset.filter(status=status_filter)
-
-        type_filter = filters.get('space_type')
-        if type_filter:
-            queryset = queryset.filter(space_type=type_filter)
-
-        if not working_space_id:
-            filter_working_space_id = filters.get('working_space_id')
-            if filter_working_space_id:
-                if WorkingSpace.objects.filter(id=filter_working_space_id).exists():
-                    queryset = queryset.filter(working_space_id=filter_working_space_id)
-                else:
-                    queryset = queryset.none()
-
-        is_approved = filters.get('is_approved')
-        if is_approved is not None:
-            queryset = queryset.filter(is_approved=is_approved)
-
-        return queryset
+        return filter_spaces(
+            self.request.query_params,
+            self.kwargs.get('working_space_id')
+        )
 
     def list(self, request, *args, **kwargs):
-        queryset = self.get_queryset()
-        page = self.paginate_queryset(queryset)
+        projection = space_list_projection.for_request(request.query_params)
+        rows = projection.values(self.get_queryset())
+        page = self.paginate_queryset(rows)
 
         if page is not None:
-            serializer = self.get_serializer(page, many=True)
             return self.get_paginated_response({
-                'spaces': serializer.data
+                'spaces': projection.project(page)
             })
 
-        serializer = self.get_serializer(queryset, many=True)
+        spaces = projection.project(rows)
         return Response({
-            'spaces': serializer.data,
-            'count': queryset.count()
+            'spaces': spaces,
+            'count': len(spaces)
         }, status=status.HTTP_200_OK)
 
 
@@ -132,7 +163,8 @@ class SpaceDetailView(generics.RetrieveUpdateDestroyAPIView):
         if working_space_id:
             space = Space.objects.select_related('working_space').get(
                 id=space_id, 
-                working_space_id=working_space_id
+                working_space_id=working_space_id,
+                working_space__deleted_at__isnull=True
             )
             return space
 
@@ -143,16 +175,23 @@ class SpaceDetailView(generics.RetrieveUpdateDestroyAPIView):
         return SpaceSerializer
 
     def retrieve(self, request, *args, **kwargs):
-        instance = self.get_object()
-        serializer = self.get_serializer(instance)
-        return Response({
-            'space': serializer.data
-        }, status=status.HTTP_200_OK)
+        projection = space_projection.for_request(request.query_params)
+        spaces = projection(live_spaces().filter(
+            id=kwargs['pk'],
+            working_space_id=kwargs.get('working_space_id')
+        ))
+        if not spaces:
+            raise Space.DoesNotExist
+        return set_etag(Response({
+            'space': spaces[0]
+        }, status=status.HTTP_200_OK), spaces[0])
 
+    @transaction.atomic
     def update(self, request, *args, **kwargs):
         partial = kwargs.pop('partial', False)
         instance = self.get_object()
-        
+        check_if_match(request, instance.version)
+
         url_working_space_id = self.kwargs.get('working_space_id')
         
         if url_working_space_id:
@@ -181,11 +220,12 @@ class SpaceDetailView(generics.RetrieveUpdateDestroyAPIView):
 
         serializer.save()
 
-        return Response({
+        return set_etag(Response({
             'message': SpaceMessages.UPDATE_SUCCESS,
             'space': serializer.data
-        }, status=status.HTTP_200_OK)
+        }, status=status.HTTP_200_OK), serializer.data)
 
+    @transaction.atomic
     def destroy(self, request, *args, **kwargs):
         instance = self.get_object()
         
@@ -208,3 +248,61 @@ class SpaceDetailView(generics.RetrieveUpdateDestroyAPIView):
             'message': SpaceMessages.DELETE_SUCCESS
         }, status=status.HTTP_204_NO_CONTENT)
 
+
+class SpaceListAsyncView(AsyncAPIView):
+    async def get(self, request, *args, **kwargs):
+        projection = space_list_projection.for_request(request.GET)
+        spaces = await projection.aproject(
+            filter_spaces(request.GET, kwargs.get('working_space_id'))
+        )
+
+        return self.render({
+            'spaces': spaces,
+            'count': len(spaces)
+        })
+
+
+class SpaceDetailAsyncView(AsyncAPIView):
+    async def get(self, request, *args, **kwargs):
+        projection = space_projection.for_request(request.GET)
+        spaces = await projection.aproject(live_spaces().filter(
+            id=kwargs['pk'],
+            working_space_id=kwargs.get('working_space_id')
+        ))
+        if not spaces:
+            raise Space.DoesNotExist
+
+        return set_etag(self.render({
+            'space': spaces[0]
+        }), spaces[0])
+
+
+class SpaceSearchView(APIView):
+    """Free spaces near a point for a time window, within a price cap.
+
+    Ranked by distance, then price. Searches slower than
+    SPACE_SEARCH_BUDGET_MS are logged.
+    """
+
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request):
+        started = time.perf_counter()
+        filter_serializer = SpaceSearchSerializer(data=request.query_params)
+        filter_serializer.is_valid(raise_exception=True)
+
+        spaces = search_spaces(filter_serializer.validated_data)
+
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        if elapsed_ms > settings.SPACE_SEARCH_BUDGET_MS:
+            logger.warning(
+                "Space search took %.0f ms (budget %s ms): %s",
+                elapsed_ms,
+                settings.SPACE_SEARCH_BUDGET_MS,
+                request.query_params.urlencode()
+            )
+
+        return Response({
+            'spaces': spaces,
+            'count': len(spaces)
+        }, status=status.HTTP_200_OK)
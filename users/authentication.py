@@ -1,10 +1,17 @@
+import logging
 from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.settings import api_settings
 from django.contrib.auth import get_user_model
+from django.utils.translation import gettext_lazy as _
 from rest_framework.exceptions import AuthenticationFailed
+from utils.metrics import record_auth_outcome
 from .token_models import UserToken
 
 User = get_user_model()
 
+logger = logging.getLogger(__name__)
+
 
 class DatabaseTokenAuthentication(JWTAuthentication):
     def authenticate(self, request):
@@ -16,15 +23,82 @@ class DatabaseTokenAuthentication(JWTAuthentication):
         if raw_token is None:
             return None
 
-        validated_token = self.get_validated_token(raw_token)
+        try:
+            validated_token = self.get_validated_token(raw_token)
 
-        user = self.get_user(validated_token)
+            user = self.get_user(validated_token)
 
-        if not self.is_token_valid_in_database(user, raw_token):
-            raise AuthenticationFailed()
+            if not self.is_token_valid_in_database(user, raw_token):
+                raise AuthenticationFailed()
+        except AuthenticationFailed:
+            record_auth_outcome('token', 'failed')
+            raise
 
+        record_auth_outcome('token', 'success')
         return (user, validated_token)
 
+    async def aauthenticate(self, request):
+        header = self.get_header(request)
+        if header is None:
+            return None
+
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+
+        try:
+            validated_token = self.get_validated_token(raw_token)
+
+            user = await self.aget_user(validated_token)
+
+            if not await self.ais_token_valid_in_database(user, raw_token):
+                raise AuthenticationFailed()
+        except AuthenticationFailed:
+            record_auth_outcome('token', 'failed')
+            raise
+
+        record_auth_outcome('token', 'success')
+        return (user, validated_token)
+
+    async def aget_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(
+                _("Token contained no recognizable user identification")
+            )
+
+        try:
+            user = await self.user_model.objects.aget(
+                **{api_settings.USER_ID_FIELD: user_id}
+            )
+        except self.user_model.DoesNotExist:
+            raise AuthenticationFailed(
+                _("User not found"),
+                code="user_not_found"
+            )
+
+        if not user.is_active:
+            raise AuthenticationFailed(
+                _("User is inactive"),
+                code="user_inactive"
+            )
+
+        return user
+
+    async def ais_token_valid_in_database(self, user, raw_token):
+        if isinstance(raw_token, bytes):
+            try:
+                raw_token = raw_token.decode('utf-8')
+            except UnicodeDecodeError as e:
+                logger.warning("Token decode error: %s", e)
+                return False
+
+        return await UserToken.ais_token_valid_for_user(
+            str(raw_token),
+            user.id
+        )
+
     def is_token_valid_in_database(self, user, raw_token):
         try:
             if isinstance(raw_token, bytes):
@@ -37,12 +111,12 @@ class DatabaseTokenAuthentication(JWTAuthentication):
             if validated_user and validated_user.id == user.id:
                 return True
             else:
-                print(f"Token not found or inactive for user {user.id}")
+                logger.info("Token not found or inactive for user %s", user.id)
                 return False
                 
         except UnicodeDecodeError as e:
-            print(f"Token decode error: {e}")
+            logger.warning("Token decode error: %s", e)
             return False
         except Exception as e:
-            print(f"Unexpected error in token validation: {e}", exc_info=True)
+            logger.exception("Unexpected error in token validation: %s", e)
             return False
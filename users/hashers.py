@@ -0,0 +1,41 @@
+import threading
+from django.conf import settings
+from django.contrib.auth import authenticate
+from django.contrib.auth.hashers import PBKDF2PasswordHasher
+
+_hashing_slots = None
+_hashing_slots_lock = threading.Lock()
+
+
+class TunablePBKDF2PasswordHasher(PBKDF2PasswordHasher):
+    """PBKDF2 hasher whose work factor comes from settings.
+
+    It keeps the stock ``pbkdf2_sha256`` algorithm name. Existing hashes
+    stay valid, and Django rehashes them on the next successful login
+    when the iteration count changes.
+    """
+
+    @property
+    def iterations(self):
+        return settings.PASSWORD_HASHER_ITERATIONS
+
+
+def get_hashing_slots():
+    global _hashing_slots
+    with _hashing_slots_lock:
+        if _hashing_slots is None:
+            _hashing_slots = threading.BoundedSemaphore(
+                settings.PASSWORD_HASHING_WORKERS
+            )
+    return _hashing_slots
+
+
+def bounded_authenticate(**credentials):
+    """Run ``authenticate`` in the calling thread, a few at a time.
+
+    Logins beyond ``PASSWORD_HASHING_WORKERS`` wait for a free slot, so
+    a burst cannot starve the process of CPU. Running in the request
+    thread keeps the request's own database connection.
+    """
+    with get_hashing_slots():
+        return authenticate(**credentials)
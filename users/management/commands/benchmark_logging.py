@@ -0,0 +1,68 @@
+import logging
+import os
+import time
+from django.core.management.base import BaseCommand
+from utils.log import JsonFormatter, QueueLogHandler, RequestIdFilter
+
+
+class Command(BaseCommand):
+    help = (
+        'Compare the per-record cost seen by the request thread for '
+        'synchronous and queued JSON logging.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--records',
+            type=int,
+            default=20000,
+            help='Number of log records per measurement.'
+        )
+        parser.add_argument(
+            '--with-traceback',
+            action='store_true',
+            help='Attach exception info to every record.'
+        )
+
+    def handle(self, *args, **options):
+        records = options['records']
+        exc_info = None
+        if options['with_traceback']:
+            try:
+                raise ValueError('benchmark')
+            except ValueError as exc:
+                exc_info = exc
+
+        with open(os.devnull, 'w') as devnull:
+            sync_handler = logging.StreamHandler(devnull)
+            queue_handler = QueueLogHandler(stream=devnull, maxsize=records)
+
+            for label, handler in (
+                ('sync', sync_handler),
+                ('queued', queue_handler),
+            ):
+                handler.setFormatter(JsonFormatter())
+                handler.addFilter(RequestIdFilter())
+                logger = logging.getLogger(f'benchmark.logging.{label}')
+                logger.propagate = False
+                logger.handlers = [handler]
+                logger.setLevel(logging.INFO)
+
+                started = time.perf_counter()
+                for index in range(records):
+                    logger.warning(
+                        'Authentication failed: %s',
+                        index,
+                        exc_info=exc_info,
+                        extra={'path': '/api/working-spaces/'}
+                    )
+                elapsed = time.perf_counter() - started
+                handler.close()
+                drained = time.perf_counter() - started
+
+                self.stdout.write(
+                    f'{label}: {elapsed / records * 1e6:.1f} us per record '
+                    f'in the caller, {drained:.2f}s until written'
+                )
+
+            self.stdout.write(f'Dropped records: {queue_handler.dropped}')
@@ -0,0 +1,41 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from django.conf import settings
+from django.contrib.auth.hashers import check_password, make_password
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = 'Measure password checks (logins) per second with current settings.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--rounds',
+            type=int,
+            default=20,
+            help='Number of password checks per measurement.'
+        )
+
+    def handle(self, *args, **options):
+        rounds = options['rounds']
+        workers = settings.PASSWORD_HASHING_WORKERS
+        encoded = make_password('benchmark-password')
+
+        started = time.perf_counter()
+        for _ in range(rounds):
+            check_password('benchmark-password', encoded)
+        per_core = rounds / (time.perf_counter() - started)
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            list(executor.map(
+                lambda _: check_password('benchmark-password', encoded),
+                range(rounds * workers)
+            ))
+        pooled = rounds * workers / (time.perf_counter() - started)
+
+        self.stdout.write(f'Iterations: {settings.PASSWORD_HASHER_ITERATIONS}')
+        self.stdout.write(f'Logins per second per core: {per_core:.1f}')
+        self.stdout.write(
+            f'Logins per second with {workers} workers: {pooled:.1f}'
+        )
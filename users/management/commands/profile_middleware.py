@@ -0,0 +1,95 @@
+import time
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.http import HttpResponse
+from django.test import RequestFactory
+from django.utils.module_loading import import_string
+
+ROUTE_MIDDLEWARE = 'utils.middleware.RouteMiddleware'
+
+
+def _view(request):
+    return HttpResponse(b'{}', content_type='application/json')
+
+
+class Command(BaseCommand):
+    help = (
+        'Time each middleware on its own for one request path and compare '
+        'the full chain with the chain API routes actually run.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--path', default='/api/working-spaces/')
+        parser.add_argument('--token', help='Bearer access token.')
+        parser.add_argument('--requests', type=int, default=5000)
+
+    def handle(self, *args, **options):
+        headers = {}
+        if options['token']:
+            headers['Authorization'] = f"Bearer {options['token']}"
+        factory = RequestFactory(headers=headers)
+
+        middleware_paths = []
+        for middleware_path in settings.MIDDLEWARE:
+            if middleware_path == ROUTE_MIDDLEWARE:
+                middleware_paths.extend(settings.BROWSER_MIDDLEWARE)
+            else:
+                middleware_paths.append(middleware_path)
+
+        # Middleware can depend on earlier ones (auth needs the session),
+        # so time growing prefixes of the chain and attribute the difference
+        timings = {}
+        previous = self._time(self._build([]), factory, options)
+        for index, middleware_path in enumerate(middleware_paths, 1):
+            elapsed = self._time(
+                self._build(middleware_paths[:index]), factory, options
+            )
+            timings[middleware_path] = max(elapsed - previous, 0)
+            previous = elapsed
+
+        self.stdout.write(f'Per-request cost for {options["path"]} (us):')
+        for middleware_path, seconds in timings.items():
+            marker = ''
+            if middleware_path in settings.BROWSER_MIDDLEWARE:
+                marker = '  (skipped on API routes)'
+            self.stdout.write(
+                f'  {seconds * 1e6:7.1f}  {middleware_path}{marker}'
+            )
+
+        full = sum(timings.values())
+        skipped = sum(
+            timings[middleware_path]
+            for middleware_path in settings.BROWSER_MIDDLEWARE
+        )
+        self.stdout.write(
+            f'Full chain {full * 1e6:.1f} us, API chain '
+            f'{(full - skipped) * 1e6:.1f} us'
+        )
+
+    def _build(self, middleware_paths):
+        """Nest the middleware around a trivial view like Django does."""
+        view_middleware = []
+
+        def view(request):
+            for process_view in view_middleware:
+                response = process_view(request, _view, (), {})
+                if response is not None:
+                    return response
+            return _view(request)
+
+        handler = view
+        for middleware_path in reversed(middleware_paths):
+            middleware = import_string(middleware_path)(handler)
+            if hasattr(middleware, 'process_view'):
+                view_middleware.insert(0, middleware.process_view)
+            handler = middleware
+        return handler
+
+    def _time(self, handler, factory, options):
+        requests = [
+            factory.get(options['path']) for _ in range(options['requests'])
+        ]
+        started = time.perf_counter()
+        for request in requests:
+            handler(request)
+        return (time.perf_counter() - started) / len(requests)
@@ -0,0 +1,155 @@
+import json
+import statistics
+import subprocess
+import sys
+import time
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# Runs in a fresh interpreter: times each AppConfig's import_models() and
+# ready(), loading the entry point, and importing the URLconf (which pulls
+# in every view module before the first request can be served).
+CHILD_SCRIPT = '''
+import json, sys, time
+started = time.perf_counter()
+from django.apps import config
+
+apps = {}
+create = config.AppConfig.create.__func__
+
+
+def timed(label, method):
+    def wrapper():
+        begin = time.perf_counter()
+        method()
+        apps[label] = apps.get(label, 0) + time.perf_counter() - begin
+    return wrapper
+
+
+def timed_create(cls, entry):
+    app_config = create(cls, entry)
+    app_config.import_models = timed(
+        app_config.label, app_config.import_models
+    )
+    app_config.ready = timed(app_config.label, app_config.ready)
+    return app_config
+
+
+config.AppConfig.create = classmethod(timed_create)
+__import__(sys.argv[1])
+loaded = time.perf_counter()
+
+from django.urls import get_resolver
+get_resolver().url_patterns
+print(json.dumps({
+    'apps': apps,
+    'entrypoint': loaded - started,
+    'urls': time.perf_counter() - loaded,
+}))
+'''
+
+
+def _parse_importtime(output):
+    modules = {}
+    for line in output.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        if not self_us.strip().isdigit():
+            continue
+        modules[name.strip()] = (int(self_us), int(cumulative_us))
+    return modules
+
+
+class Command(BaseCommand):
+    help = (
+        'Report import time per module and per app, and fail when loading '
+        'the WSGI/ASGI application exceeds the startup budget.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--asgi',
+            action='store_true',
+            help='Profile asgi.py instead of wsgi.py.'
+        )
+        parser.add_argument('--runs', type=int, default=3)
+        parser.add_argument('--top', type=int, default=15)
+        parser.add_argument(
+            '--budget',
+            type=float,
+            default=settings.STARTUP_TIME_BUDGET_MS,
+            help='Maximum median startup time in milliseconds.'
+        )
+
+    def handle(self, *args, **options):
+        entrypoint = settings.WSGI_APPLICATION.rsplit('.', 1)[0]
+        if options['asgi']:
+            entrypoint = entrypoint.rsplit('.', 1)[0] + '.asgi'
+
+        runs = []
+        for _ in range(options['runs']):
+            started = time.perf_counter()
+            result = subprocess.run(
+                [sys.executable, '-X', 'importtime', '-c', CHILD_SCRIPT,
+                 entrypoint],
+                capture_output=True,
+                text=True
+            )
+            wall = time.perf_counter() - started
+            if result.returncode:
+                raise CommandError(result.stderr.strip().splitlines()[-1])
+
+            report = json.loads(result.stdout.strip().splitlines()[-1])
+            report['wall'] = wall
+            report['modules'] = _parse_importtime(result.stderr)
+            runs.append(report)
+
+        self._write_report(runs[-1], options['top'])
+
+        startup_ms = statistics.median(
+            (run['entrypoint'] + run['urls']) * 1000 for run in runs
+        )
+        wall_ms = statistics.median(run['wall'] * 1000 for run in runs)
+        self.stdout.write(
+            f'{entrypoint}: {startup_ms:.0f} ms to first request '
+            f'({wall_ms:.0f} ms including interpreter start), '
+            f'budget {options["budget"]:.0f} ms'
+        )
+        if startup_ms > options['budget']:
+            raise CommandError(
+                f'Startup time {startup_ms:.0f} ms exceeds the budget of '
+                f'{options["budget"]:.0f} ms.'
+            )
+
+    def _write_report(self, run, top):
+        packages = {}
+        for name, (self_us, _) in run['modules'].items():
+            package = name.split('.', 1)[0]
+            packages[package] = packages.get(package, 0) + self_us
+
+        self.stdout.write('Slowest imports (cumulative ms):')
+        modules = sorted(
+            run['modules'].items(),
+            key=lambda item: item[1][1],
+            reverse=True
+        )
+        for name, (_, cumulative_us) in modules[:top]:
+            self.stdout.write(f'  {cumulative_us / 1000:8.1f}  {name}')
+
+        self.stdout.write('Import time by package (self ms):')
+        for package, self_us in sorted(
+            packages.items(), key=lambda item: item[1], reverse=True
+        )[:top]:
+            self.stdout.write(f'  {self_us / 1000:8.1f}  {package}')
+
+        self.stdout.write('App loading, import_models + ready (ms):')
+        for label, seconds in sorted(
+            run['apps'].items(), key=lambda item: item[1], reverse=True
+        ):
+            self.stdout.write(f'  {seconds * 1000:8.1f}  {label}')
+
+        self.stdout.write(
+            f'Entry point {run["entrypoint"] * 1000:.0f} ms, '
+            f'URLconf and views {run["urls"] * 1000:.0f} ms'
+        )
@@ -1,5 +1,9 @@
+import hashlib
+import uuid
+from django.conf import settings
 from django.db import models
 from django.contrib.auth.models import AbstractUser
+from django.utils import timezone
 from constants import UserStatusChoices
 
 
@@ -17,7 +21,12 @@ class User(AbstractUser):
     # Token fields for authentication
     auth_token = models.CharField(max_length=255, blank=True, null=True)
     refresh_token = models.CharField(max_length=255, blank=True, null=True)
-    confirmation_token = models.CharField(max_length=255, blank=True, null=True)
+    confirmation_token = models.CharField(
+        max_length=64,
+        blank=True,
+        null=True,
+        db_index=True
+    )
     confirmation_sent_at = models.DateTimeField(blank=True, null=True)
     confirmed_at = models.DateTimeField(blank=True, null=True)
     reset_password_token = models.CharField(max_length=255, blank=True, null=True)
@@ -28,3 +37,52 @@ class User(AbstractUser):
     
     def __str__(self):
         return f"{self.first_name} {self.last_name} ({self.email})"
+
+    @staticmethod
+    def hash_confirmation_token(token):
+        return hashlib.sha256(token.encode('utf-8')).hexdigest()
+
+    @classmethod
+    def generate_confirmation_token(cls):
+        token = str(uuid.uuid4())
+        return token, cls.hash_confirmation_token(token)
+
+    @staticmethod
+    def confirmation_expiry_cutoff():
+        return timezone.now() - settings.EMAIL_CONFIRMATION_TOKEN_LIFETIME
+
+    def issue_confirmation_token(self):
+        token, token_hash = self.generate_confirmation_token()
+        self.confirmation_token = token_hash
+        self.confirmation_sent_at = timezone.now()
+        return token
+
+    def is_confirmation_expired(self):
+        return (
+            self.confirmation_sent_at is None
+            or self.confirmation_sent_at < self.confirmation_expiry_cutoff()
+        )
+
+    def confirm_email(self):
+        """Confirm the account with one conditional UPDATE.
+
+        The row is only written while it is still unconfirmed and its
+        token unexpired, so of two concurrent confirmations one wins.
+        The hash is kept after confirmation so a repeated link can be
+        told apart from an unknown one. Returns whether this call
+        confirmed the account.
+        """
+        now = timezone.now()
+        confirmed = type(self).objects.filter(
+            pk=self.pk,
+            confirmation_token=self.confirmation_token,
+            confirmed_at__isnull=True,
+            confirmation_sent_at__gte=self.confirmation_expiry_cutoff()
+        ).update(
+            status=UserStatusChoices.ACTIVATED,
+            confirmed_at=now
+        ) == 1
+        if confirmed:
+            self.status = UserStatusChoices.ACTIVATED
+            self.confirmed_at = now
+        return confirmed
@@ -1,15 +1,28 @@
 from rest_framework import serializers
-from django.contrib.auth import get_user_model, authenticate
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.tokens import RefreshToken
+from django.contrib.auth import get_user_model
+from django.contrib.auth.validators import UnicodeUsernameValidator
 from django.contrib.auth.password_validation import validate_password
-import uuid
 from django.utils import timezone
 from constants.messages import ValidationMessages, AuthMessages
+from utils.constraints import UniqueErrorsMixin
+from utils.metrics import record_auth_outcome
+from .hashers import bounded_authenticate
 from django.utils.translation import gettext_lazy as _
 
 User = get_user_model()
 
 
-class UserRegistrationSerializer(serializers.ModelSerializer):
+class UserRegistrationSerializer(
+    UniqueErrorsMixin,
+    serializers.ModelSerializer
+):
+    unique_errors = {
+        'email': ('email', ValidationMessages.EMAIL_ALREADY_EXISTS),
+        'username': ('username', ValidationMessages.USERNAME_ALREADY_EXISTS),
+    }
+
     password = serializers.CharField(
         write_only=True,
         min_length=8,
@@ -34,27 +47,17 @@ class UserRegistrationSerializer(serializers.ModelSerializer):
             'password',
             'password_confirm'
         ]
+        # Uniqueness of email and username is checked by save()
         extra_kwargs = {
-            'email': {'required': True},
+            'email': {'required': True, 'validators': []},
             'first_name': {'required': True},
             'last_name': {'required': True},
-            'username': {'required': True},
+            'username': {
+                'required': True,
+                'validators': [UnicodeUsernameValidator()]
+            },
         }
 
-    def validate_email(self, value):
-        if User.objects.filter(email=value).exists():
-            raise serializers.ValidationError(
-                ValidationMessages.EMAIL_ALREADY_EXISTS
-            )
-        return value
-
-    def validate_username(self, value):
-        if User.objects.filter(username=value).exists():
-            raise serializers.ValidationError(
-                ValidationMessages.USERNAME_ALREADY_EXISTS
-            )
-        return value
-
     def validate_password(self, value):
         try:
             validate_password(value)
@@ -76,7 +79,9 @@ class UserRegistrationSerializer(serializers.ModelSerializer):
     def create(self, validated_data):
         validated_data.pop('password_confirm', None)
 
-        confirmation_token = str(uuid.uuid4())
+        self.confirmation_token, token_hash = (
+            User.generate_confirmation_token()
+        )
 
         user = User.objects.create_user(
             email=validated_data['email'],
@@ -84,7 +89,7 @@ class UserRegistrationSerializer(serializers.ModelSerializer):
             first_name=validated_data['first_name'],
             last_name=validated_data['last_name'],
             password=validated_data['password'],
-            confirmation_token=confirmation_token,
+            confirmation_token=token_hash,
             confirmation_sent_at=timezone.now()
         )
 
@@ -110,17 +115,38 @@ class UserSerializer(serializers.ModelSerializer):
 class EmailConfirmationSerializer(serializers.Serializer):
     token = serializers.CharField(required=True)
 
-    def validate_token(self, value):
-        try:
-            user = User.objects.get(confirmation_token=value)
-            if user.confirmed_at:
-                raise serializers.ValidationError(
-                    AuthMessages.ACCOUNT_ALREADY_CONFIRMED
-                )
-        except User.DoesNotExist:
-            raise serializers.ValidationError(ValidationMessages.INVALID_TOKEN)
+    def validate(self, attrs):
+        user = User.objects.filter(
+            confirmation_token=User.hash_confirmation_token(attrs['token'])
+        ).first()
 
-        return value
+        if user is None:
+            raise serializers.ValidationError({
+                'token': ValidationMessages.INVALID_TOKEN
+            })
+
+        if user.confirmed_at:
+            raise serializers.ValidationError({
+                'token': AuthMessages.ACCOUNT_ALREADY_CONFIRMED
+            })
+
+        if user.is_confirmation_expired():
+            raise serializers.ValidationError({
+                'token': ValidationMessages.EXPIRED_TOKEN
+            })
+
+        attrs['user'] = user
+
+        return attrs
+
+    def create(self, validated_data):
+        user = validated_data['user']
+        # Another request may have confirmed it since validate() read it
+        if not user.confirm_email():
+            raise serializers.ValidationError({
+                'token': AuthMessages.ACCOUNT_ALREADY_CONFIRMED
+            })
+        return user
 
 
 class ResendConfirmationSerializer(serializers.Serializer):
@@ -149,17 +175,36 @@ class LoginSerializer(serializers.Serializer):
         email = attrs.get('email')
         password = attrs.get('password')
 
-        user = authenticate(username=email, password=password)
+        user = bounded_authenticate(username=email, password=password)
         if not user:
+            record_auth_outcome('login', 'invalid_credentials')
             raise serializers.ValidationError({
                 'password': AuthMessages.INVALID_CREDENTIALS
             })
 
         if not user.confirmed_at:
+            record_auth_outcome('login', 'not_confirmed')
             raise serializers.ValidationError({
                 'email': AuthMessages.ACCOUNT_NOT_CONFIRMED
             })
 
+        record_auth_outcome('login', 'success')
         attrs['user'] = user
 
         return attrs
+
+
+class TokenRefreshSerializer(serializers.Serializer):
+    refresh_token = serializers.CharField(required=True)
+
+    def validate(self, attrs):
+        try:
+            refresh = RefreshToken(attrs['refresh_token'])
+        except TokenError:
+            record_auth_outcome('refresh', 'invalid_token')
+            raise serializers.ValidationError({
+                'refresh_token': ValidationMessages.INVALID_TOKEN
+            })
+
+        attrs['refresh'] = refresh
+        return attrs
@@ -1,3 +1,276 @@
-from django.test import TestCase
+import threading
+from datetime import timedelta
+from unittest import mock
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import (
+    TestCase,
+    TransactionTestCase,
+    override_settings,
+    skipUnlessDBFeature,
+)
+from django.utils import timezone
+from rest_framework import serializers, status
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+from constants import UserStatusChoices
+from constants.messages import AuthMessages, ValidationMessages
+from . import hashers
+from .serializers import EmailConfirmationSerializer
+from .token_models import UserToken
 
-# Create your tests here.
+User = get_user_model()
+
+
+def create_user(**fields):
+    return User.objects.create_user(
+        username='member',
+        email='member@example.com',
+        password='secret-password',
+        first_name='Mem',
+        last_name='Ber',
+        **fields
+    )
+
+
+class EmailConfirmationTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = create_user()
+        self.token = self.user.issue_confirmation_token()
+        self.user.save()
+
+    def _confirm(self):
+        return self.client.post(
+            '/api/users/confirm-email/',
+            {'token': self.token},
+            format='json'
+        )
+
+    def _error(self, response):
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        [error] = response.json()['errors']
+        self.assertEqual(error['attr'], 'token')
+        return error['detail']
+
+    def test_confirm_activates_and_logs_in(self):
+        response = self._confirm()
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.status, UserStatusChoices.ACTIVATED)
+        self.assertIsNotNone(self.user.confirmed_at)
+        self.assertEqual(UserToken.objects.filter(user=self.user).count(), 1)
+
+    def test_confirming_twice_is_rejected(self):
+        self.assertEqual(self._confirm().status_code, status.HTTP_200_OK)
+        confirmed_at = User.objects.get(pk=self.user.pk).confirmed_at
+
+        self.assertEqual(
+            self._error(self._confirm()),
+            AuthMessages.ACCOUNT_ALREADY_CONFIRMED
+        )
+        self.assertEqual(
+            User.objects.get(pk=self.user.pk).confirmed_at, confirmed_at
+        )
+        self.assertEqual(UserToken.objects.filter(user=self.user).count(), 1)
+
+    def test_concurrent_confirmation_confirms_once(self):
+        # Both requests validate before either writes
+        first, second = (
+            EmailConfirmationSerializer(data={'token': self.token})
+            for _ in range(2)
+        )
+        self.assertTrue(first.is_valid())
+        self.assertTrue(second.is_valid())
+
+        self.assertEqual(first.save().status, UserStatusChoices.ACTIVATED)
+        with self.assertRaises(serializers.ValidationError) as raised:
+            second.save()
+        self.assertEqual(
+            raised.exception.detail['token'],
+            AuthMessages.ACCOUNT_ALREADY_CONFIRMED
+        )
+
+    def test_validation_writes_nothing(self):
+        serializer = EmailConfirmationSerializer(data={'token': self.token})
+
+        self.assertTrue(serializer.is_valid())
+        self.assertIsNone(User.objects.get(pk=self.user.pk).confirmed_at)
+
+    def test_expired_token_is_rejected(self):
+        User.objects.filter(pk=self.user.pk).update(
+            confirmation_sent_at=timezone.now() - timedelta(days=3)
+        )
+
+        self.assertEqual(
+            self._error(self._confirm()), ValidationMessages.EXPIRED_TOKEN
+        )
+        self.assertIsNone(User.objects.get(pk=self.user.pk).confirmed_at)
+
+    def test_unknown_token_is_rejected(self):
+        self.token = 'unknown'
+
+        self.assertEqual(
+            self._error(self._confirm()), ValidationMessages.INVALID_TOKEN
+        )
+
+
+class BoundedAuthenticateTests(TestCase):
+    def setUp(self):
+        hashers._hashing_slots = None
+        self.addCleanup(setattr, hashers, '_hashing_slots', None)
+
+    def test_returns_the_authenticated_user(self):
+        user = create_user()
+
+        self.assertEqual(
+            hashers.bounded_authenticate(
+                username='member@example.com', password='secret-password'
+            ),
+            user
+        )
+        self.assertIsNone(hashers.bounded_authenticate(
+            username='member@example.com', password='wrong-password'
+        ))
+
+    @override_settings(PASSWORD_HASHING_WORKERS=1)
+    def test_waits_for_a_free_slot(self):
+        started = threading.Event()
+        finished = threading.Event()
+
+        def login():
+            started.set()
+            hashers.bounded_authenticate(username='a', password='b')
+            finished.set()
+
+        with mock.patch.object(hashers, 'authenticate') as authenticate:
+            slots = hashers.get_hashing_slots()
+            slots.acquire()
+            worker = threading.Thread(target=login)
+            worker.start()
+            started.wait(1)
+
+            self.assertFalse(finished.wait(0.2))
+            authenticate.assert_not_called()
+
+            slots.release()
+            self.assertTrue(finished.wait(1))
+            worker.join()
+
+        authenticate.assert_called_once_with(username='a', password='b')
+
+
+class TokenRefreshTestMixin:
+    def setUp(self):
+        cache.clear()
+        self.user = create_user(confirmed_at=timezone.now())
+        refresh = RefreshToken.for_user(self.user)
+        self.refresh_token = str(refresh)
+        UserToken.create_tokens_for_user(
+            user=self.user,
+            access_token=str(refresh.access_token),
+            refresh_token=self.refresh_token
+        )
+
+    def _refresh(self, refresh_token):
+        return APIClient().post(
+            '/api/users/token/refresh/',
+            {'refresh_token': refresh_token},
+            format='json'
+        )
+
+
+class TokenRefreshTests(TokenRefreshTestMixin, TestCase):
+    def test_refresh_rotates_the_pair_in_place(self):
+        response = self._refresh(self.refresh_token)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        tokens = response.json()
+        self.assertNotEqual(tokens['refresh_token'], self.refresh_token)
+        row = UserToken.objects.get()
+        self.assertEqual(row.refresh_token, tokens['refresh_token'])
+        self.assertEqual(row.access_token, tokens['access_token'])
+
+        profile = APIClient()
+        profile.credentials(
+            HTTP_AUTHORIZATION=f"Bearer {tokens['access_token']}"
+        )
+        self.assertEqual(
+            profile.get('/api/users/profile/').status_code,
+            status.HTTP_200_OK
+        )
+
+    def test_replayed_refresh_token_is_rejected(self):
+        rotated = self._refresh(self.refresh_token).json()
+
+        response = self._refresh(self.refresh_token)
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual(
+            response.json()['error'], AuthMessages.REFRESH_TOKEN_REVOKED
+        )
+        self.assertEqual(
+            UserToken.objects.get().refresh_token, rotated['refresh_token']
+        )
+
+    def test_logged_out_refresh_token_is_rejected(self):
+        UserToken.objects.update(is_active=False)
+
+        self.assertEqual(
+            self._refresh(self.refresh_token).status_code,
+            status.HTTP_401_UNAUTHORIZED
+        )
+
+    def test_only_one_of_two_rotations_wins(self):
+        # Both requests decoded the token; the UPDATEs decide
+        rotations = [
+            UserToken.rotate_tokens(
+                user_id=self.user.id,
+                refresh_token=self.refresh_token,
+                access_token=f'access-{index}',
+                new_refresh_token=f'refresh-{index}'
+            )
+            for index in range(2)
+        ]
+
+        self.assertEqual(rotations, [True, False])
+        self.assertEqual(UserToken.objects.get().refresh_token, 'refresh-0')
+
+
+@skipUnlessDBFeature('has_select_for_update')
+class ConcurrentTokenRefreshTests(TokenRefreshTestMixin, TransactionTestCase):
+    """Simultaneous refreshes of one token on a real database.
+
+    SQLite serialises writers, so this only runs against MySQL or
+    PostgreSQL.
+    """
+
+    threads = 8
+
+    def test_one_concurrent_refresh_wins(self):
+        barrier = threading.Barrier(self.threads)
+        statuses = []
+        lock = threading.Lock()
+
+        def refresh():
+            try:
+                barrier.wait()
+                response = self._refresh(self.refresh_token)
+                with lock:
+                    statuses.append(response.status_code)
+            finally:
+                connection.close()
+
+        workers = [
+            threading.Thread(target=refresh) for _ in range(self.threads)
+        ]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+
+        self.assertEqual(sorted(statuses), [status.HTTP_200_OK] + [
+            status.HTTP_401_UNAUTHORIZED
+        ] * (self.threads - 1))
@@ -0,0 +1,46 @@
+from rest_framework.throttling import SimpleRateThrottle
+
+
+class ClientIPRateThrottle(SimpleRateThrottle):
+    """Throttle by client IP whether or not the request is authenticated."""
+
+    def get_cache_key(self, request, view):
+        return self.cache_format % {
+            'scope': self.scope,
+            'ident': self.get_ident(request)
+        }
+
+
+class LoginRateThrottle(ClientIPRateThrottle):
+    scope = 'login'
+
+
+class LoginEmailRateThrottle(SimpleRateThrottle):
+    """Throttle login attempts per email and client IP pair.
+
+    Keying on the email alone would let anyone lock a victim out of
+    their account by spamming wrong passwords for it.
+    """
+    scope = 'login_email'
+
+    def get_cache_key(self, request, view):
+        email = request.data.get('email')
+        if not email or not isinstance(email, str):
+            return None
+
+        return self.cache_format % {
+            'scope': self.scope,
+            'ident': f'{email.strip().lower()}:{self.get_ident(request)}'
+        }
+
+
+class RegistrationRateThrottle(ClientIPRateThrottle):
+    scope = 'registration'
+
+
+class ResendConfirmationRateThrottle(ClientIPRateThrottle):
+    scope = 'resend_confirmation'
+
+
+class TokenRefreshRateThrottle(ClientIPRateThrottle):
+    scope = 'token_refresh'
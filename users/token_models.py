@@ -33,6 +33,23 @@ class UserToken(models.Model):
             refresh_token=refresh_token,
         )
 
+    @classmethod
+    def rotate_tokens(cls, user_id, refresh_token, access_token,
+                      new_refresh_token):
+        """Replace an active token pair in place with one UPDATE.
+
+        A refresh token that was already rotated or logged out matches
+        no row, so of two concurrent refreshes only one wins. Returns
+        whether the pair was rotated.
+        """
+        return cls.objects.filter(
+            user_id=user_id,
+            refresh_token=refresh_token,
+            is_active=True
+        ).update(
+            access_token=access_token,
+            refresh_token=new_refresh_token
+        ) == 1
 
     @classmethod
     def is_token_valid(cls, access_token):
@@ -44,3 +61,11 @@ class UserToken(models.Model):
             return token_obj.user
         except cls.DoesNotExist:
             return None
+
+    @classmethod
+    async def ais_token_valid_for_user(cls, access_token, user_id):
+        return await cls.objects.filter(
+            access_token=access_token,
+            user_id=user_id,
+            is_active=True
+        ).aexists()
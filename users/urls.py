@@ -1,18 +1,27 @@
+from django.conf import settings
 from django.urls import path
 from .views import (
     UserRegistrationView,
     EmailConfirmationView,
     ResendConfirmationView,
     LoginView,
+    TokenRefreshView,
     LogoutView,
     ProfileView,
+    ProfileAsyncView,
 )
 
+if settings.ASYNC_READ_VIEWS:
+    profile_view = ProfileAsyncView.as_view()
+else:
+    profile_view = ProfileView.as_view()
+
 urlpatterns = [
     path('register/', UserRegistrationView.as_view(), name='user-register'),
     path('confirm-email/', EmailConfirmationView.as_view(), name='email-confirm'),
     path('resend-confirmation/', ResendConfirmationView.as_view(), name='resend-confirmation'),
     path('login/', LoginView.as_view(), name='user-login'),
+    path('token/refresh/', TokenRefreshView.as_view(), name='token-refresh'),
     path('logout/', LogoutView.as_view(), name='user-logout'),
-    path('profile/', ProfileView.as_view(), name='user-profile'),
+    path('profile/', profile_view, name='user-profile'),
 ]
@@ -1,37 +1,50 @@
-import uuid
+import logging
 from rest_framework import status, generics, permissions
+from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
 from rest_framework.views import APIView
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
 from rest_framework_simplejwt.tokens import RefreshToken
 from django.contrib.auth import get_user_model
-from django.utils import timezone
 from django.db import transaction, IntegrityError
 from utils.mail import send_confirmation_email
+from utils.metrics import record_auth_outcome
 from .token_models import UserToken
+from .throttles import (
+    LoginRateThrottle,
+    LoginEmailRateThrottle,
+    RegistrationRateThrottle,
+    ResendConfirmationRateThrottle,
+    TokenRefreshRateThrottle,
+)
 from .serializers import (
     UserRegistrationSerializer,
     UserSerializer,
     EmailConfirmationSerializer,
     ResendConfirmationSerializer,
-    LoginSerializer
+    LoginSerializer,
+    TokenRefreshSerializer
 )
-from constants.models import UserStatusChoices
 from constants.messages import AuthMessages, ValidationMessages
 from constants.messages import HTTPErrorMessages
+from utils.async_views import AsyncAPIView
 
 User = get_user_model()
 
+logger = logging.getLogger(__name__)
+
 
 class UserRegistrationView(generics.CreateAPIView):
     serializer_class = UserRegistrationSerializer
     permission_classes = [permissions.AllowAny]
+    throttle_classes = [RegistrationRateThrottle]
 
     def create(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
         user = serializer.save()
 
-        send_confirmation_email(user, request)
+        send_confirmation_email(user, request, serializer.confirmation_token)
 
         user_serializer = UserSerializer(user)
         return Response(user_serializer.data)
@@ -42,18 +55,11 @@ class EmailConfirmationView(APIView):
 
     def post(self, request):
         serializer = EmailConfirmationSerializer(data=request.data)
-        serializer.is_valid(raise_exception=True)
-
-        token = serializer.validated_data['token']
 
         try:
-            user = User.objects.get(confirmation_token=token)
-
             with transaction.atomic():
-                user.status = UserStatusChoices.ACTIVATED
-                user.confirmed_at = timezone.now()
-                user.confirmation_token = None
-                user.save()
+                serializer.is_valid(raise_exception=True)
+                user = serializer.save()
 
                 refresh = RefreshToken.for_user(user)
                 access_token = refresh.access_token
@@ -71,17 +77,17 @@ class EmailConfirmationView(APIView):
                 'user': UserSerializer(user).data
             }, status=status.HTTP_200_OK)
 
-        except User.DoesNotExist:
-            return Response({
-                'error': ValidationMessages.INVALID_TOKEN
-            }, status=status.HTTP_400_BAD_REQUEST)
+        except ValidationError:
+            raise
         except IntegrityError as e:
-            print(f"Database integrity error in email confirmation: {e}")
+            logger.error(
+                "Database integrity error in email confirmation: %s", e
+            )
             return Response({
                 'error': HTTPErrorMessages.INTERNAL_SERVER_ERROR
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
         except Exception as e:
-            print(f"Unexpected error in email confirmation: {e}", exc_info=True)
+            logger.exception("Unexpected error in email confirmation: %s", e)
             return Response({
                 'error': HTTPErrorMessages.INTERNAL_SERVER_ERROR
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
@@ -101,6 +107,7 @@ class EmailConfirmationView(APIView):
 
 class ResendConfirmationView(APIView):
     permission_classes = [permissions.AllowAny]
+    throttle_classes = [ResendConfirmationRateThrottle]
 
     def post(self, request):
         serializer = ResendConfirmationSerializer(data=request.data)
@@ -111,11 +118,13 @@ class ResendConfirmationView(APIView):
         try:
             user = User.objects.get(email=email)
 
-            user.confirmation_token = str(uuid.uuid4())
-            user.confirmation_sent_at = timezone.now()
-            user.save()
+            confirmation_token = user.issue_confirmation_token()
+            user.save(update_fields=[
+                'confirmation_token',
+                'confirmation_sent_at'
+            ])
 
-            send_confirmation_email(user, request)
+            send_confirmation_email(user, request, confirmation_token)
 
             return Response({
                 'message': AuthMessages.EMAIL_CONFIRMATION_RESENT
@@ -125,7 +134,9 @@ class ResendConfirmationView(APIView):
                 'email': ValidationMessages.EMAIL_NOT_FOUND
             }, status=status.HTTP_404_NOT_FOUND)
         except Exception as e:
-            print(f"Unexpected error in resend confirmation: {e}", exc_info=True)
+            logger.exception(
+                "Unexpected error in resend confirmation: %s", e
+            )
             return Response({
                 'error': HTTPErrorMessages.INTERNAL_SERVER_ERROR
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
@@ -133,6 +144,7 @@ class ResendConfirmationView(APIView):
 
 class LoginView(APIView):
     permission_classes = [permissions.AllowAny]
+    throttle_classes = [LoginRateThrottle, LoginEmailRateThrottle]
 
     def post(self, request):
         serializer = LoginSerializer(data=request.data)
@@ -157,17 +169,57 @@ class LoginView(APIView):
             }, status=status.HTTP_200_OK)
 
         except IntegrityError as e:
-            print(f"Database integrity error in login: {e}")
+            logger.error("Database integrity error in login: %s", e)
             return Response({
                 'error': ValidationMessages.DATABASE_ERROR
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
         except Exception as e:
-            print(f"Unexpected error in login: {e}", exc_info=True)
+            logger.exception("Unexpected error in login: %s", e)
             return Response({
                 'error': HTTPErrorMessages.INTERNAL_SERVER_ERROR
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
+class TokenRefreshView(APIView):
+    """Trade a refresh token for a new token pair without logging in.
+
+    The pair is rotated in place on the existing UserToken row, so a
+    refresh costs no password hashing and adds no row. A refresh token
+    works once: reusing it after rotation or logout is rejected.
+    """
+
+    permission_classes = [permissions.AllowAny]
+    throttle_classes = [TokenRefreshRateThrottle]
+
+    def post(self, request):
+        serializer = TokenRefreshSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        refresh = serializer.validated_data['refresh']
+        access_token = refresh.access_token
+        if jwt_settings.ROTATE_REFRESH_TOKENS:
+            refresh.set_jti()
+            refresh.set_exp()
+            refresh.set_iat()
+
+        if not UserToken.rotate_tokens(
+            user_id=refresh[jwt_settings.USER_ID_CLAIM],
+            refresh_token=serializer.validated_data['refresh_token'],
+            access_token=str(access_token),
+            new_refresh_token=str(refresh),
+        ):
+            record_auth_outcome('refresh', 'revoked')
+            return Response({
+                'error': AuthMessages.REFRESH_TOKEN_REVOKED
+            }, status=status.HTTP_401_UNAUTHORIZED)
+
+        record_auth_outcome('refresh', 'success')
+        return Response({
+            'access_token': str(access_token),
+            'refresh_token': str(refresh)
+        }, status=status.HTTP_200_OK)
+
+
 class LogoutView(APIView):
     permission_classes = [permissions.IsAuthenticated]
 
@@ -187,12 +239,12 @@ class LogoutView(APIView):
             }, status=status.HTTP_200_OK)
 
         except IntegrityError as e:
-            print(f"Database integrity error in logout: {e}")
+            logger.error("Database integrity error in logout: %s", e)
             return Response({
                 'message': AuthMessages.LOGOUT_SUCCESS
             }, status=status.HTTP_200_OK)
         except Exception as e:
-            print(f"Unexpected error in logout: {e}", exc_info=True)
+            logger.exception("Unexpected error in logout: %s", e)
             return Response({
                 'message': AuthMessages.LOGOUT_SUCCESS
             }, status=status.HTTP_200_OK)
@@ -205,3 +257,10 @@ class ProfileView(APIView):
         return Response({
             'user': UserSerializer(request.user).data
         }, status=status.HTTP_200_OK)
+
+
+class ProfileAsyncView(AsyncAPIView):
+    async def get(self, request):
+        return self.render({
+            'user': UserSerializer(request.user).data
+        })
@@ -0,0 +1,23 @@
+from django_redis.cache import RedisCache
+from utils.metrics import record_cache_lookup
+
+_MISSING = object()
+
+
+class InstrumentedRedisCache(RedisCache):
+    """django-redis cache that records hit and miss counts."""
+
+    def get(self, key, default=None, version=None, client=None):
+        value = super().get(key, _MISSING, version, client)
+        if value is _MISSING:
+            record_cache_lookup(False)
+            return default
+        record_cache_lookup(True)
+        return value
+
+    def get_many(self, keys, version=None, client=None):
+        keys = list(keys)
+        values = super().get_many(keys, version=version, client=client)
+        record_cache_lookup(True, len(values))
+        record_cache_lookup(False, len(keys) - len(values))
+        return values
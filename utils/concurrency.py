@@ -0,0 +1,170 @@
+from django.db import router, transaction
+from django.db.models import F
+from django.db.models.signals import post_save, pre_save
+from rest_framework import status
+from rest_framework.exceptions import APIException
+from constants.messages import HTTPErrorMessages
+
+VERSION_FIELD = 'version'
+
+
+class PreconditionFailed(APIException):
+    status_code = status.HTTP_412_PRECONDITION_FAILED
+    default_detail = HTTPErrorMessages.PRECONDITION_FAILED
+    default_code = 'precondition_failed'
+
+
+def etag(version):
+    return f'"{version}"'
+
+
+def set_etag(response, data):
+    """Add the ETag of a rendered row that includes its version."""
+    if VERSION_FIELD in data:
+        response['ETag'] = etag(data[VERSION_FIELD])
+    return response
+
+
+def check_if_match(request, version):
+    """Raise PreconditionFailed unless If-Match names ``version``.
+
+    Requests without If-Match, or with ``*``, pass. Compressed responses
+    carry weak ETags (see utils.compression), so ``W/`` is ignored.
+    """
+    header = request.headers.get('If-Match')
+    if not header or header.strip() == '*':
+        return
+    for tag in header.split(','):
+        tag = tag.strip().removeprefix('W/')
+        if tag == etag(version):
+            return
+    raise PreconditionFailed
+
+
+def version_bump(model):
+    """``update()`` kwargs that bump the version, if ``model`` has one."""
+    if any(
+        field.name == VERSION_FIELD for field in model._meta.concrete_fields
+    ):
+        return {VERSION_FIELD: F(VERSION_FIELD) + 1}
+    return {}
+
+
+def _update_version(instance, using, version, update_fields=None):
+    """Write ``instance`` with ``UPDATE ... WHERE version = %s``.
+
+    The version is bumped in the same statement and set on ``instance``
+    before post_save, so receivers see the new number. pre_save and
+    post_save are sent as save() would. Returns False, without sending
+    post_save, if the row is gone or has another version.
+    """
+    model = type(instance)
+    if update_fields is not None:
+        update_fields = frozenset(update_fields)
+    pre_save.send(
+        sender=model,
+        instance=instance,
+        raw=False,
+        using=using,
+        update_fields=update_fields
+    )
+    values = {
+        field.attname: field.pre_save(instance, False)
+        for field in model._meta.concrete_fields
+        if not field.primary_key and field.name != VERSION_FIELD and (
+            update_fields is None
+            or field.name in update_fields
+            or field.attname in update_fields
+        )
+    }
+    updated = model._base_manager.using(using).filter(
+        pk=instance.pk,
+        **{VERSION_FIELD: version}
+    ).update(**values, **{VERSION_FIELD: version + 1})
+    if not updated:
+        return False
+
+    setattr(instance, VERSION_FIELD, version + 1)
+    instance._state.db = using
+    instance._state.adding = False
+    post_save.send(
+        sender=model,
+        instance=instance,
+        created=False,
+        update_fields=update_fields,
+        raw=False,
+        using=using
+    )
+    return True
+
+
+def save_versioned(instance):
+    """Save ``instance`` with one ``UPDATE ... WHERE version = %s``.
+
+    The row is not locked while the request runs; a write that bumped the
+    version after ``instance`` was read makes the UPDATE match nothing
+    and raises PreconditionFailed.
+    """
+    using = router.db_for_write(type(instance), instance=instance)
+    with transaction.atomic(using=using):
+        if not _update_version(
+            instance, using, getattr(instance, VERSION_FIELD)
+        ):
+            raise PreconditionFailed
+
+
+class VersionedModelMixin:
+    """Model mixin whose save() bumps the version of an existing row.
+
+    The row is locked and its current version read first, so concurrent
+    saves each move the version on. save_versioned() is for updates that
+    must fail on a stale version; this covers every other save(), e.g. a
+    soft delete.
+    """
+
+    def save(
+        self, force_insert=False, force_update=False, using=None,
+        update_fields=None
+    ):
+        if self._state.adding or force_insert or (
+            update_fields is not None and not update_fields
+        ):
+            return super().save(
+                force_insert=force_insert,
+                force_update=force_update,
+                using=using,
+                update_fields=update_fields
+            )
+
+        using = using or router.db_for_write(type(self), instance=self)
+        with transaction.atomic(using=using):
+            version = type(self)._base_manager.using(using).filter(
+                pk=self.pk
+            ).select_for_update().values_list(
+                VERSION_FIELD, flat=True
+            ).first()
+            if version is not None and _update_version(
+                self, using, version, update_fields
+            ):
+                return
+        # The row is gone: let save() insert it or fail as it would
+        return super().save(
+            force_insert=force_insert,
+            force_update=force_update,
+            using=using,
+            update_fields=update_fields
+        )
+
+
+class VersionedUpdateMixin:
+    """ModelSerializer mixin whose update() goes through save_versioned.
+
+    Conflicts are detected against the version the instance was read
+    with. Serializers using it must not write many-to-many fields.
+    """
+
+    def update(self, instance, validated_data):
+        for attr, value in validated_data.items():
+            setattr(instance, attr, value)
+        save_versioned(instance)
+        return instance
@@ -0,0 +1,97 @@
+import re
+from django.db import IntegrityError, transaction
+from django.db.models import UniqueConstraint
+from rest_framework import serializers
+
+# MySQL: "Duplicate entry 'x' for key 'table.key'" (older servers: 'key')
+MYSQL_DUPLICATE_KEY = re.compile(r"for key '(?:[^'.]*\.)?([^'.]+)'")
+# SQLite: "UNIQUE constraint failed: table.a, table.b" or "...: index 'key'"
+SQLITE_UNIQUE = re.compile(
+    r"UNIQUE constraint failed: (?:index '([^']+)'|(.+))"
+)
+# PostgreSQL: "Key (a, b)=(x, y) already exists."
+POSTGRES_KEY = re.compile(r'Key \(([^)]+)\)=')
+
+
+def _unique_rules(model):
+    """``(name, columns)`` of every unique rule of ``model``.
+
+    Unique fields are named after the field; their MySQL key is named
+    after the column. Expression constraints have no columns.
+    """
+    opts = model._meta
+    rules = [
+        (field.name, frozenset([field.column]))
+        for field in opts.concrete_fields
+        if field.unique and not field.primary_key
+    ]
+    for constraint in opts.constraints:
+        if isinstance(constraint, UniqueConstraint):
+            rules.append((constraint.name, frozenset(
+                opts.get_field(name).column for name in constraint.fields
+            ) or None))
+    return rules
+
+
+def unique_violation(exc, model):
+    """Name of the unique rule of ``model`` that ``exc`` violated.
+
+    Returns the constraint name, the field name for ``unique=True``
+    fields, or None when ``exc`` isn't a recognisable unique violation.
+    """
+    message = str(exc)
+    key = None
+    columns = None
+
+    match = MYSQL_DUPLICATE_KEY.search(message)
+    if match:
+        key = match.group(1)
+    match = SQLITE_UNIQUE.search(message)
+    if match:
+        key = match.group(1)
+        if match.group(2):
+            columns = frozenset(
+                part.strip().rsplit('.', 1)[-1]
+                for part in match.group(2).split(',')
+            )
+    match = POSTGRES_KEY.search(message)
+    if match:
+        columns = frozenset(
+            part.strip().strip('"') for part in match.group(1).split(',')
+        )
+    diag = getattr(exc.__cause__, 'diag', None)
+    if getattr(diag, 'constraint_name', None):
+        key = diag.constraint_name
+
+    for name, rule_columns in _unique_rules(model):
+        if key is not None and (
+            key == name or (rule_columns and rule_columns == {key})
+        ):
+            return name
+        if columns is not None and rule_columns == columns:
+            return name
+    return None
+
+
+class UniqueErrorsMixin:
+    """Serializer mixin that leaves uniqueness checks to the database.
+
+    An ``exists()`` query per rule costs a round-trip and still races a
+    concurrent insert. Instead save() runs unchecked and a violated
+    constraint is reported as a field error: ``unique_errors`` maps the
+    rule name (see unique_violation) to ``(field, message)``.
+    """
+
+    unique_errors = {}
+
+    def save(self, **kwargs):
+        try:
+            # In a savepoint, so an enclosing transaction stays usable
+            with transaction.atomic():
+                return super().save(**kwargs)
+        except IntegrityError as exc:
+            rule = unique_violation(exc, self.Meta.model)
+            if rule not in self.unique_errors:
+                raise
+            field, message = self.unique_errors[rule]
+            raise serializers.ValidationError({field: message}) from exc
@@ -0,0 +1,63 @@
+from django.db.backends.mysql.base import (
+    DatabaseWrapper as MySQLDatabaseWrapper,
+)
+from .pool import get_pool
+
+
+class DatabaseWrapper(MySQLDatabaseWrapper):
+    """mysqlclient backend that borrows connections from a process pool.
+
+    Configure with a ``POOL`` dict in the database settings (``MAX_SIZE``,
+    ``IDLE_TIMEOUT``, ``TIMEOUT``, ``HEALTH_CHECK_INTERVAL``). Keep
+    ``CONN_MAX_AGE`` at 0 so Django hands the connection back to the pool
+    at the end of every request.
+    """
+
+    def get_pool(self, conn_params):
+        options = self.settings_dict.get('POOL') or {}
+        return get_pool(
+            self.alias,
+            lambda: super(DatabaseWrapper, self).get_new_connection(
+                conn_params
+            ),
+            max_size=options.get('MAX_SIZE', 10),
+            idle_timeout=options.get('IDLE_TIMEOUT', 300),
+            timeout=options.get('TIMEOUT', 30),
+            health_check_interval=options.get('HEALTH_CHECK_INTERVAL', 10),
+        )
+
+    def get_new_connection(self, conn_params):
+        self._pool = self.get_pool(conn_params)
+        connection, self._connection_created = self._pool.acquire(
+            self._is_raw_usable
+        )
+        return connection
+
+    def init_connection_state(self):
+        # Session settings survive on a pooled connection, so only a
+        # freshly opened one needs them
+        if self._connection_created:
+            super().init_connection_state()
+
+    def _close(self):
+        if self.connection is None:
+            return
+
+        reusable = not self.in_atomic_block
+        if reusable and self.errors_occurred:
+            reusable = self._is_raw_usable(self.connection)
+        if reusable:
+            try:
+                if not self.connection.get_autocommit():
+                    self.connection.rollback()
+            except self.Database.Error:
+                reusable = False
+
+        self._pool.release(self.connection, reusable=reusable)
+
+    def _is_raw_usable(self, connection):
+        try:
+            connection.ping()
+        except self.Database.Error:
+            return False
+        return True
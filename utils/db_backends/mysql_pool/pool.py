@@ -0,0 +1,142 @@
+import threading
+import time
+from collections import deque
+
+
+class PoolTimeout(Exception):
+    pass
+
+
+class ConnectionPool:
+    """Thread-safe pool of raw DB-API connections for one database alias."""
+
+    def __init__(self, connect, max_size=10, idle_timeout=300, timeout=30,
+                 health_check_interval=10):
+        self._connect = connect
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.timeout = timeout
+        self.health_check_interval = health_check_interval
+
+        self._idle = deque()
+        self._size = 0
+        self._condition = threading.Condition()
+
+        self.in_use = 0
+        self.waits = 0
+        self.wait_seconds = 0.0
+        self.connects = 0
+        self.connect_seconds = 0.0
+        self.discarded = 0
+
+    def acquire(self, is_usable):
+        """Return ``(connection, created)`` for a pooled or new connection."""
+        while True:
+            connection, idle_for = self._checkout()
+            if connection is None:
+                return self._open(), True
+
+            if idle_for > self.idle_timeout or (
+                idle_for > self.health_check_interval
+                and not is_usable(connection)
+            ):
+                self.release(connection, reusable=False)
+                continue
+
+            return connection, False
+
+    def release(self, connection, reusable=True):
+        with self._condition:
+            self.in_use -= 1
+            if reusable:
+                self._idle.append((connection, time.monotonic()))
+            else:
+                self._size -= 1
+                self.discarded += 1
+            self._condition.notify()
+
+        if not reusable:
+            self._close_quietly(connection)
+
+    def _checkout(self):
+        """Reserve an idle connection, or a slot for a new one."""
+        deadline = time.monotonic() + self.timeout
+        wait_started = None
+
+        with self._condition:
+            while not self._idle and self._size >= self.max_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise PoolTimeout(
+                        f'No connection available within {self.timeout}s'
+                    )
+                if wait_started is None:
+                    wait_started = time.monotonic()
+                    self.waits += 1
+                self._condition.wait(remaining)
+
+            if wait_started is not None:
+                self.wait_seconds += time.monotonic() - wait_started
+            self.in_use += 1
+
+            if self._idle:
+                connection, released_at = self._idle.pop()
+                return connection, time.monotonic() - released_at
+
+            self._size += 1
+            return None, 0
+
+    def _open(self):
+        started = time.monotonic()
+        try:
+            connection = self._connect()
+        except Exception:
+            with self._condition:
+                self._size -= 1
+                self.in_use -= 1
+                self._condition.notify()
+            raise
+
+        with self._condition:
+            self.connects += 1
+            self.connect_seconds += time.monotonic() - started
+        return connection
+
+    @staticmethod
+    def _close_quietly(connection):
+        try:
+            connection.close()
+        except Exception:
+            pass
+
+    def stats(self):
+        with self._condition:
+            return {
+                'size': self._size,
+                'idle': len(self._idle),
+                'in_use': self.in_use,
+                'max_size': self.max_size,
+                'waits': self.waits,
+                'wait_seconds': self.wait_seconds,
+                'connects': self.connects,
+                'connect_seconds': self.connect_seconds,
+                'discarded': self.discarded,
+            }
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(alias, connect, **options):
+    with _pools_lock:
+        if alias not in _pools:
+            _pools[alias] = ConnectionPool(connect, **options)
+        return _pools[alias]
+
+
+def pool_stats():
+    """Return a stats snapshot for every pool in this process."""
+    with _pools_lock:
+        pools = dict(_pools)
+    return {alias: pool.stats() for alias, pool in pools.items()}
@@ -0,0 +1,190 @@
+import hashlib
+import random
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+_read_from_replica = ContextVar('read_from_replica', default=False)
+
+_lag_lock = threading.Lock()
+_lag_checked = {}
+
+
+def replica_aliases():
+    return getattr(settings, 'DATABASE_REPLICAS', [])
+
+
+@contextmanager
+def use_primary():
+    """Send every read inside the block to the primary."""
+    token = _read_from_replica.set(False)
+    try:
+        yield
+    finally:
+        _read_from_replica.reset(token)
+
+
+@contextmanager
+def use_replicas():
+    token = _read_from_replica.set(True)
+    try:
+        yield
+    finally:
+        _read_from_replica.reset(token)
+
+
+def _query_replica_lag(alias):
+    connection = connections[alias]
+    if connection.vendor != 'mysql':
+        return 0
+
+    with connection.cursor() as cursor:
+        try:
+            cursor.execute('SHOW REPLICA STATUS')
+        except DatabaseError:
+            cursor.execute('SHOW SLAVE STATUS')
+        row = cursor.fetchone()
+        if row is None:
+            return None
+        status = dict(zip([column[0] for column in cursor.description], row))
+
+    return status.get(
+        'Seconds_Behind_Source',
+        status.get('Seconds_Behind_Master')
+    )
+
+
+def replica_lag(alias):
+    """Return the replica lag in seconds, cached per process."""
+    interval = getattr(settings, 'DATABASE_REPLICA_LAG_CHECK_INTERVAL', 5)
+    now = time.monotonic()
+
+    with _lag_lock:
+        checked = _lag_checked.get(alias)
+        if checked and now - checked[0] < interval:
+            return checked[1]
+
+    try:
+        lag = _query_replica_lag(alias)
+    except DatabaseError:
+        lag = None
+
+    with _lag_lock:
+        _lag_checked[alias] = (now, lag)
+    return lag
+
+
+def healthy_replicas():
+    max_lag = getattr(settings, 'DATABASE_REPLICA_MAX_LAG', None)
+    if max_lag is None:
+        return replica_aliases()
+
+    healthy = []
+    for alias in replica_aliases():
+        lag = replica_lag(alias)
+        if lag is not None and lag <= max_lag:
+            healthy.append(alias)
+    return healthy
+
+
+class PrimaryReplicaRouter:
+    """Route reads to replicas only when the request allows it.
+
+    Replica reads are opted into per request by ReplicaRoutingMiddleware.
+    Writes, reads inside ``transaction.atomic`` and reads from pinned
+    clients stay on the primary. Users and tokens are always read from the
+    primary so a freshly issued token authenticates immediately.
+    """
+
+    primary_only_apps = {'users'}
+
+    def db_for_read(self, model, **hints):
+        if not _read_from_replica.get():
+            return DEFAULT_DB_ALIAS
+        if model._meta.app_label in self.primary_only_apps:
+            return DEFAULT_DB_ALIAS
+        if connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS
+
+        replicas = healthy_replicas()
+        if not replicas:
+            return DEFAULT_DB_ALIAS
+        return random.choice(replicas)
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == DEFAULT_DB_ALIAS
+
+
+def _pin_key(request):
+    authorization = request.META.get('HTTP_AUTHORIZATION')
+    if not authorization:
+        return None
+    digest = hashlib.sha1(authorization.encode('utf-8')).hexdigest()
+    return f'db_primary_pin:{digest}'
+
+
+def _pin_seconds():
+    return getattr(settings, 'DATABASE_READ_YOUR_WRITES_SECONDS', 5)
+
+
+class ReplicaRoutingMiddleware:
+    """Enable replica reads for safe requests from clients not pinned.
+
+    A successful write pins the caller (keyed by its Authorization header)
+    to the primary for DATABASE_READ_YOUR_WRITES_SECONDS, so it reads its
+    own writes even while replicas lag.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        pin_key = _pin_key(request)
+        if request.method in SAFE_METHODS:
+            use_replica = not (pin_key and cache.get(pin_key))
+            token = _read_from_replica.set(use_replica)
+            try:
+                return self.get_response(request)
+            finally:
+                _read_from_replica.reset(token)
+
+        response = self.get_response(request)
+        if pin_key and response.status_code < 400:
+            cache.set(pin_key, 1, _pin_seconds())
+        return response
+
+    async def __acall__(self, request):
+        pin_key = _pin_key(request)
+        if request.method in SAFE_METHODS:
+            use_replica = not (pin_key and await cache.aget(pin_key))
+            token = _read_from_replica.set(use_replica)
+            try:
+                return await self.get_response(request)
+            finally:
+                _read_from_replica.reset(token)
+
+        response = await self.get_response(request)
+        if pin_key and response.status_code < 400:
+            await cache.aset(pin_key, 1, _pin_seconds())
+        return response
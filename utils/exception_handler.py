@@ -11,11 +11,13 @@ from constants.messages import HTTPErrorMessages
 from django.db import DatabaseError
 from django.http import JsonResponse
 from django.core.exceptions import ObjectDoesNotExist
-import traceback
+from utils.concurrency import PreconditionFailed
 
 import logging
 
 logger = logging.getLogger(__name__)
+# Client-driven noise (bad tokens, throttling) is sampled, see LOGGING
+sampled_logger = logging.getLogger(f'{__name__}.sampled')
 
 
 def _create_error_response(error_type, detail, attr=None):
@@ -29,7 +31,7 @@ def _create_error_response(error_type, detail, attr=None):
 
 
 def _handle_parse_error(exc):
-    logger.warning(f"Parse error: {str(exc)}")
+    logger.warning("Parse error: %s", exc)
     return _create_error_response(
         'parse_error',
         _(HTTPErrorMessages.PARSE_ERROR)
@@ -37,7 +39,7 @@ def _handle_parse_error(exc):
 
 
 def _handle_authentication_failed(exc):
-    logger.warning(f"Authentication failed: {str(exc)}")
+    sampled_logger.warning("Authentication failed: %s", exc)
     return _create_error_response(
         'authentication_failed',
         _(HTTPErrorMessages.AUTHENTICATION_FAILED)
@@ -45,7 +47,7 @@ def _handle_authentication_failed(exc):
 
 
 def _handle_not_authenticated(exc):
-    logger.warning(f"Not authenticated: {str(exc)}")
+    sampled_logger.warning("Not authenticated: %s", exc)
     return _create_error_response(
         'not_authenticated',
         _(HTTPErrorMessages.NOT_AUTHENTICATED)
@@ -53,7 +55,7 @@ def _handle_not_authenticated(exc):
 
 
 def _handle_permission_denied(exc):
-    logger.warning(f"Permission denied: {str(exc)}")
+    logger.warning("Permission denied: %s", exc)
     return _create_error_response(
         'permission_denied',
         _(HTTPErrorMessages.PERMISSION_DENIED)
@@ -61,7 +63,7 @@ def _handle_permission_denied(exc):
 
 
 def _handle_not_found(exc):
-    logger.info(f"Resource not found: {str(exc)}")
+    logger.info("Resource not found: %s", exc)
     return _create_error_response(
         'not_found',
         _(HTTPErrorMessages.NOT_FOUND)
@@ -69,7 +71,7 @@ def _handle_not_found(exc):
 
 
 def _handle_method_not_allowed(exc):
-    logger.warning(f"Method not allowed: {str(exc)}")
+    logger.warning("Method not allowed: %s", exc)
     return _create_error_response(
         'method_not_allowed',
         _(HTTPErrorMessages.METHOD_NOT_ALLOWED)
@@ -77,7 +79,7 @@ def _handle_method_not_allowed(exc):
 
 
 def _handle_not_acceptable(exc):
-    logger.warning(f"Not acceptable: {str(exc)}")
+    logger.warning("Not acceptable: %s", exc)
     return _create_error_response(
         'not_acceptable',
         _(HTTPErrorMessages.NOT_ACCEPTABLE)
@@ -85,7 +87,7 @@ def _handle_not_acceptable(exc):
 
 
 def _handle_unsupported_media_type(exc):
-    logger.warning(f"Unsupported media type: {str(exc)}")
+    logger.warning("Unsupported media type: %s", exc)
     return _create_error_response(
         'unsupported_media_type',
         _(HTTPErrorMessages.UNSUPPORTED_MEDIA_TYPE)
@@ -93,7 +95,7 @@ def _handle_unsupported_media_type(exc):
 
 
 def _handle_throttled(exc):
-    logger.warning(f"Request throttled: {str(exc)}")
+    sampled_logger.warning("Request throttled: %s", exc)
     
     if hasattr(exc, 'wait') and exc.wait:
         detail_message = _(HTTPErrorMessages.THROTTLED_WITH_WAIT).format(wait=exc.wait)
@@ -106,8 +108,16 @@ def _handle_throttled(exc):
     )
 
 
+def _handle_precondition_failed(exc):
+    logger.info("Precondition failed: %s", exc)
+    return _create_error_response(
+        'precondition_failed',
+        _(HTTPErrorMessages.PRECONDITION_FAILED)
+    )
+
+
 def _handle_validation_error(exc, response):
-    logger.warning(f"Validation error: {str(exc)}")
+    logger.warning("Validation error: %s", exc)
     errors = []
 
     if hasattr(response, 'data'):
@@ -144,7 +154,7 @@ def _handle_validation_error(exc, response):
 
 
 def _handle_generic_api_error(exc):
-    logger.error(f"API exception: {str(exc)}")
+    logger.error("API exception: %s", exc)
     return _create_error_response(
         'api_error',
         str(exc) or _(HTTPErrorMessages.BAD_REQUEST)
@@ -152,7 +162,7 @@ def _handle_generic_api_error(exc):
 
 
 def _handle_database_error(exc):
-    logger.error(f"Database error: {str(exc)}")
+    logger.error("Database error: %s", exc)
     return Response(
         _create_error_response(
             'database_error',
@@ -163,7 +173,7 @@ def _handle_database_error(exc):
 
 
 def _handle_object_does_not_exist(exc):
-    logger.info(f"Object does not exist: {str(exc)}")
+    logger.info("Object does not exist: %s", exc)
     return Response(
         _create_error_response(
             'not_found',
@@ -174,8 +184,7 @@ def _handle_object_does_not_exist(exc):
 
 
 def _handle_unhandled_exception(exc):
-    logger.error(f"Unhandled exception: {str(exc)}")
-    logger.error(traceback.format_exc())
+    logger.error("Unhandled exception: %s", exc, exc_info=exc)
 
     return Response(
         _create_error_response(
@@ -209,6 +218,7 @@ def _handle_drf_exceptions(exc, response):
         NotAcceptable: _handle_not_acceptable,
         UnsupportedMediaType: _handle_unsupported_media_type,
         Throttled: _handle_throttled,
+        PreconditionFailed: _handle_precondition_failed,
     }
 
     for exception_type, handler in exception_handlers.items():
@@ -231,7 +241,7 @@ def _handle_non_drf_exceptions(exc):
 
 
 def page_not_found_handler(request, exception=None):
-    logger.info(f"404 error: Page not found for URL: {request.path}")
+    logger.info("404 error: Page not found for URL: %s", request.path)
 
     response_data = {
         "type": "not_found",
@@ -259,7 +269,7 @@ def internal_server_error_handler(request):
 
 
 def permission_denied_handler(request, exception=None):
-    logger.warning(f"403 Permission Denied: {str(exception) if exception else 'Unknown'}")
+    logger.warning("403 Permission Denied: %s", exception or 'Unknown')
 
     response_data = {
         "type": "permission_denied",
@@ -273,7 +283,7 @@ def permission_denied_handler(request, exception=None):
 
 
 def bad_request_handler(request, exception=None):
-    logger.warning(f"400 Bad Request: {str(exception) if exception else 'Unknown'}")
+    logger.warning("400 Bad Request: %s", exception or 'Unknown')
 
     response_data = {
         "type": "bad_request",
@@ -1,12 +1,15 @@
+import logging
 from django.core.mail import send_mail
 from django.conf import settings
 from django.urls import reverse
 from constants.email_templates import EmailTemplates, EmailSubjects
 
-def send_confirmation_email(user, request):
+logger = logging.getLogger(__name__)
+
+def send_confirmation_email(user, request, confirmation_token):
     try:
         confirmation_url = request.build_absolute_uri(
-            reverse('email-confirm') + f'?token={user.confirmation_token}'
+            reverse('email-confirm') + f'?token={confirmation_token}'
         )
 
         message = EmailTemplates.account_confirmation(
@@ -22,4 +25,4 @@ def send_confirmation_email(user, request):
             fail_silently=True,
         )
     except Exception as e:
-        print(f"Error sending confirmation email: {e}")
\ No newline at end of file
+        logger.exception("Error sending confirmation email: %s", e)
\ No newline at end of file
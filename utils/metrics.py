@@ -0,0 +1,434 @@
+import fcntl
+import glob
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db.backends.signals import connection_created
+from django.http import HttpResponse
+from django.utils.crypto import constant_time_compare
+from utils.db_backends.mysql_pool.pool import pool_stats
+
+LATENCY_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0
+)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+
+METRICS = {
+    'http_request_duration_seconds': (
+        'histogram', 'Request latency by URL name.', LATENCY_BUCKETS
+    ),
+    'http_responses_total': (
+        'counter', 'Responses by URL name and status code.', None
+    ),
+    'db_queries_total': ('counter', 'Executed SQL queries by alias.', None),
+    'db_queries_per_request': (
+        'histogram', 'SQL queries per request by URL name.',
+        QUERY_COUNT_BUCKETS
+    ),
+    'cache_requests_total': (
+        'counter', 'Cache lookups by result (hit or miss).', None
+    ),
+    'auth_outcomes_total': (
+        'counter', 'Authentication outcomes by method.', None
+    ),
+    'db_pool_connections': (
+        'gauge', 'Pooled DB connections by alias and state.', None
+    ),
+    'db_pool_waits_total': (
+        'counter', 'Pool checkouts that had to wait, by alias.', None
+    ),
+    'db_pool_connect_seconds_total': (
+        'counter', 'Time spent opening pooled connections, by alias.', None
+    ),
+}
+
+_request_queries = ContextVar('request_queries', default=None)
+
+
+class MetricsRegistry:
+    """Per-process metric store with a cheap, lock-protected hot path.
+
+    Each process periodically writes a snapshot to METRICS_DIR. The
+    metrics endpoint merges every snapshot, so counters and histograms
+    cover all worker processes.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._values = {}
+        self._histograms = {}
+        self._last_flush = 0.0
+
+    def inc(self, name, labels=(), amount=1):
+        with self._lock:
+            self._inc(name, labels, amount)
+
+    def set(self, name, labels, value):
+        with self._lock:
+            self._values[(name, labels)] = value
+
+    def observe(self, name, labels, value):
+        with self._lock:
+            self._observe(name, labels, value)
+
+    def record_request(self, view, method, status, elapsed, query_count):
+        with self._lock:
+            self._observe(
+                'http_request_duration_seconds',
+                (('view', view), ('method', method)),
+                elapsed
+            )
+            self._inc(
+                'http_responses_total',
+                (('view', view), ('status', status)),
+                1
+            )
+            self._observe(
+                'db_queries_per_request', (('view', view),), query_count
+            )
+
+    def _inc(self, name, labels, amount):
+        key = (name, labels)
+        self._values[key] = self._values.get(key, 0) + amount
+
+    def _observe(self, name, labels, value):
+        key = (name, labels)
+        histogram = self._histograms.get(key)
+        if histogram is None:
+            histogram = self._histograms[key] = [
+                [0] * (len(METRICS[name][2]) + 1), 0.0, 0
+            ]
+        histogram[0][bisect_left(METRICS[name][2], value)] += 1
+        histogram[1] += value
+        histogram[2] += 1
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                'values': [
+                    [name, list(labels), value]
+                    for (name, labels), value in self._values.items()
+                ],
+                'histograms': [
+                    [name, list(labels), list(counts), total, count]
+                    for (name, labels), (counts, total, count)
+                    in self._histograms.items()
+                ],
+            }
+
+    def maybe_flush(self):
+        directory = getattr(settings, 'METRICS_DIR', None)
+        if not directory:
+            return
+
+        now = time.monotonic()
+        if now - self._last_flush < settings.METRICS_FLUSH_INTERVAL:
+            return
+        self._last_flush = now
+        self.flush(directory)
+
+    def flush(self, directory):
+        _record_pool_stats()
+        _write_snapshot(
+            os.path.join(directory, f'metrics-{os.getpid()}.json'),
+            self.snapshot()
+        )
+
+
+registry = MetricsRegistry()
+
+
+def _to_labels(labels):
+    return tuple(tuple(pair) for pair in labels)
+
+
+ARCHIVE_FILENAME = 'metrics-archive.json'
+
+
+def _pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _load_snapshot(path):
+    try:
+        with open(path) as snapshot_file:
+            return json.load(snapshot_file)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_snapshot(path, snapshot):
+    temporary_path = f'{path}.tmp'
+    with open(temporary_path, 'w') as snapshot_file:
+        json.dump(snapshot, snapshot_file)
+    os.replace(temporary_path, path)
+
+
+def _process_snapshots(directory):
+    """Return ``[(pid, path)]`` for every per-process snapshot."""
+    paths = []
+    for path in glob.glob(os.path.join(directory, 'metrics-*.json')):
+        pid = os.path.basename(path)[len('metrics-'):-len('.json')]
+        if pid.isdigit():
+            paths.append((int(pid), path))
+    return paths
+
+
+def _merge(snapshots, gauges=True):
+    values = {}
+    histograms = {}
+    for snapshot in snapshots:
+        for name, labels, value in snapshot['values']:
+            if not gauges and METRICS[name][0] == 'gauge':
+                continue
+            key = (name, _to_labels(labels))
+            values[key] = values.get(key, 0) + value
+        for name, labels, counts, total, count in snapshot['histograms']:
+            key = (name, _to_labels(labels))
+            merged = histograms.setdefault(
+                key, [[0] * len(counts), 0.0, 0]
+            )
+            merged[0] = [a + b for a, b in zip(merged[0], counts)]
+            merged[1] += total
+            merged[2] += count
+    return values, histograms
+
+
+def archive_dead_snapshots(directory):
+    """Fold the snapshots of exited processes into one archive file.
+
+    Their counters and histograms are kept so totals never go backwards;
+    their gauges are dropped, a dead worker holds no connections. Runs
+    under a file lock so concurrent scrapes fold each snapshot once.
+    """
+    dead = [
+        path for pid, path in _process_snapshots(directory)
+        if not _pid_alive(pid)
+    ]
+    if not dead:
+        return
+
+    with open(os.path.join(directory, 'metrics.lock'), 'w') as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        archive_path = os.path.join(directory, ARCHIVE_FILENAME)
+        snapshots = [_load_snapshot(archive_path)]
+        snapshots.extend(_load_snapshot(path) for path in dead)
+        snapshots = [snapshot for snapshot in snapshots if snapshot]
+
+        values, histograms = _merge(snapshots, gauges=False)
+        _write_snapshot(archive_path, {
+            'values': [
+                [name, list(labels), value]
+                for (name, labels), value in values.items()
+            ],
+            'histograms': [
+                [name, list(labels), counts, total, count]
+                for (name, labels), (counts, total, count)
+                in histograms.items()
+            ],
+        })
+        for path in dead:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+
+def collect():
+    """Merge this process's live metrics with every flushed snapshot.
+
+    Gauges only come from live processes; snapshots left by exited ones
+    are archived first.
+    """
+    directory = getattr(settings, 'METRICS_DIR', None)
+    if directory:
+        registry.flush(directory)
+        archive_dead_snapshots(directory)
+        paths = [path for _, path in _process_snapshots(directory)]
+        paths.append(os.path.join(directory, ARCHIVE_FILENAME))
+        snapshots = [
+            snapshot for snapshot in map(_load_snapshot, paths) if snapshot
+        ]
+    else:
+        _record_pool_stats()
+        snapshots = [registry.snapshot()]
+
+    return _merge(snapshots)
+
+
+def _format_labels(labels, extra=()):
+    pairs = list(labels) + list(extra)
+    if not pairs:
+        return ''
+    rendered = ','.join(
+        '{}="{}"'.format(
+            key,
+            str(value).replace('\\', '\\\\').replace('"', '\\"')
+        )
+        for key, value in pairs
+    )
+    return '{' + rendered + '}'
+
+
+def render_prometheus():
+    values, histograms = collect()
+    lines = []
+
+    for name, (metric_type, help_text, buckets) in METRICS.items():
+        lines.append(f'# HELP {name} {help_text}')
+        lines.append(f'# TYPE {name} {metric_type}')
+
+        if metric_type == 'histogram':
+            for (metric, labels), (counts, total, count) in sorted(
+                histograms.items()
+            ):
+                if metric != name:
+                    continue
+                cumulative = 0
+                for bound, bucket_count in zip(buckets, counts):
+                    cumulative += bucket_count
+                    lines.append(
+                        f'{name}_bucket'
+                        f'{_format_labels(labels, [("le", bound)])} '
+                        f'{cumulative}'
+                    )
+                lines.append(
+                    f'{name}_bucket{_format_labels(labels, [("le", "+Inf")])}'
+                    f' {count}'
+                )
+                lines.append(f'{name}_sum{_format_labels(labels)} {total}')
+                lines.append(f'{name}_count{_format_labels(labels)} {count}')
+        else:
+            for (metric, labels), value in sorted(values.items()):
+                if metric == name:
+                    lines.append(f'{name}{_format_labels(labels)} {value}')
+
+    return '\n'.join(lines) + '\n'
+
+
+def record_auth_outcome(method, outcome):
+    registry.inc(
+        'auth_outcomes_total',
+        (('method', method), ('outcome', outcome))
+    )
+
+
+def record_cache_lookup(hit, count=1):
+    registry.inc(
+        'cache_requests_total',
+        (('result', 'hit' if hit else 'miss'),),
+        count
+    )
+
+
+def _record_pool_stats():
+    for alias, stats in pool_stats().items():
+        for state in ('in_use', 'idle'):
+            registry.set(
+                'db_pool_connections',
+                (('alias', alias), ('state', state)),
+                stats[state]
+            )
+        registry.set(
+            'db_pool_waits_total', (('alias', alias),), stats['waits']
+        )
+        registry.set(
+            'db_pool_connect_seconds_total',
+            (('alias', alias),),
+            stats['connect_seconds']
+        )
+
+
+def _count_query(alias):
+    def wrapper(execute, sql, params, many, context):
+        registry.inc('db_queries_total', (('alias', alias),))
+        counter = _request_queries.get()
+        if counter is not None:
+            counter[0] += 1
+        return execute(sql, params, many, context)
+    return wrapper
+
+
+def install_query_counter(sender, connection, **kwargs):
+    if not getattr(connection, '_metrics_query_counter', False):
+        connection.execute_wrappers.append(_count_query(connection.alias))
+        connection._metrics_query_counter = True
+
+
+connection_created.connect(install_query_counter)
+
+
+class MetricsMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(self.get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+
+        queries = [0]
+        token = _request_queries.set(queries)
+        started = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            _request_queries.reset(token)
+        self._record(request, response, started, queries[0])
+        return response
+
+    async def __acall__(self, request):
+        queries = [0]
+        token = _request_queries.set(queries)
+        started = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            _request_queries.reset(token)
+        self._record(request, response, started, queries[0])
+        return response
+
+    def _record(self, request, response, started, query_count):
+        elapsed = time.perf_counter() - started
+        match = request.resolver_match
+        view = match.url_name if match and match.url_name else 'unmatched'
+
+        registry.record_request(
+            view,
+            request.method,
+            str(response.status_code),
+            elapsed,
+            query_count
+        )
+        registry.maybe_flush()
+
+
+def metrics_view(request):
+    # Without a configured token the endpoint stays closed
+    expected_token = getattr(settings, 'METRICS_AUTH_TOKEN', None)
+    if not expected_token or not constant_time_compare(
+        request.META.get('HTTP_AUTHORIZATION', ''),
+        f'Bearer {expected_token}'
+    ):
+        return HttpResponse(status=403)
+
+    return HttpResponse(
+        render_prometheus(),
+        content_type='text/plain; version=0.0.4; charset=utf-8'
+    )
@@ -0,0 +1,56 @@
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.handlers.exception import convert_exception_to_response
+from django.utils.module_loading import import_string
+
+
+class RouteMiddleware:
+    """Run BROWSER_MIDDLEWARE only for requests outside the API.
+
+    API views authenticate with bearer tokens, so sessions, CSRF cookies,
+    request.user and flash messages are only needed by the admin and other
+    browser routes. Requests under API_PATH_PREFIXES skip that chain; all
+    other requests run it as if it were listed in MIDDLEWARE. The chain's
+    process_view hooks (CSRF validation) are forwarded as well, since
+    Django only collects them from MIDDLEWARE itself.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(self.get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+        self.api_path_prefixes = tuple(settings.API_PATH_PREFIXES)
+        handler = get_response
+        self.view_middleware = []
+        for middleware_path in reversed(settings.BROWSER_MIDDLEWARE):
+            middleware = import_string(middleware_path)(handler)
+            if hasattr(middleware, 'process_view'):
+                self.view_middleware.insert(0, middleware.process_view)
+            handler = convert_exception_to_response(middleware)
+        self.browser_handler = handler
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        if request.path_info.startswith(self.api_path_prefixes):
+            return self.get_response(request)
+        return self.browser_handler(request)
+
+    async def __acall__(self, request):
+        if request.path_info.startswith(self.api_path_prefixes):
+            return await self.get_response(request)
+        return await self.browser_handler(request)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if request.path_info.startswith(self.api_path_prefixes):
+            return None
+        for process_view in self.view_middleware:
+            response = process_view(request, view_func, view_args, view_kwargs)
+            if response is not None:
+                return response
+        return None
@@ -0,0 +1,136 @@
+from django.core.exceptions import ImproperlyConfigured
+from django.utils.functional import cached_property
+from rest_framework import serializers
+from constants.messages import ValidationMessages
+
+FIELDS_PARAM = 'fields'
+
+# Fields whose to_representation returns values() output unchanged
+PASSTHROUGH_FIELDS = (
+    serializers.CharField,
+    serializers.IntegerField,
+    serializers.ReadOnlyField,
+)
+
+
+def _is_passthrough(field):
+    if type(field) in PASSTHROUGH_FIELDS:
+        return True
+    # values() yields the raw foreign key, which is what this field renders
+    return (
+        isinstance(field, serializers.PrimaryKeyRelatedField)
+        and field.pk_field is None
+    )
+
+
+class Projection:
+    """Serializer-free read path for a read-only ModelSerializer.
+
+    The serializer's fields are compiled once into ``values_list``
+    lookups (``working_space.name`` becomes ``working_space__name``) and
+    per-field converters. Rows are turned into output dicts without
+    instantiating models or running the serializer machinery, and the
+    result is identical to ``serializer_class(queryset, many=True).data``.
+
+    ``narrow()`` returns a projection over a subset of the fields. Only
+    the columns (and joins) those fields need are selected.
+    """
+
+    def __init__(self, serializer_class, fields=None):
+        self.serializer_class = serializer_class
+        self.fields = fields
+        self._narrowed = {}
+
+    @cached_property
+    def field_names(self):
+        return tuple(
+            name
+            for name, field in self.serializer_class().fields.items()
+            if not field.write_only
+        )
+
+    @cached_property
+    def compiled(self):
+        names = []
+        lookups = []
+        converters = []
+
+        for field in self.serializer_class().fields.values():
+            if field.write_only:
+                continue
+            if self.fields is not None and field.field_name not in self.fields:
+                continue
+            if field.source == '*' or isinstance(
+                field,
+                (serializers.SerializerMethodField, serializers.BaseSerializer)
+            ):
+                raise ImproperlyConfigured(
+                    f'{self.serializer_class.__name__}.{field.field_name} '
+                    'cannot be projected from values().'
+                )
+
+            names.append(field.field_name)
+            lookups.append('__'.join(field.source_attrs))
+            if _is_passthrough(field):
+                continue
+            converters.append(
+                (field.field_name, len(names) - 1, field.to_representation)
+            )
+
+        return tuple(names), tuple(lookups), tuple(converters)
+
+    @property
+    def lookups(self):
+        return self.compiled[1]
+
+    def narrow(self, fields):
+        if not fields:
+            return self
+
+        key = frozenset(fields)
+        unknown = key.difference(self.field_names)
+        if unknown:
+            raise serializers.ValidationError({
+                FIELDS_PARAM: ValidationMessages.UNKNOWN_FIELDS.format(
+                    fields=', '.join(sorted(unknown))
+                )
+            })
+
+        narrowed = self._narrowed.get(key)
+        if narrowed is None:
+            narrowed = self._narrowed[key] = Projection(
+                self.serializer_class,
+                key
+            )
+        return narrowed
+
+    def for_request(self, query_params):
+        """Narrow to a comma-separated ``?fields=`` list, if given."""
+        value = query_params.get(FIELDS_PARAM)
+        if not value:
+            return self
+        return self.narrow(
+            [name.strip() for name in value.split(',') if name.strip()]
+        )
+
+    def values(self, queryset):
+        return queryset.values_list(*self.lookups)
+
+    def project(self, rows):
+        names, _, converters = self.compiled
+        projected = []
+        for row in rows:
+            item = dict(zip(names, row))
+            for name, index, convert in converters:
+                value = row[index]
+                if value is not None:
+                    item[name] = convert(value)
+            projected.append(item)
+        return projected
+
+    def __call__(self, queryset):
+        return self.project(self.values(queryset))
+
+    async def aproject(self, queryset):
+        rows = [row async for row in self.values(queryset).aiterator()]
+        return self.project(rows)
@@ -1,6 +1,8 @@
+from datetime import timedelta
 from functools import wraps
+from django.utils import timezone
 from rest_framework import serializers
-from constants.messages import ValidationMessages
+from constants.messages import SpaceMessages, ValidationMessages
 
 
 def validate_required_string(field_validator):
@@ -33,3 +35,17 @@ def validate_coordinate_range(min_val, max_val):
             return field_validator(self, value)
         return wrapper
     return decorator
+
+
+def validate_same_day_window(start_time, end_time):
+    """Reject a window that is empty or spans more than one local day."""
+    if end_time <= start_time:
+        raise serializers.ValidationError({
+            'end_time': SpaceMessages.INVALID_WINDOW
+        })
+
+    last_moment = end_time - timedelta(microseconds=1)
+    if timezone.localdate(last_moment) != timezone.localdate(start_time):
+        raise serializers.ValidationError({
+            'end_time': SpaceMessages.WINDOW_NOT_SAME_DAY
+        })
@@ -0,0 +1,65 @@
+import time
+from django.core.management.base import BaseCommand
+from spaces.models import Space
+from spaces.serializers import SpaceListSerializer
+from spaces.views import space_list_projection
+from utils.renderers import ORJSONRenderer
+from working_spaces.models import WorkingSpace
+from working_spaces.serializers import WorkingSpaceListSerializer
+from working_spaces.views import working_space_list_projection
+
+
+class Command(BaseCommand):
+    help = (
+        'Compare the time the list serializers and their projections take '
+        'to build a page. Output parity is covered by the spaces and '
+        'working_spaces tests.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rounds', type=int, default=50)
+        parser.add_argument('--page-size', type=int, default=100)
+
+    def handle(self, *args, **options):
+        renderer = ORJSONRenderer()
+        page_size = options['page_size']
+        cases = (
+            (
+                'working_spaces',
+                WorkingSpace.objects.order_by('-created_at')[:page_size],
+                WorkingSpaceListSerializer,
+                working_space_list_projection,
+            ),
+            (
+                'spaces',
+                Space.objects.select_related('working_space').order_by(
+                    '-created_at'
+                )[:page_size],
+                SpaceListSerializer,
+                space_list_projection,
+            ),
+        )
+
+        for name, queryset, serializer_class, projection in cases:
+            size = len(renderer.render(projection(queryset.all())))
+
+            timings = {}
+            for label, build in (
+                ('serializer', lambda: serializer_class(
+                    queryset.all(), many=True
+                ).data),
+                ('projection', lambda: projection(queryset.all())),
+            ):
+                started = time.perf_counter()
+                for _ in range(options['rounds']):
+                    build()
+                timings[label] = (
+                    (time.perf_counter() - started) / options['rounds']
+                )
+
+            self.stdout.write(
+                f'{name} ({size} bytes): '
+                f'serializer {timings["serializer"] * 1000:.2f} ms, '
+                f'projection {timings["projection"] * 1000:.2f} ms, '
+                f'{timings["serializer"] / timings["projection"]:.1f}x'
+            )
@@ -0,0 +1,59 @@
+import gzip
+import time
+from django.core.management.base import BaseCommand
+from rest_framework.renderers import JSONRenderer
+from spaces.models import Space
+from spaces.serializers import SpaceListSerializer
+from utils.compression import brotli, compress
+from utils.renderers import ORJSONRenderer
+from working_spaces.models import WorkingSpace
+from working_spaces.serializers import WorkingSpaceListSerializer
+
+
+class Command(BaseCommand):
+    help = (
+        'Compare JSON rendering time and payload size of the list '
+        'endpoints with the stock and orjson renderers.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rounds', type=int, default=50)
+
+    def handle(self, *args, **options):
+        payloads = {
+            'working_spaces': {
+                'working_spaces': WorkingSpaceListSerializer(
+                    WorkingSpace.objects.all(), many=True
+                ).data,
+            },
+            'spaces': {
+                'spaces': SpaceListSerializer(
+                    Space.objects.select_related('working_space'), many=True
+                ).data,
+            },
+        }
+
+        for name, data in payloads.items():
+            rendered = {}
+            for label, renderer in (
+                ('json', JSONRenderer()),
+                ('orjson', ORJSONRenderer()),
+            ):
+                started = time.perf_counter()
+                for _ in range(options['rounds']):
+                    content = renderer.render(data)
+                elapsed = (time.perf_counter() - started) / options['rounds']
+                rendered[label] = content
+                self.stdout.write(
+                    f'{name} {label}: {elapsed * 1000:.2f} ms per render'
+                )
+
+            content = rendered['orjson']
+            sizes = [
+                f'identical={content == rendered["json"]}',
+                f'raw={len(content)}',
+                f'gzip={len(gzip.compress(content, compresslevel=6))}',
+            ]
+            if brotli is not None:
+                sizes.append(f'br={len(compress(content, "br"))}')
+            self.stdout.write(f'{name} bytes: {" ".join(sizes)}')
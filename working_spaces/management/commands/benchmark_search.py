@@ -0,0 +1,69 @@
+import statistics
+import time
+from datetime import datetime, time as day_time, timedelta
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from spaces.search import search_spaces
+from working_spaces.models import WorkingSpace
+
+
+class Command(BaseCommand):
+    help = (
+        'Time the composite space search around existing working spaces '
+        'and fail when the p95 latency exceeds SPACE_SEARCH_BUDGET_MS.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rounds', type=int, default=200)
+        parser.add_argument('--radius', type=float, default=10)
+        parser.add_argument('--hours', type=int, default=4)
+        parser.add_argument('--seats', type=int, default=1)
+
+    def handle(self, *args, **options):
+        points = list(WorkingSpace.objects.values_list(
+            'latitude', 'longitude'
+        )[:options['rounds']])
+        if not points:
+            raise CommandError('No working spaces to search around.')
+
+        start_time = timezone.make_aware(datetime.combine(
+            timezone.localdate() + timedelta(days=1), day_time(9)
+        ))
+        end_time = start_time + timedelta(hours=options['hours'])
+
+        timings = []
+        queries = set()
+        results = 0
+        for index in range(options['rounds']):
+            latitude, longitude = points[index % len(points)]
+            filters = {
+                'latitude': float(latitude),
+                'longitude': float(longitude),
+                'radius': options['radius'],
+                'start_time': start_time,
+                'end_time': end_time,
+                'seats': options['seats'],
+                'limit': 20,
+            }
+            with CaptureQueriesContext(connection) as context:
+                started = time.perf_counter()
+                results += len(search_spaces(filters))
+                timings.append((time.perf_counter() - started) * 1000)
+            queries.add(len(context.captured_queries))
+
+        timings.sort()
+        p95 = timings[int(len(timings) * 0.95) - 1]
+        self.stdout.write(
+            f'{options["rounds"]} searches, {results / len(timings):.1f} '
+            f'results on average, queries per search {sorted(queries)}: '
+            f'p50 {statistics.median(timings):.1f} ms, p95 {p95:.1f} ms, '
+            f'budget {settings.SPACE_SEARCH_BUDGET_MS} ms'
+        )
+        if p95 > settings.SPACE_SEARCH_BUDGET_MS:
+            raise CommandError(
+                f'p95 {p95:.1f} ms exceeds the search budget of '
+                f'{settings.SPACE_SEARCH_BUDGET_MS} ms.'
+            )
@@ -0,0 +1,84 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.test import AsyncClient, Client
+
+
+def _percentile(samples, percent):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(len(ordered) * percent / 100))
+    return ordered[index]
+
+
+class Command(BaseCommand):
+    help = (
+        'Fire concurrent GET requests through the WSGI and ASGI handlers '
+        'in-process and report requests per second and p99 latency.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'path',
+            help='Path to request, e.g. /api/working-spaces/'
+        )
+        parser.add_argument('--token', help='Bearer access token.')
+        parser.add_argument('--requests', type=int, default=500)
+        parser.add_argument('--concurrency', type=int, default=20)
+
+    def handle(self, *args, **options):
+        headers = {}
+        if options['token']:
+            headers['Authorization'] = f"Bearer {options['token']}"
+
+        host = settings.ALLOWED_HOSTS[0] if settings.ALLOWED_HOSTS else ''
+        if host and host != '*':
+            headers['Host'] = host
+
+        for label, runner in (
+            ('WSGI', self._run_wsgi),
+            ('ASGI', self._run_asgi),
+        ):
+            started = time.perf_counter()
+            latencies, statuses = runner(options, headers)
+            elapsed = time.perf_counter() - started
+
+            self.stdout.write(
+                f'{label}: {len(latencies) / elapsed:.1f} req/s, '
+                f'p50 {_percentile(latencies, 50) * 1000:.1f} ms, '
+                f'p99 {_percentile(latencies, 99) * 1000:.1f} ms, '
+                f'statuses {sorted(set(statuses))}'
+            )
+
+    def _run_wsgi(self, options, headers):
+        def request(_):
+            client = Client()
+            started = time.perf_counter()
+            response = client.get(options['path'], headers=headers)
+            return time.perf_counter() - started, response.status_code
+
+        with ThreadPoolExecutor(max_workers=options['concurrency']) as pool:
+            results = list(pool.map(request, range(options['requests'])))
+        return [r[0] for r in results], [r[1] for r in results]
+
+    def _run_asgi(self, options, headers):
+        async def run():
+            semaphore = asyncio.Semaphore(options['concurrency'])
+            client = AsyncClient()
+
+            async def request():
+                async with semaphore:
+                    started = time.perf_counter()
+                    response = await client.get(
+                        options['path'],
+                        headers=headers
+                    )
+                    return time.perf_counter() - started, response.status_code
+
+            return await asyncio.gather(
+                *(request() for _ in range(options['requests']))
+            )
+
+        results = asyncio.run(run())
+        return [r[0] for r in results], [r[1] for r in results]
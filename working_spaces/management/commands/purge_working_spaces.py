@@ -0,0 +1,62 @@
+import time
+from django.core.management.base import BaseCommand
+from working_spaces.models import WorkingSpace
+from working_spaces.services import dependency_counts, purge_working_space
+
+
+class Command(BaseCommand):
+    help = (
+        'Delete soft-deleted working spaces and everything under them in '
+        'bounded batches, leaves first.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=500,
+            help='Number of rows deleted per transaction.'
+        )
+        parser.add_argument(
+            '--pause',
+            type=float,
+            default=0,
+            help='Seconds to sleep between batches to limit load.'
+        )
+        parser.add_argument(
+            '--working-space-id',
+            type=int,
+            help='Only purge this working space.'
+        )
+
+    def handle(self, *args, **options):
+        working_spaces = WorkingSpace.all_objects.filter(
+            deleted_at__isnull=False
+        ).order_by('deleted_at')
+        if options['working_space_id']:
+            working_spaces = working_spaces.filter(
+                pk=options['working_space_id']
+            )
+
+        for working_space_id in working_spaces.values_list('pk', flat=True):
+            counts = dependency_counts(working_space_id)
+            self.stdout.write(
+                f'Working space {working_space_id}: '
+                f'{sum(counts.values())} rows to delete'
+            )
+
+            def progress(label, deleted):
+                self.stdout.write(
+                    f'  {label}: {deleted}/{counts[label]} deleted'
+                )
+                if options['pause']:
+                    time.sleep(options['pause'])
+
+            purge_working_space(
+                working_space_id,
+                batch_size=options['batch_size'],
+                progress=progress
+            )
+            self.stdout.write(self.style.SUCCESS(
+                f'Working space {working_space_id} purged.'
+            ))
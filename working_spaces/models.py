@@ -1,7 +1,18 @@
+from datetime import datetime, timezone
 from django.db import models
+from django.db.models.functions import Coalesce
+from utils.concurrency import VersionedModelMixin
 
+# Stands in for deleted_at of live rows in the unique key below
+LIVE = datetime(1970, 1, 1, tzinfo=timezone.utc)
 
-class WorkingSpace(models.Model):
+
+class ActiveWorkingSpaceManager(models.Manager):
+    def get_queryset(self):
+        return super().get_queryset().filter(deleted_at__isnull=True)
+
+
+class WorkingSpace(VersionedModelMixin, models.Model):
     name = models.CharField(max_length=200)
     city = models.CharField(max_length=100)
     street = models.CharField(max_length=255)
@@ -10,6 +21,29 @@ class WorkingSpace(models.Model):
     
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
-    
+    # Bumped by every update; the ETag of the row (utils.concurrency)
+    version = models.PositiveIntegerField(default=1)
+    # Set on delete; descendants are purged later by purge_working_spaces
+    deleted_at = models.DateTimeField(null=True, blank=True, db_index=True)
+
+    objects = ActiveWorkingSpaceManager()
+    all_objects = models.Manager()
+
+    class Meta:
+        constraints = [
+            # MySQL has no partial unique indexes, so deleted_at is part
+            # of the key instead: a soft-deleted working space (distinct
+            # deleted_at) doesn't block its name until it is purged
+            models.UniqueConstraint(
+                'name',
+                'city',
+                Coalesce(
+                    'deleted_at',
+                    models.Value(LIVE, output_field=models.DateTimeField())
+                ),
+                name='unique_working_space_name_per_city'
+            )
+        ]
+
     def __str__(self):
         return f"{self.name} - {self.city}"
@@ -1,6 +1,8 @@
 from rest_framework import serializers
 from .models import WorkingSpace
 from constants.messages import WorkingSpaceMessages
+from utils.concurrency import VersionedUpdateMixin
+from utils.constraints import UniqueErrorsMixin
 from utils.validators import validate_required_string, validate_coordinate_range
 
 
@@ -58,7 +60,17 @@ class WorkingSpaceFilterSerializer(serializers.Serializer):
         return data
 
 
-class WorkingSpaceSerializer(serializers.ModelSerializer):
+class WorkingSpaceSerializer(
+    UniqueErrorsMixin,
+    VersionedUpdateMixin,
+    serializers.ModelSerializer
+):
+    unique_errors = {
+        'unique_working_space_name_per_city': (
+            'name', WorkingSpaceMessages.DUPLICATE_NAME_CITY
+        ),
+    }
+
     class Meta:
         model = WorkingSpace
         fields = [
@@ -69,9 +81,10 @@ class WorkingSpaceSerializer(serializers.ModelSerializer):
             'latitude',
             'longitude',
             'created_at',
-            'updated_at'
+            'updated_at',
+            'version'
         ]
-        read_only_fields = ['id', 'created_at', 'updated_at']
+        read_only_fields = ['id', 'created_at', 'updated_at', 'version']
 
     @validate_required_string
     def validate_name(self, value):
@@ -95,19 +108,7 @@ class WorkingSpaceSerializer(serializers.ModelSerializer):
 
 
 class WorkingSpaceCreateSerializer(WorkingSpaceSerializer):
-    def validate(self, attrs):
-        name = attrs.get('name', '').strip()
-        city = attrs.get('city', '').strip()
-        
-        if WorkingSpace.objects.filter(
-            name=name,
-            city=city
-        ).exists():
-            raise serializers.ValidationError({
-                'name': WorkingSpaceMessages.DUPLICATE_NAME_CITY
-            })
-        
-        return attrs
+    pass
 
 
 class WorkingSpaceListSerializer(serializers.ModelSerializer):
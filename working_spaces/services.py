@@ -0,0 +1,99 @@
+from django.db import transaction
+from django.db.models import Q
+from amenities.models import Amenity
+from analytics.models import DailySpaceStat
+from analytics.signals import pause_stat_rebuilds
+from payment_histories.models import PaymentHistory
+from space_bookings.models import SpaceBooking, SpaceOccupancy
+from space_bookings.signals import pause_occupancy_updates
+from space_members.models import SpaceMember
+from space_prices.models import SpacePrice
+from spaces.models import Space
+from working_space_managers.models import WorkingSpaceManager
+from .models import WorkingSpace
+
+# Everything owned by a working space, leaves first, so deleting in this
+# order never cascades and every batch stays bounded.
+DEPENDENCIES = [
+    (
+        'payment_histories',
+        PaymentHistory,
+        lambda pk: Q(space_booking__space__working_space_id=pk) |
+        Q(space_member__space__working_space_id=pk)
+    ),
+    (
+        'space_bookings',
+        SpaceBooking,
+        lambda pk: Q(space__working_space_id=pk)
+    ),
+    (
+        'space_occupancies',
+        SpaceOccupancy,
+        lambda pk: Q(space__working_space_id=pk)
+    ),
+    (
+        'space_members',
+        SpaceMember,
+        lambda pk: Q(space__working_space_id=pk)
+    ),
+    (
+        'space_prices',
+        SpacePrice,
+        lambda pk: Q(space__working_space_id=pk)
+    ),
+    (
+        'daily_space_stats',
+        DailySpaceStat,
+        lambda pk: Q(working_space_id=pk)
+    ),
+    ('amenities', Amenity, lambda pk: Q(working_space_id=pk)),
+    ('spaces', Space, lambda pk: Q(working_space_id=pk)),
+    (
+        'working_space_managers',
+        WorkingSpaceManager,
+        lambda pk: Q(working_space_id=pk)
+    ),
+]
+
+
+def dependency_counts(working_space_id):
+    return {
+        label: model.objects.filter(condition(working_space_id)).count()
+        for label, model, condition in DEPENDENCIES
+    }
+
+
+def purge_working_space(working_space_id, batch_size=500, progress=None):
+    """Delete a soft-deleted working space and its descendants in batches.
+
+    Each batch is its own short transaction, so no lock is held for the
+    whole purge and memory stays bounded. Stats rebuilds and occupancy
+    updates are skipped, as those rows are purged as well. ``progress``
+    is called with the label and running total after every batch. A
+    working space that isn't soft-deleted is left alone.
+    """
+    deleted_working_space = WorkingSpace.all_objects.filter(
+        pk=working_space_id,
+        deleted_at__isnull=False
+    )
+    if not deleted_working_space.exists():
+        return
+
+    with pause_stat_rebuilds(), pause_occupancy_updates():
+        for label, model, condition in DEPENDENCIES:
+            queryset = model.objects.filter(condition(working_space_id))
+            deleted = 0
+
+            while True:
+                ids = list(queryset.values_list('pk', flat=True)[:batch_size])
+                if not ids:
+                    break
+
+                with transaction.atomic():
+                    model.objects.filter(pk__in=ids).delete()
+
+                deleted += len(ids)
+                if progress:
+                    progress(label, deleted)
+
+    deleted_working_space.delete()
@@ -1,3 +1,228 @@
-from django.test import TestCase
+from datetime import datetime, time, timedelta
+from decimal import Decimal
+from django.contrib.auth import get_user_model
+from django.test import TestCase, TransactionTestCase
+from rest_framework import serializers
+from django.utils import timezone
+from amenities.models import Amenity
+from analytics.models import DailySpaceStat
+from constants import (
+    BookingStatusChoices,
+    PaymentStatusChoices,
+    PriceTypeChoices,
+)
+from payment_histories.models import PaymentHistory
+from space_bookings.models import SpaceBooking, SpaceOccupancy
+from space_prices.models import SpacePrice
+from spaces.models import Space
+from utils.renderers import ORJSONRenderer
+from working_space_managers.models import WorkingSpaceManager
+from .models import WorkingSpace
+from .serializers import WorkingSpaceListSerializer, WorkingSpaceSerializer
+from .services import dependency_counts, purge_working_space
+from .views import working_space_list_projection
 
-# Create your tests here.
+
+class WorkingSpaceListProjectionTests(TestCase):
+    def setUp(self):
+        WorkingSpace.objects.create(
+            name='Hub',
+            city='Hanoi',
+            street='1 Main St',
+            latitude=Decimal('21.028511'),
+            longitude=Decimal('105.804817')
+        )
+        WorkingSpace.objects.create(
+            name='Loft',
+            city='Da Nang',
+            street='2 River Rd'
+        )
+        self.queryset = WorkingSpace.objects.order_by('-created_at', '-id')
+        self.renderer = ORJSONRenderer()
+
+    def test_projection_matches_serializer(self):
+        self.assertEqual(
+            self.renderer.render(
+                working_space_list_projection(self.queryset.all())
+            ),
+            self.renderer.render(
+                WorkingSpaceListSerializer(self.queryset.all(), many=True).data
+            )
+        )
+
+    def test_narrowed_projection_keeps_only_requested_fields(self):
+        projection = working_space_list_projection.narrow(['id', 'latitude'])
+        serialized = WorkingSpaceListSerializer(
+            self.queryset.all(), many=True
+        ).data
+
+        self.assertEqual(
+            self.renderer.render(projection(self.queryset.all())),
+            self.renderer.render([
+                {'id': item['id'], 'latitude': item['latitude']}
+                for item in serialized
+            ])
+        )
+
+
+class WorkingSpaceVersionTests(TestCase):
+    def setUp(self):
+        self.working_space = WorkingSpace.objects.create(
+            name='Hub',
+            city='Hanoi',
+            street='1 Main St'
+        )
+
+    def _stored_version(self):
+        return WorkingSpace.all_objects.get(pk=self.working_space.pk).version
+
+    def test_save_bumps_the_version(self):
+        self.working_space.street = '3 Lake Rd'
+        self.working_space.save()
+
+        self.assertEqual(self.working_space.version, 2)
+        self.assertEqual(self._stored_version(), 2)
+
+    def test_soft_delete_bumps_the_version(self):
+        self.working_space.deleted_at = timezone.now()
+        self.working_space.save(update_fields=['deleted_at', 'updated_at'])
+
+        self.assertEqual(self._stored_version(), 2)
+
+    def test_serializer_update_bumps_once(self):
+        serializer = WorkingSpaceSerializer(
+            self.working_space,
+            data={'street': '3 Lake Rd'},
+            partial=True
+        )
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+
+        self.assertEqual(serializer.data['version'], 2)
+        self.assertEqual(self._stored_version(), 2)
+
+
+class WorkingSpaceUniqueErrorTests(TestCase):
+    def test_duplicate_name_and_city_is_a_field_error(self):
+        WorkingSpace.objects.create(
+            name='Hub',
+            city='Hanoi',
+            street='1 Main St'
+        )
+
+        serializer = WorkingSpaceSerializer(data={
+            'name': 'Hub',
+            'city': 'Hanoi',
+            'street': '2 River Rd'
+        })
+        serializer.is_valid(raise_exception=True)
+
+        with self.assertRaises(serializers.ValidationError) as raised:
+            serializer.save()
+
+        self.assertIn('name', raised.exception.detail)
+        self.assertEqual(WorkingSpace.objects.count(), 1)
+
+
+class PurgeWorkingSpaceTests(TransactionTestCase):
+    """Each batch commits, so a foreign key left dangling fails it."""
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            username='owner',
+            email='owner@example.com',
+            password='secret'
+        )
+        self.working_space = self._working_space('Hub')
+        self.kept = self._working_space('Loft')
+        self.working_space.deleted_at = timezone.now()
+        self.working_space.save(update_fields=['deleted_at'])
+
+    def _working_space(self, name):
+        working_space = WorkingSpace.objects.create(
+            name=name,
+            city='Hanoi',
+            street='1 Main St'
+        )
+        WorkingSpaceManager.objects.create(
+            working_space=working_space,
+            user=self.user
+        )
+        Amenity.objects.create(working_space=working_space, name='Wifi')
+        day = timezone.localdate() + timedelta(days=1)
+        for index in range(2):
+            space = Space.objects.create(
+                working_space=working_space,
+                name=f'Room {index}',
+                capacity=5,
+                location='Floor 1',
+                open_time=time(8),
+                close_time=time(18)
+            )
+            SpacePrice.objects.create(
+                space=space,
+                type=PriceTypeChoices.HOUR,
+                price=Decimal('5.00')
+            )
+            for hour in (9, 11):
+                booking = SpaceBooking.objects.create(
+                    user=self.user,
+                    space=space,
+                    status=BookingStatusChoices.SUCCEEDED,
+                    price_type=PriceTypeChoices.HOUR,
+                    price=Decimal('10.00'),
+                    start_time=timezone.make_aware(
+                        datetime.combine(day, time(hour))
+                    ),
+                    end_time=timezone.make_aware(
+                        datetime.combine(day, time(hour + 1))
+                    )
+                )
+                PaymentHistory.objects.create(
+                    space_booking=booking,
+                    status=PaymentStatusChoices.COMPLETED,
+                    amount=booking.price,
+                    order_id=f'{name}-{space.id}-{hour}'
+                )
+        return working_space
+
+    def test_purge_removes_everything_in_batches(self):
+        counts = dependency_counts(self.working_space.id)
+        self.assertEqual(counts['payment_histories'], 4)
+        self.assertEqual(counts['space_bookings'], 4)
+        self.assertEqual(counts['spaces'], 2)
+        self.assertGreater(counts['space_occupancies'], 0)
+        self.assertGreater(counts['daily_space_stats'], 0)
+        kept_counts = dependency_counts(self.kept.id)
+
+        calls = []
+        purge_working_space(
+            self.working_space.id,
+            batch_size=3,
+            progress=lambda label, deleted: calls.append((label, deleted))
+        )
+
+        # One call per batch, and nothing was removed by a cascade first
+        expected = []
+        for label, count in counts.items():
+            expected.extend(
+                (label, min(deleted, count))
+                for deleted in range(3, count + 3, 3)
+            )
+        self.assertEqual(calls, expected)
+
+        self.assertFalse(
+            WorkingSpace.all_objects.filter(pk=self.working_space.id).exists()
+        )
+        self.assertEqual(
+            set(dependency_counts(self.working_space.id).values()), {0}
+        )
+        self.assertEqual(dependency_counts(self.kept.id), kept_counts)
+
+    def test_live_working_space_is_not_purged(self):
+        counts = dependency_counts(self.kept.id)
+
+        purge_working_space(self.kept.id)
+
+        self.assertTrue(WorkingSpace.objects.filter(pk=self.kept.id).exists())
+        self.assertEqual(dependency_counts(self.kept.id), counts)
@@ -1,15 +1,35 @@
+from django.conf import settings
 from django.urls import path, include
+from utils.async_views import split_read_write_view
 from .views import (
     WorkingSpaceCreateView,
     WorkingSpaceListView,
     WorkingSpaceDetailView,
+    WorkingSpaceDependencyView,
+    WorkingSpaceListAsyncView,
+    WorkingSpaceDetailAsyncView,
 )
 
 app_name = 'working_spaces'
 
+if settings.ASYNC_READ_VIEWS:
+    list_view = WorkingSpaceListAsyncView.as_view()
+    detail_view = split_read_write_view(
+        WorkingSpaceDetailAsyncView.as_view(),
+        WorkingSpaceDetailView.as_view()
+    )
+else:
+    list_view = WorkingSpaceListView.as_view()
+    detail_view = WorkingSpaceDetailView.as_view()
+
 urlpatterns = [
-    path('', WorkingSpaceListView.as_view(), name='working-space-list'),
+    path('', list_view, name='working-space-list'),
     path('create', WorkingSpaceCreateView.as_view(), name='working-space-create'),
-    path('<int:pk>/', WorkingSpaceDetailView.as_view(), name='working-space-detail'),
+    path('<int:pk>/', detail_view, name='working-space-detail'),
+    path(
+        '<int:pk>/dependencies/',
+        WorkingSpaceDependencyView.as_view(),
+        name='working-space-dependencies'
+    ),
     path('<int:working_space_id>/spaces/', include('spaces.urls')),
 ]
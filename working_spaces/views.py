@@ -1,9 +1,12 @@
 from rest_framework import status, generics, permissions
 from rest_framework.response import Response
+from rest_framework.views import APIView
 from django.db import IntegrityError
 from django.db.models import Q
 from django.http import Http404
+from django.utils import timezone
 from .models import WorkingSpace
+from .services import dependency_counts
 from .serializers import (
     WorkingSpaceSerializer,
     WorkingSpaceCreateSerializer,
@@ -11,6 +14,50 @@ from .serializers import (
     WorkingSpaceFilterSerializer
 )
 from constants.messages import HTTPErrorMessages, WorkingSpaceMessages
+from utils.async_views import AsyncAPIView
+from utils.concurrency import check_if_match, set_etag
+from utils.projections import Projection
+
+working_space_list_projection = Projection(WorkingSpaceListSerializer)
+working_space_projection = Projection(WorkingSpaceSerializer)
+
+
+def filter_working_spaces(query_params):
+    queryset = WorkingSpace.objects.all().order_by('-created_at')
+
+    filter_serializer = WorkingSpaceFilterSerializer(data=query_params)
+    filter_serializer.is_valid(raise_exception=True)
+
+    filters = filter_serializer.get_cleaned_data()
+
+    search = filters.get('search')
+    if search:
+        queryset = queryset.filter(
+            Q(name__icontains=search) |
+            Q(city__icontains=search) |
+            Q(street__icontains=search)
+        )
+
+    city = filters.get('city')
+    if city:
+        queryset = queryset.filter(city__icontains=city)
+
+    if all(k in filters for k in ['latitude', 'longitude', 'radius']):
+        lat = filters['latitude']
+        lng = filters['longitude']
+        rad = filters['radius']
+
+        lat_delta = rad / 111.0
+        lng_delta = rad / (111.0 * abs(lat * 3.14159 / 180)) if lat != 0 else rad / 111.0
+
+        queryset = queryset.filter(
+            latitude__gte=lat - lat_delta,
+            latitude__lte=lat + lat_delta,
+            longitude__gte=lng - lng_delta,
+            longitude__lte=lng + lng_delta
+        )
+
+    return queryset
 
 
 class WorkingSpaceCreateView(generics.CreateAPIView):
@@ -37,56 +84,24 @@ class WorkingSpaceListView(generics.ListAPIView):
     permission_classes = [permissions.IsAuthenticated]
 
     def get_queryset(self):
-        queryset = WorkingSpace.objects.all().order_by('-created_at')
-        
-        filter_serializer = WorkingSpaceFilterSerializer(data=self.request.query_params)
-        filter_serializer.is_valid(raise_exception=True)
-        
-        filters = filter_serializer.get_cleaned_data()
-        
-        search = filters.get('search')
-        if search:
-            queryset = queryset.filter(
-                Q(name__icontains=search) |
-                Q(city__icontains=search) |
-                Q(street__icontains=search)
-            )
-
-        city = filters.get('city')
-        if city:
-            queryset = queryset.filter(city__icontains=city)
-
-        if all(k in filters for k in ['latitude', 'longitude', 'radius']):
-            lat = filters['latitude']
-            lng = filters['longitude']
-            rad = filters['radius']
-            
-            lat_delta = rad / 111.0
-            lng_delta = rad / (111.0 * abs(lat * 3.14159 / 180)) if lat != 0 else rad / 111.0
-
-            queryset = queryset.filter(
-                latitude__gte=lat - lat_delta,
-                latitude__lte=lat + lat_delta,
-                longitude__gte=lng - lng_delta,
-                longitude__lte=lng + lng_delta
-            )
-
-        return queryset
+        return filter_working_spaces(self.request.query_params)
 
     def list(self, request, *args, **kwargs):
-        queryset = self.get_queryset()
-        page = self.paginate_queryset(queryset)
+        projection = working_space_list_projection.for_request(
+            request.query_params
+        )
+        rows = projection.values(self.get_queryset())
+        page = self.paginate_queryset(rows)
 
         if page is not None:
-            serializer = self.get_serializer(page, many=True)
             return self.get_paginated_response({
-                'working_spaces': serializer.data
+                'working_spaces': projection.project(page)
             })
 
-        serializer = self.get_serializer(queryset, many=True)
+        working_spaces = projection.project(rows)
         return Response({
-            'working_spaces': serializer.data,
-            'count': queryset.count()
+            'working_spaces': working_spaces,
+            'count': len(working_spaces)
         }, status=status.HTTP_200_OK)
 
 
@@ -96,15 +111,20 @@ class WorkingSpaceDetailView(generics.RetrieveUpdateDestroyAPIView):
     permission_classes = [permissions.IsAuthenticated]
 
     def retrieve(self, request, *args, **kwargs):
-        instance = self.get_object()
-        serializer = self.get_serializer(instance)
-        return Response({
-            'working_space': serializer.data
-        }, status=status.HTTP_200_OK)
+        projection = working_space_projection.for_request(
+            request.query_params
+        )
+        working_spaces = projection(self.get_queryset().filter(pk=kwargs['pk']))
+        if not working_spaces:
+            raise Http404
+        return set_etag(Response({
+            'working_space': working_spaces[0]
+        }, status=status.HTTP_200_OK), working_spaces[0])
 
     def update(self, request, *args, **kwargs):
         partial = kwargs.pop('partial', False)
         instance = self.get_object()
+        check_if_match(request, instance.version)
         serializer = self.get_serializer(
             instance,
             data=request.data,
@@ -114,17 +134,67 @@ class WorkingSpaceDetailView(generics.RetrieveUpdateDestroyAPIView):
 
         serializer.save()
 
-        return Response({
+        return set_etag(Response({
             'message': WorkingSpaceMessages.UPDATE_SUCCESS,
             'working_space': serializer.data
-        }, status=status.HTTP_200_OK)
+        }, status=status.HTTP_200_OK), serializer.data)
 
     def destroy(self, request, *args, **kwargs):
         instance = self.get_object()
 
-        # TODO: add remove relation when implement add spaces, amenities
-        instance.delete()
+        # Hide it now; purge_working_spaces deletes descendants in batches.
+        # save() bumps the version, so stale If-Match updates are refused
+        instance.deleted_at = timezone.now()
+        instance.save(update_fields=['deleted_at', 'updated_at'])
 
         return Response({
             'message': WorkingSpaceMessages.DELETE_SUCCESS
         }, status=status.HTTP_204_NO_CONTENT)
+
+
+class WorkingSpaceDependencyView(APIView):
+    """Preview what deleting a working space removes (or has left)."""
+
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request, pk):
+        working_space = WorkingSpace.all_objects.filter(pk=pk).values(
+            'id', 'deleted_at'
+        ).first()
+        if working_space is None:
+            raise Http404
+
+        dependencies = dependency_counts(pk)
+        return Response({
+            'working_space_id': working_space['id'],
+            'deleted_at': working_space['deleted_at'],
+            'dependencies': dependencies,
+            'total': sum(dependencies.values())
+        }, status=status.HTTP_200_OK)
+
+
+class WorkingSpaceListAsyncView(AsyncAPIView):
+    async def get(self, request, *args, **kwargs):
+        projection = working_space_list_projection.for_request(request.GET)
+        working_spaces = await projection.aproject(
+            filter_working_spaces(request.GET)
+        )
+
+        return self.render({
+            'working_spaces': working_spaces,
+            'count': len(working_spaces)
+        })
+
+
+class WorkingSpaceDetailAsyncView(AsyncAPIView):
+    async def get(self, request, *args, **kwargs):
+        projection = working_space_projection.for_request(request.GET)
+        working_spaces = await projection.aproject(
+            WorkingSpace.objects.filter(pk=kwargs['pk'])
+        )
+        if not working_spaces:
+            raise WorkingSpace.DoesNotExist
+
+        return set_etag(self.render({
+            'working_space': working_spaces[0]
+        }), working_spaces[0])